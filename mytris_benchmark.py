@@ -0,0 +1,308 @@
+###############################################################################
+# Program: mytris_benchmark
+# Goal: Benchmarks of the perceptron engine and of the game loop of
+#       mytris_neural_learning, with reproducible seeds and JSON output.
+#
+# MIT License
+#
+# Copyright (c) 2025 Marco Mattiucci
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# Usage: python mytris_benchmark.py [--sizes 10,1000,100000] [--seed 0]
+#                                   [--repeat 3] [--output results.json]
+# Every benchmark runs in a temporary folder with synthetic knowledge bases of
+# the given sizes (number of lessons), so the files of the game are not used.
+################################################################################
+
+
+
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import mytris_neural_learning as tris
+
+
+
+
+BENCHMARK_SIZES = (10,1000,100000)  # default sizes (number of lessons) of the synthetic knowledge bases
+BENCHMARK_SEED = 0                  # default random seed
+BENCHMARK_REPEAT = 3                # default number of repetitions of every measure (the best one is kept)
+BENCHMARK_BOARDS = 1000             # number of boards (drawn among the reachable ones) used to measure the latency of the moves
+BENCHMARK_MATCHES = 200             # number of random matches used to measure the cost of the learning
+BENCHMARK_LEARNT_MATCHES = 5        # number of those matches learnt with file updates (see "analyze_my_match")
+BENCHMARK_ENGINES = (("python",{}),("compiled",{"compiled":True}),("incremental",{"incremental":True}),
+                     ("compiled_incremental",{"compiled":True,"incremental":True}))    # evaluation engines compared by "respond"
+
+
+
+
+##########################################################################################
+### Function "measure" runs "function" "repeat" times and returns the dictionary of the
+### timings in seconds: best and mean of the runs.
+##########################################################################################
+def measure(function,repeat = BENCHMARK_REPEAT):
+    timings = list()
+    for i in range(repeat):
+        start_time = time.perf_counter()
+        function()
+        timings.append(time.perf_counter()-start_time)
+    return {"best_seconds":min(timings),"mean_seconds":sum(timings)/len(timings),"repeat":repeat}
+
+##########################################################################################
+### Function "percentile" returns the p-th percentile (0-100) of a list of values.
+##########################################################################################
+def percentile(values,p):
+    values = sorted(values)
+    if values == []:
+        return 0.0
+    return values[min(len(values)-1,int(round(p/100*(len(values)-1))))]
+
+##########################################################################################
+### Function "synthetic_lessons" returns "size" different lessons (list of 9 weights,
+### destination cell) drawn with the generator "rng". Every lesson reads some cells of
+### a random board, like the lessons learnt from the matches: weight +1/n for a CIRCLE
+### and -1/n for a STAR (n = number of the cells read), 0 for the other cells.
+### Only about 177,000 different lessons exist, so very large sizes are not reached.
+##########################################################################################
+def synthetic_lessons(size,rng):
+    knowledge_base = tris.myLessonsLearntKnowledgeBase()
+    attempts = 0
+    while len(knowledge_base) < size and attempts < 20*size:
+        attempts += 1
+        status = [rng.choice((tris.CIRCLE,tris.STAR,tris.EMPTY)) for i in range(9)]
+        n = sum(1 for v in status if v != tris.EMPTY)
+        if n == 0:
+            continue
+        knowledge_base.add([v/n for v in status],rng.randrange(9))
+    return knowledge_base
+
+##########################################################################################
+### Function "write_synthetic_knowledge_bases" writes the 3 knowledge base files in the
+### current folder, with "size" lessons each (different seeds for the 3 files).
+##########################################################################################
+def write_synthetic_knowledge_bases(size,seed):
+    for (k,my_kb_file_name) in enumerate(tris.LESSONS_LEARNT_FILES):
+        synthetic_lessons(size,random.Random(seed*3+k)).save(my_kb_file_name)
+
+##########################################################################################
+### Function "reachable_boards" returns "number" boards (myTrisBoard) drawn with the
+### given seed among the ones where it is the turn of the computer (CIRCLE) and the
+### match is not over.
+##########################################################################################
+def reachable_boards(number,seed):
+    boards = set()
+    pending = [(tris.myTrisBoard(),tris.CIRCLE),(tris.myTrisBoard(),tris.STAR)]
+    visited = set()
+    while pending:
+        (board,player) = pending.pop()
+        if (board,player) in visited or board.is_over():
+            continue
+        visited.add((board,player))
+        if player == tris.CIRCLE:
+            boards.add(board)
+        for cell in board.empty_cells():
+            pending.append((board.play(cell,player),-player))
+    boards = sorted(boards,key = hash)
+    return random.Random(seed).sample(boards,min(number,len(boards)))
+
+##########################################################################################
+### Function "random_matches" returns "number" complete matches (match lists) between
+### two random players, drawn with the given seed.
+##########################################################################################
+def random_matches(number,seed):
+    random.seed(seed)
+    self_play = tris.myTrisSelfPlay(tris.myRandomPlayer(),tris.myRandomPlayer())
+    return [self_play.play_match(tris.CIRCLE if n % 2 == 0 else tris.STAR)[0] for n in range(number)]
+
+##########################################################################################
+### Function "latency_by_label" calls "move" (which returns a strategy label) on every
+### board and returns the dictionary: label -> count and latency (microseconds).
+##########################################################################################
+def latency_by_label(boards,move,seed):
+    random.seed(seed)
+    latencies = dict()
+    for board in boards:
+        start_time = time.perf_counter()
+        label = move(board)
+        latencies.setdefault(label,list()).append((time.perf_counter()-start_time)*1e6)
+    return {label:{"count":len(values),"mean_us":sum(values)/len(values),"p50_us":percentile(values,50),
+                   "p95_us":percentile(values,95)} for (label,values) in sorted(latencies.items())}
+
+##########################################################################################
+### Function "match_boards" returns the boards (myTrisBoard) of "number" random matches,
+### drawn with the given seed, in the order they are played: every board differs from
+### the one before by a single cell, but at the start of a match.
+##########################################################################################
+def match_boards(number,seed):
+    rng = random.Random(seed)
+    boards = list()
+    for n in range(number):
+        board = tris.myTrisBoard()
+        player = tris.CIRCLE if n % 2 == 0 else tris.STAR
+        while not board.is_over():
+            board = board.play(rng.choice(board.empty_cells()),player)
+            player = -player
+            boards.append(board)
+    return boards
+
+def basic_respond(basic_tris,board):                # "respond" of myTris on a board
+    basic_tris.reset_all_but_the_board()
+    return basic_tris.respond(board.to_status())[0]
+
+def trained_move(trained_tris,board):               # "get_computer_move" of myTrainedTris on a board
+    trained_tris.set_board(board)
+    trained_tris.reset_all_but_the_board()
+    return trained_tris.get_computer_move(verbose = False)
+
+##########################################################################################
+### Benchmarks of the basic network (they do not depend on the knowledge bases):
+### construction of myTris, "respond" latency per strategy, throughput of
+### "evaluate_new_node_status" and cost of "respond" for every evaluation engine
+### (see BENCHMARK_ENGINES) along the boards of matches, where the incremental
+### engine evaluates again only what a move changes, and on the same boards shuffled.
+##########################################################################################
+def benchmark_basic(seed,repeat):
+    results = dict()
+    results["mytris_construction"] = measure(lambda: tris.myTris(verbose = False),repeat)
+    basic_tris = tris.myTris(verbose = False)
+    results["respond_latency"] = latency_by_label(reachable_boards(BENCHMARK_BOARDS,seed),lambda board: basic_respond(basic_tris,board),seed)
+    net = basic_tris.perceptrons_network
+    node_ids = list(range(9,net.network_dimension))*100
+
+    def evaluate_nodes():
+        for node_id in node_ids:
+            net.evaluate_new_node_status(node_id)
+
+    timing = measure(evaluate_nodes,repeat)
+    timing["nodes_per_second"] = len(node_ids)/timing["best_seconds"]
+    results["evaluate_new_node_status"] = timing
+    boards = match_boards(BENCHMARK_MATCHES,seed)
+    shuffled_boards = random.Random(seed).sample(boards,len(boards))
+    for (name,options) in BENCHMARK_ENGINES:
+        engine_tris = tris.myTris(verbose = False,**options)
+        for (order,board_list) in (("along_matches",boards),("shuffled",shuffled_boards)):
+            timing = measure(lambda: [basic_respond(engine_tris,board) for board in board_list],repeat)
+            timing["us_per_board"] = timing["best_seconds"]/len(board_list)*1e6
+            results["respond_"+order+"_"+name] = timing
+    return results
+
+##########################################################################################
+### Benchmarks that depend on the size of the knowledge bases (in the current folder,
+### already written): load/save of the files, construction of myTrainedTris,
+### "get_computer_move" latency per strategy and cost of the learning.
+##########################################################################################
+def benchmark_size(size,seed,repeat):
+    results = {"lessons_per_file":size}
+    knowledge_base = tris.myLessonsLearntKnowledgeBase()
+    knowledge_base.load(tris.LESSONS_LEARNT_WIN_FILE)
+    records = len(knowledge_base)
+    results["lessons_in_file"] = records
+    for file_format in ("text","binary"):
+        my_kb_file_name = "benchmark."+file_format
+        timing = measure(lambda: knowledge_base.save(my_kb_file_name,file_format),repeat)
+        timing["lessons_per_second"] = records/timing["best_seconds"]
+        results["save_"+file_format] = timing
+        timing = measure(lambda: tris.myLessonsLearntKnowledgeBase().load(my_kb_file_name),repeat)
+        timing["lessons_per_second"] = records/timing["best_seconds"]
+        results["load_"+file_format] = timing
+        os.remove(my_kb_file_name)
+    for symmetric_lessons in (False,True):
+        name = "mytrainedtris_construction"+("_symmetric" if symmetric_lessons else "")
+        results[name] = measure(lambda: tris.myTrainedTris(verbose = False,symmetric_lessons = symmetric_lessons),repeat)
+        trained_tris = tris.myTrainedTris(verbose = False,symmetric_lessons = symmetric_lessons)
+        results[name]["nodes"] = trained_tris.perceptrons_network.network_dimension
+        name = "get_computer_move_latency"+("_symmetric" if symmetric_lessons else "")
+        results[name] = latency_by_label(reachable_boards(BENCHMARK_BOARDS,seed),lambda board: trained_move(trained_tris,board),seed)
+    matches = random_matches(BENCHMARK_MATCHES,seed)
+    game_learning = tris.myGameLearning()
+    timing = measure(lambda: [game_learning.get_match_lessons(match) for match in matches],repeat)
+    timing["matches_per_second"] = len(matches)/timing["best_seconds"]
+    results["get_match_lessons"] = timing
+
+    def analyze_matches():          # the learning as done by "play" (prints suppressed), files included
+        with contextlib.redirect_stdout(io.StringIO()):
+            for match in matches[:BENCHMARK_LEARNT_MATCHES]:
+                match = list(match)
+                if game_learning.get_match_result(match) == "tie":
+                    tris.myGameLearning().analyze_my_match(match,"tie")
+                    continue
+                counter = sum(1 for cell in match[1:] if cell is not None)
+                match[0] = tris.STAR if (-1)**counter == 1 else tris.CIRCLE     # the winner (see "play")
+                tris.myGameLearning().analyze_my_match(match,"win")
+                match[0] = -match[0]                                            # the looser
+                tris.myGameLearning().analyze_my_match(match,"loose")
+
+    timing = measure(analyze_matches,1)
+    timing["matches_per_second"] = BENCHMARK_LEARNT_MATCHES/timing["best_seconds"]
+    results["analyze_my_match"] = timing
+    return results
+
+##########################################################################################
+### Function "run_benchmarks" runs all the benchmarks in a temporary folder and returns
+### the dictionary of the results (ready for JSON).
+##########################################################################################
+def run_benchmarks(sizes = BENCHMARK_SIZES,seed = BENCHMARK_SEED,repeat = BENCHMARK_REPEAT,verbose = True):
+    results = {"seed":seed,"repeat":repeat,"python":platform.python_version(),"platform":platform.platform(),
+               "numpy":tris.numpy is not None,"basic":None,"sizes":dict()}
+    current_folder = os.getcwd()
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        try:
+            if verbose: print("Benchmarking the basic network...",file = sys.stderr)
+            results["basic"] = benchmark_basic(seed,repeat)
+            for size in sizes:
+                if verbose: print("Benchmarking knowledge bases of",size,"lessons...",file = sys.stderr)
+                for my_kb_file_name in os.listdir(folder):
+                    os.remove(my_kb_file_name)
+                write_synthetic_knowledge_bases(size,seed)
+                results["sizes"][str(size)] = benchmark_size(size,seed,repeat)
+        finally:
+            os.chdir(current_folder)
+    return results
+
+
+
+
+#################
+# MAIN PROGRAM: #
+#################
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = "Benchmarks of mytris_neural_learning (JSON output).")
+    parser.add_argument("--sizes",default = ",".join(str(size) for size in BENCHMARK_SIZES),help = "comma separated sizes of the knowledge bases")
+    parser.add_argument("--seed",type = int,default = BENCHMARK_SEED,help = "random seed")
+    parser.add_argument("--repeat",type = int,default = BENCHMARK_REPEAT,help = "repetitions of every measure")
+    parser.add_argument("--output",default = None,help = "JSON file of the results (default: standard output)")
+    arguments = parser.parse_args()
+    results = run_benchmarks([int(size) for size in arguments.sizes.split(",")],arguments.seed,arguments.repeat)
+    if arguments.output is None:
+        print(json.dumps(results,indent = 2))
+    else:
+        with open(arguments.output,'wt') as my_file_handler:
+            json.dump(results,my_file_handler,indent = 2)
@@ -32,6 +32,25 @@
 
 import random
 import os.path
+import bisect
+import hashlib
+import concurrent.futures
+import struct
+import zlib
+import mmap
+import copy
+import array
+import time
+import sys
+import collections
+import heapq
+import asyncio
+import json
+
+try:                    # NumPy is optional: it is only needed by the vectorized evaluation engine
+    import numpy
+except ImportError:
+    numpy = None
 
 
 
@@ -40,31 +59,310 @@ CIRCLE = 1  # Computer symbol O
 STAR = -1   # Human/User player symbol X
 EMPTY = 0   # Empty cell _
 
+LESSONS_LEARNT_WIN_FILE = "mytris.lessonslearnt_win.txt"                # knowledge base of the lessons learnt for winning
+LESSONS_LEARNT_TIE_FILE = "mytris.lessonslearnt_tie.txt"                # knowledge base of the lessons learnt for a tie
+LESSONS_LEARNT_NOT_LOOSE_FILE = "mytris.lessonslearnt_not_loose.txt"    # knowledge base of the lessons learnt for not loosing
+LESSONS_LEARNT_FILES = (LESSONS_LEARNT_WIN_FILE,LESSONS_LEARNT_TIE_FILE,LESSONS_LEARNT_NOT_LOOSE_FILE)
+LESSONS_JOURNAL_SUFFIX = ".journal"     # the new lessons are appended to the file <knowledge base file name>.journal
+LESSONS_JOURNAL_COMPACTION_THRESHOLD = 1000     # number of lessons in a journal that triggers its compaction
+LESSONS_BINARY_MAGIC = b"TRISKB"    # first bytes of a knowledge base file in binary format (see myLessonsLearntKnowledgeBase)
+LESSONS_BINARY_VERSION = 2          # version of the binary format
+LESSONS_BINARY_HEADER = struct.Struct("<6sHHIII")   # magic, version, flags, number of records, record size, CRC-32 of the records
+LESSONS_BINARY_RECORD_SIZE = 10     # bytes of a record: 9 weight codes (int8) and the destination cell (uint8)
+LESSONS_BINARY_CANONICAL = 1        # flag of a binary file whose lessons are all in canonical form (see "canonical_lesson")
+# the weights of a lesson are 0 or +-1/n: the code of a weight is the signed byte n (0 for the weight 0).
+# LESSONS_BINARY_WEIGHTS[b] is the weight of the byte b, LESSONS_BINARY_CODES the byte of every weight:
+LESSONS_BINARY_WEIGHTS = tuple(0.0 if b == 0 else 1/(b if b < 128 else b-256) for b in range(256))
+LESSONS_BINARY_CODES = {w:b for (b,w) in enumerate(LESSONS_BINARY_WEIGHTS)}
+MOVE_TABLE_FILE = "mytris.movetable.txt"                                # precomputed moves of myTrainedTris (see "use_move_table")
+TRIS_LINES = ((0,1,2),(3,4,5),(6,7,8),(0,3,6),(1,4,7),(2,5,8),(0,4,8),(2,4,6))  # the 8 lines of 3 cells that make a tris
+TRIS_LINE_MASKS = tuple((1 << a) | (1 << b) | (1 << c) for (a,b,c) in TRIS_LINES) # the same lines as 9-bit masks of cells
+TRIS_WINNING_MASKS = bytes(1 if any(mask & line == line for line in TRIS_LINE_MASKS) else 0 for mask in range(512))  # 1 if the cells of the mask contain a tris
+TRIS_FULL_MASK = 0x1FF      # mask of all the 9 cells
+# the 8 symmetries of the board (rotations and reflections): symmetry[c] is the cell where the cell c is moved
+TRIS_SYMMETRIES = ((0,1,2,3,4,5,6,7,8),(2,5,8,1,4,7,0,3,6),(8,7,6,5,4,3,2,1,0),(6,3,0,7,4,1,8,5,2),
+                   (2,1,0,5,4,3,8,7,6),(6,7,8,3,4,5,0,1,2),(0,3,6,1,4,7,2,5,8),(8,5,2,7,4,1,6,3,0))
+TRIS_SYMMETRIES_INVERSE = tuple(tuple(symmetry.index(c) for c in range(9)) for symmetry in TRIS_SYMMETRIES)
+# for every symmetry, the 512 masks of cells moved by the symmetry:
+TRIS_SYMMETRY_MASKS = tuple(tuple(sum(1 << symmetry[c] for c in range(9) if mask >> c & 1) for mask in range(512)) for symmetry in TRIS_SYMMETRIES)
+COMPILED_LAYER_FUNCTIONS = {}           # functions generated by myCompiledLayerEngine: fingerprint of the source -> function
+MAX_COMPILED_LAYER_FUNCTIONS = 4096     # max number of generated functions kept in memory
+
+
+
+
+##########################################################################################
+### Function "lessons_learnt_files_signature" returns a cheap signature (size and time
+### of the last change) of the lessons-learnt files, used to detect that they changed.
+##########################################################################################
+def lessons_learnt_files_signature():
+    return tuple(lessons_learnt_file_signature(my_kb_file_name) for my_kb_file_name in LESSONS_LEARNT_FILES)
+
+##########################################################################################
+### Function "lessons_learnt_file_signature" returns the cheap signature (size and time
+### of the last change) of a knowledge base file and of its journal (None if missing).
+##########################################################################################
+def lessons_learnt_file_signature(my_kb_file_name):
+    signature = list()
+    for my_file_name in (my_kb_file_name,my_kb_file_name+LESSONS_JOURNAL_SUFFIX):
+        try:
+            file_stat = os.stat(my_file_name)
+            signature.append((file_stat.st_size,file_stat.st_mtime_ns))
+        except FileNotFoundError:
+            signature.append(None)
+    return tuple(signature)
+
+##########################################################################################
+### Function "lessons_learnt_files_fingerprint" returns the SHA-1 digest of the contents
+### of the lessons-learnt files, used to check that a saved move table is up to date.
+##########################################################################################
+def lessons_learnt_files_fingerprint():
+    digest = hashlib.sha1()
+    for my_kb_file_name in LESSONS_LEARNT_FILES+tuple(name+LESSONS_JOURNAL_SUFFIX for name in LESSONS_LEARNT_FILES):
+        digest.update(my_kb_file_name.encode())
+        if os.path.exists(my_kb_file_name):
+            with open(my_kb_file_name, 'rb') as my_file_handler:
+                digest.update(my_file_handler.read())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+##########################################################################################
+### Function "lessons_learnt_file_exists" returns True if a knowledge base file or its
+### journal of new lessons (see myLessonsLearntKnowledgeBase.append) exists.
+##########################################################################################
+def lessons_learnt_file_exists(my_kb_file_name):
+    return os.path.exists(my_kb_file_name) or os.path.exists(my_kb_file_name+LESSONS_JOURNAL_SUFFIX)
+
+##########################################################################################
+### Function "canonical_lesson" returns the canonical form of a lesson (9 weights,
+### destination cell): among the 8 symmetric forms of the lesson (see TRIS_SYMMETRIES),
+### the one with the smallest (weights, destination). The symmetric forms of a lesson
+### have the same canonical form. It returns (tuple of the 9 weights, destination).
+##########################################################################################
+def canonical_lesson(weights,destination_node_id):
+    best = None
+    for symmetry in TRIS_SYMMETRIES:
+        moved = [None for i in range(9)]
+        for c in range(9):
+            moved[symmetry[c]] = weights[c]
+        lesson = (tuple(moved),symmetry[destination_node_id])
+        if best is None or lesson < best:
+            best = lesson
+    return best
+
+##########################################################################################
+### Function "canonical_lesson_table" is "canonical_lesson" for a whole table of lessons
+### at once (it needs NumPy): "weights" is an array of N rows of 9 weights, and
+### "destinations" an array of N destination cells. The forms of a lesson are compared
+### one column at a time, as the tuples are compared by "canonical_lesson".
+### It returns (array of the N canonical rows of weights, array of the N destinations).
+##########################################################################################
+def canonical_lesson_table(weights,destinations):
+    counter = len(destinations)
+    forms = numpy.empty((len(TRIS_SYMMETRIES),counter,10))     # the 8 symmetric forms of every lesson
+    for (k,symmetry) in enumerate(TRIS_SYMMETRIES):
+        forms[k,:,:9] = weights[:,list(TRIS_SYMMETRIES_INVERSE[k])]
+        forms[k,:,9] = numpy.array(symmetry)[destinations]
+    candidates = numpy.ones((len(TRIS_SYMMETRIES),counter),dtype = bool)  # the forms still equal to the smallest one
+    for column in range(10):
+        values = numpy.where(candidates,forms[:,:,column],numpy.inf)
+        candidates &= values == values.min(axis = 0)
+    best = forms[candidates.argmax(axis = 0),numpy.arange(counter)]
+    return (best[:,:9],best[:,9].astype(numpy.uint8))
+
+##########################################################################################
+### Function "format_lesson_weight" returns the text of a weight of a lesson, as it is
+### written to the text files: "0" for the weight 0 (as the learning writes it, whether
+### the weight was read as an integer or a float), the shortest repr otherwise.
+##########################################################################################
+def format_lesson_weight(weight):
+    return "0" if weight == 0 else str(weight)
+
+
+
+
+### Class for the board of the game: an immutable value made of two 9-bit masks
+### (bit i set if cell i holds the symbol), one for CIRCLE and one for STAR.
+### Every change (e.g. "play") returns a new board.
+###############################################################################
+class myTrisBoard:
+
+    #ATTRIBUTES(myTrisBoard):
+    #########################
+    __slots__ = ("o_mask","x_mask")     # o_mask: cells holding a CIRCLE, x_mask: cells holding a STAR
+
+    #METHODS(myTrisBoard):
+    ######################
+
+    def __init__(self,o_mask = 0,x_mask = 0):
+        self.o_mask = o_mask
+        self.x_mask = x_mask
+
+    ##############################################################################
+    ### myTrisBoard method "from_status" builds the board from a list of the 9
+    ### statuses of the cells (CIRCLE, STAR or EMPTY), e.g. the board perceptrons
+    ##############################################################################
+    @classmethod
+    def from_status(cls,status):
+        o_mask = 0
+        x_mask = 0
+        for i in range(9):
+            if status[i] == CIRCLE:
+                o_mask |= 1 << i
+            elif status[i] == STAR:
+                x_mask |= 1 << i
+        return cls(o_mask,x_mask)
+
+    ##############################################################################
+    ### myTrisBoard method "to_status" returns the list of the 9 statuses of the
+    ### cells (CIRCLE, STAR or EMPTY)
+    ##############################################################################
+    def to_status(self):
+        return [CIRCLE if self.o_mask >> i & 1 else (STAR if self.x_mask >> i & 1 else EMPTY) for i in range(9)]
+
+    def cell(self,i):           # status of the cell i
+        return CIRCLE if self.o_mask >> i & 1 else (STAR if self.x_mask >> i & 1 else EMPTY)
+
+    def empty_cells(self):      # IDs of the empty cells, in order
+        busy = self.o_mask | self.x_mask
+        return [i for i in range(9) if not busy >> i & 1]
+
+    ##############################################################################
+    ### myTrisBoard method "play" returns the board after "player" (CIRCLE or STAR)
+    ### has set its symbol in "cell" (that must be empty)
+    ##############################################################################
+    def play(self,cell,player):
+        bit = 1 << cell
+        if (self.o_mask | self.x_mask) & bit:
+            print("Error 1 from class myTrisBoard: cell",cell,"is busy on board [",self,"]")
+            quit()
+        if player == CIRCLE:
+            return myTrisBoard(self.o_mask | bit,self.x_mask)
+        return myTrisBoard(self.o_mask,self.x_mask | bit)
+
+    def winner(self):           # CIRCLE or STAR if it has made a tris, otherwise None
+        if TRIS_WINNING_MASKS[self.o_mask]:
+            return CIRCLE
+        if TRIS_WINNING_MASKS[self.x_mask]:
+            return STAR
+        return None
+
+    def is_full(self):          # True if no cell is empty
+        return self.o_mask | self.x_mask == TRIS_FULL_MASK
+
+    def is_over(self):          # True if the match is over (tris or full board)
+        return TRIS_WINNING_MASKS[self.o_mask] or TRIS_WINNING_MASKS[self.x_mask] or self.o_mask | self.x_mask == TRIS_FULL_MASK
+
+    def flipped(self):          # the same board from the point of view of the other player (CIRCLE and STAR swapped)
+        return myTrisBoard(self.x_mask,self.o_mask)
+
+    def transformed(self,k):    # the board moved by the k-th symmetry (see TRIS_SYMMETRIES)
+        masks = TRIS_SYMMETRY_MASKS[k]
+        return myTrisBoard(masks[self.o_mask],masks[self.x_mask])
+
+    def __eq__(self,other):
+        return isinstance(other,myTrisBoard) and self.o_mask == other.o_mask and self.x_mask == other.x_mask
+
+    def __hash__(self):
+        return self.o_mask << 9 | self.x_mask
 
+    def to_text(self):          # the 9 cells as text, e.g. "O_X_O___X" (rows from the top)
+        return "".join("O" if c == CIRCLE else ("X" if c == STAR else "_") for c in self.to_status())
 
+    @classmethod
+    def from_text(cls,text):    # the board from the text returned by "to_text" (None if the text is not a board)
+        if len(text) != 9 or any(c not in "OX_" for c in text.upper()):
+            return None
+        return cls.from_status([CIRCLE if c == "O" else (STAR if c == "X" else EMPTY) for c in text.upper()])
 
-### Class for single perceptron node
-####################################
+    def __repr__(self):         # e.g. "O_X/_O_/__X" (rows from the top)
+        symbols = "".join("O" if c == CIRCLE else ("X" if c == STAR else "_") for c in self.to_status())
+        return symbols[0:3]+"/"+symbols[3:6]+"/"+symbols[6:9]
+
+
+
+
+### Class for single perceptron node: a view of a node of a perceptron network, whose
+### values are kept by the network in arrays (see myPerceptronNetwork)
+####################################################################################
 class myPerceptron: 
 
     #ATTRIBUTES(myPerceptron):
     ##########################
-    
-    perceptron_name = None  # Name of the node
-    trigger_level = None    # Perceptron activation trigger (usually float value 0.9)
-    status = None           # Perceptron internal status (float value - for an activated node it is 1.0)
-                            # the approach is simplified so the status is also the output of the node.
+    __slots__ = ("network","node_id")   # network of the node and ID of the node in the network
+    # the values of the node are the properties:
+    # perceptron_name: Name of the node
+    # trigger_level: Perceptron activation trigger (usually float value 0.9)
+    # status: Perceptron internal status (float value - for an activated node it is 1.0)
+    #         the approach is simplified so the status is also the output of the node.
 
     #METHODS(myPerceptron):
     #######################
 
     ##############################################################################
-    ### The myPerceptron constructor just defines some internal values of the node
+    ### The myPerceptron constructor just binds the view to the node of the network
     ##############################################################################
-    def __init__(self,name,trigger_level = 0.9): 
-        self.perceptron_name = name         # define perceptron name
-        self.trigger_level = trigger_level  # define trigger
-        self.status = EMPTY                 # define the initial status as EMPTY (0)
+    def __init__(self,network,node_id): 
+        self.network = network
+        self.node_id = node_id
+
+    @property
+    def perceptron_name(self):      # the name is made only when it is shown
+        return "Node"+str(self.node_id)
+
+    @property
+    def status(self):
+        return self.network.node_statuses[self.node_id]
+
+    @status.setter
+    def status(self,status):
+        self.network.node_statuses[self.node_id] = status
+
+    @property
+    def trigger_level(self):
+        return self.network.node_triggers[self.node_id]
+
+    @trigger_level.setter
+    def trigger_level(self,trigger_level):  # the trigger is part of the topology (see myPerceptronNetwork "own_topology")
+        self.network.own_topology()
+        self.network.node_triggers[self.node_id] = trigger_level
+        self.network.topology_version += 1
+
+    def __repr__(self):
+        return self.perceptron_name+"(status="+str(self.status)+", trigger_level="+str(self.trigger_level)+")"
+
+
+
+
+### Class for the list of the nodes of a perceptron network: a sequence of views
+### (myPerceptron) made on demand, so that "perceptron_nodes[i].status" works
+################################################################################
+class myPerceptronNodes:
+
+    #ATTRIBUTES(myPerceptronNodes):
+    ###############################
+    __slots__ = ("network",)        # network of the nodes
+
+    #METHODS(myPerceptronNodes):
+    ############################
+
+    def __init__(self,network):
+        self.network = network
+
+    def __len__(self):
+        return self.network.network_dimension
+
+    def __getitem__(self,i):
+        if isinstance(i,slice):
+            return [myPerceptron(self.network,node_id) for node_id in range(*i.indices(self.network.network_dimension))]
+        if i < 0:
+            i += self.network.network_dimension
+        if i < 0 or i >= self.network.network_dimension:
+            raise IndexError("node ID out of range")
+        return myPerceptron(self.network,i)
+
+    def __iter__(self):
+        return (myPerceptron(self.network,node_id) for node_id in range(self.network.network_dimension))
 
 
 
@@ -76,12 +374,19 @@ class myPerceptronNetwork:
     #ATTRIBUTES(myPerceptronNetwork):
     #################################
 
-    MAX_NR_OF_NODES = None      # max number of perceptron nodes
+    MAX_NR_OF_NODES = None      # number of perceptron nodes the storage is allocated for (it grows on demand)
     network_name = None         # name of the perceptron network
     network_dimension = None    # network dimension (number of nodes already initialized)
-    perceptron_nodes = None     # list of initialized perceptron nodes
-    links_and_weights = None    # sparse matrix defining the weighted links between pairs of perceptron nodes
+    perceptron_nodes = None     # list of initialized perceptron nodes (views of the nodes, see myPerceptronNodes)
+    node_statuses = None        # array of the statuses of the nodes (float), indexed by node ID
+    node_triggers = None        # array of the activation triggers of the nodes (float), indexed by node ID
+    input_node_ids = None       # sparse adjacency: for every node, the sorted list of the IDs of its input nodes
+    input_weights = None        # sparse adjacency: for every node, the weights of its input links (same order as above)
     weights_0 = None            # weights associated with nodes even without links
+    topology_version = None     # counter increased at every change of nodes, links or weights (used to invalidate compiled engines)
+    layer_engine = None         # optional engine used to evaluate whole lists of nodes (None means pure Python evaluation)
+    topology_shared = None      # True if the links and weights are shared with clones (they are copied before the first change)
+    instrumentation = None      # optional myNetworkInstrumentation that counts the evaluations (None means no instrumentation)
 
     #METHODS(myPerceptronNetwork):
     ##############################
@@ -90,21 +395,46 @@ class myPerceptronNetwork:
     ### The myPerceptronNetwork constructor defines the basic internal values of the network
     ########################################################################################
     def __init__(self,name,max_nr_of_nodes):
-        self.MAX_NR_OF_NODES = int(max_nr_of_nodes) # define the max number of allowed perceptrons
+        self.MAX_NR_OF_NODES = 0                    # no storage allocated so far
         self.network_name = name                    # define the perceptron network name
         self.network_dimension = 0                  # define the starting network dimensions as 0
-        self.perceptron_nodes = list()              # initialise the initilized perceptron node list
-        # allocate the sparse matrix with no links and no weights:
-        self.links_and_weights = [[None for _ in range(self.MAX_NR_OF_NODES)] for _ in range(self.MAX_NR_OF_NODES)]
-        # allocate the list of weights associated with nodes even without links:
-        self.weights_0 = [None for _ in range(self.MAX_NR_OF_NODES)]    
+        self.perceptron_nodes = myPerceptronNodes(self)     # initialise the initilized perceptron node list
+        self.node_statuses = array.array('d')       # the values of the nodes are kept in contiguous arrays
+        self.node_triggers = array.array('d')
+        self.input_node_ids = []                    # sparse adjacency (incoming links of every node), allocated by "reserve"
+        self.input_weights = []
+        self.weights_0 = []                         # weights associated with nodes even without links, allocated by "reserve"
+        self.topology_version = 0                   # no changes in the topology so far
+        self.layer_engine = None                    # by default the lists of nodes are evaluated in pure Python
+        self.topology_shared = False                # the links and weights belong only to this network
+        self.reserve(max_nr_of_nodes)               # allocate the storage for the expected number of perceptrons
+
+    #####################################################################################################
+    ### myPerceptronNetwork "reserve" method makes sure that the storage is allocated for at least
+    ### "nr_of_nodes" perceptrons (with no links and no weights): it never shrinks the network.
+    #####################################################################################################
+    def reserve(self,nr_of_nodes):
+        nr_of_nodes = int(nr_of_nodes)
+        if nr_of_nodes <= self.MAX_NR_OF_NODES: return self.MAX_NR_OF_NODES  # already enough room
+        self.own_topology()                         # the storage is going to change
+        n = nr_of_nodes - self.MAX_NR_OF_NODES      # number of new slots
+        self.input_node_ids.extend([] for _ in range(n))
+        self.input_weights.extend([] for _ in range(n))
+        self.weights_0.extend(None for _ in range(n))
+        self.MAX_NR_OF_NODES = nr_of_nodes
+        return self.MAX_NR_OF_NODES
 
     #########################################################################################################
     ### myPerceptronNetwork "new_node" method creates a new perceptron node and inserts it into the node list
     #########################################################################################################
-    def new_node(self):     
-        self.perceptron_nodes.append(myPerceptron("Node"+str(self.network_dimension)))  # insert the new node in the "perceptron_nodes" list:
+    def new_node(self,trigger_level = 0.9):     
+        if self.network_dimension >= self.MAX_NR_OF_NODES:  # the storage is full: double it (amortized constant time per node)
+            self.reserve(max(2*self.MAX_NR_OF_NODES,16))
+        self.own_topology()                 # the triggers are going to change
+        self.node_statuses.append(EMPTY)    # the initial status of the new node is EMPTY (0)
+        self.node_triggers.append(trigger_level)
         self.network_dimension += 1         # increase the network dimension
+        self.topology_version += 1          # the topology has changed
         return self.network_dimension-1     # return the integer (id) that identifies the new node
 
     ###########################################################################################################
@@ -113,8 +443,16 @@ class myPerceptronNetwork:
     def new_link(self,from_node_id,to_node_id,weight):  
         # check if the 2 node IDs are good (between 0 and initialized network dimension):
         if from_node_id >= 0 and from_node_id < self.network_dimension and to_node_id >= 0 and to_node_id < self.network_dimension:
-            self.links_and_weights[from_node_id][to_node_id] = weight   # set the link and the related weight in the sparse matrix
-            return True                                                 # return success
+            self.own_topology()                             # the links are going to change
+            ids = self.input_node_ids[to_node_id]           # incoming links of "to_node_id", sorted by input node ID
+            k = bisect.bisect_left(ids,from_node_id)        # find the position of "from_node_id" in the sorted list
+            if k < len(ids) and ids[k] == from_node_id:     # if the link already exists just replace its weight
+                self.input_weights[to_node_id][k] = weight
+            else:                                           # otherwise insert the new link keeping the order by input node ID
+                ids.insert(k,from_node_id)
+                self.input_weights[to_node_id].insert(k,weight)
+            self.topology_version += 1                      # the topology has changed
+            return True                                     # return success
         else:
             print("ERROR 1 from class myPerceptronNetwork: bad node id(s) [",from_node_id,",",to_node_id,"]")
             quit()
@@ -127,7 +465,9 @@ class myPerceptronNetwork:
     def node_inputs(self,to_node_id,input_list):    
         for (from_node_id,weight) in input_list:    # for every "from_node_id" in the "input_list" create a new link towards "to_node_id"
             if from_node_id == None:                # if "from_node_id" is None, it means we're dealing with the weight that is not related to any link
+                self.own_topology()                 # the weights are going to change
                 self.weights_0[to_node_id] = weight # set the value of the weight that is not related to any link
+                self.topology_version += 1          # the topology has changed
                 continue                            # go on with all the other input links
             if not self.new_link(from_node_id,to_node_id,weight):   # build the link "from_node_id" - "to_node_id" by "weight" (float)
                 # If the function returns a value other than True, an error has occurred:
@@ -141,37 +481,888 @@ class myPerceptronNetwork:
     ### Be aware that the internal "status" of a node is also its output.               
     ############################################################################
     def evaluate_new_node_status(self,node_id):     # Evaluate the subsequent state of "node_id"
-        input_values = list()                       # Initialize the list of input values
-        for j in range(self.network_dimension):     # Find all nodes that are connected as input to "node_id"
-            if self.links_and_weights[j][node_id] != None:  # There is a link if the sparse matrix is ​​not None
-                input_values.append((self.links_and_weights[j][node_id],j)) # In that case collect the weight that connects the two nodes
-        acc = 0.0                                   # Initialize the internal node function calculation
-        for (w,j) in input_values:                  # Sum all input values ​​multiplied by the related weight
-            acc += w * self.perceptron_nodes[j].status
-        if self.weights_0[node_id] != None:         # If there is a weight not related to any link, add it
-            acc += self.weights_0[node_id]
-        if acc > self.perceptron_nodes[node_id].trigger_level:  # Activation function: if the sum is greater than the trigger value
+        acc = self.node_input_value(node_id)        # Weighted sum of all the inputs of the node
+        if acc > self.node_triggers[node_id]:       # Activation function: if the sum is greater than the trigger value
             if node_id < 9:                         # The activation for the nodes of the game board set a CIRCLE in the related cell.
-                if self.perceptron_nodes[node_id].status == EMPTY:      # only an empty cell can be written
-                    self.perceptron_nodes[node_id].status = CIRCLE   # CIRCLE in the cell
+                if self.node_statuses[node_id] == EMPTY:    # only an empty cell can be written
+                    self.node_statuses[node_id] = CIRCLE    # CIRCLE in the cell
                     return "move_done"  # return that a move has been done
                 else:
                     return "no_status_change"   # otherwise return that nothing has been done
             else:
-                self.perceptron_nodes[node_id].status = CIRCLE      # For all the other perceptrons the activation status is CIRCLE, so 1.0
+                self.node_statuses[node_id] = CIRCLE        # For all the other perceptrons the activation status is CIRCLE, so 1.0
                 return "activated_node"                             # return that "node_id" has been activated
         else:
             return "non_activated_node" # return that "node_id" hasn't been activated
 
+    ############################################################################
+    ### myPerceptronNetwork method that returns the weighted sum of all the
+    ### inputs of a node (plus its link-unrelated weight) without changing
+    ### its status.
+    ############################################################################
+    def node_input_value(self,node_id):
+        statuses = self.node_statuses               # The input nodes of "node_id" are directly listed in the sparse adjacency
+        acc = 0.0                                   # Initialize the internal node function calculation
+        for (j,w) in zip(self.input_node_ids[node_id],self.input_weights[node_id]):    # Sum all input values multiplied by the related weight
+            acc += w * statuses[j]
+        if self.weights_0[node_id] != None:         # If there is a weight not related to any link, add it
+            acc += self.weights_0[node_id]
+        return acc
+
     #################################################################################
     ### myPerceptronNetwork Method that evaluates the next status of a list of nodes 
     ### sequentially, from the first to the last, without caring about the results.
     ### The input is "node_id_set", a list of node ids.
     #################################################################################
     def evaluate_new_status_for_all_nodes_sequentially(self,node_id_set): 
+        if self.layer_engine is not None:           # if an evaluation engine is enabled, it evaluates the whole list at once
+            self.layer_engine.evaluate_layer(node_id_set)
+            return
         for node_id in node_id_set:                 # For every node ID in the list, from the first to the last:
             self.evaluate_new_node_status(node_id)  # evaluates the next status of "node_id" related perceptron
 
+    #################################################################################
+    ### myPerceptronNetwork method "truncate" removes all the nodes whose ID is
+    ### greater or equal than "network_dimension", together with all their links
+    ### (also the ones towards the remaining nodes).
+    #################################################################################
+    def truncate(self,network_dimension):
+        self.own_topology()                                                 # the links are going to change
+        for node_id in range(network_dimension,self.network_dimension):    # forget the inputs of the removed nodes
+            self.input_node_ids[node_id] = []
+            self.input_weights[node_id] = []
+            self.weights_0[node_id] = None
+        for node_id in range(network_dimension):                            # remove the links coming from the removed nodes
+            k = bisect.bisect_left(self.input_node_ids[node_id],network_dimension)
+            del self.input_node_ids[node_id][k:]
+            del self.input_weights[node_id][k:]
+        del self.node_statuses[network_dimension:]
+        del self.node_triggers[network_dimension:]
+        self.network_dimension = network_dimension
+        self.topology_version += 1                                          # the topology has changed
+
+    #################################################################################
+    ### myPerceptronNetwork method that enables the NumPy-backed engine for the
+    ### evaluation of lists of nodes (see class myVectorizedLayerEngine).
+    ### It returns False (and keeps the pure Python evaluation) if NumPy is missing.
+    #################################################################################
+    def enable_vectorized_engine(self):
+        if numpy is None:
+            print("Warning from class myPerceptronNetwork: NumPy not available, using the pure Python evaluation.")
+            return False
+        self.layer_engine = myVectorizedLayerEngine(self)   # the engine compiles the lists of nodes on first use
+        return True
+
+    #################################################################################
+    ### myPerceptronNetwork method that enables the evaluation of lists of nodes by
+    ### generated Python functions (see class myCompiledLayerEngine).
+    #################################################################################
+    def enable_compiled_engine(self):
+        self.layer_engine = myCompiledLayerEngine(self)    # the engine compiles the lists of nodes on their second use
+        return True
+
+    #################################################################################
+    ### myPerceptronNetwork method that enables the incremental evaluation of the
+    ### lists of nodes in "node_id_sets" (see class myIncrementalLayerEngine): the
+    ### engine already enabled, if any, evaluates the nodes and all the other lists.
+    #################################################################################
+    def enable_incremental_engine(self,node_id_sets = ()):
+        if not isinstance(self.layer_engine,myIncrementalLayerEngine):
+            self.layer_engine = myIncrementalLayerEngine(self,self.layer_engine)
+        for node_id_set in node_id_sets:
+            self.layer_engine.register_layer(node_id_set)
+        return True
+
+    #################################################################################
+    ### myPerceptronNetwork method that goes back to the pure Python evaluation.
+    #################################################################################
+    def disable_layer_engine(self):
+        self.layer_engine = None
+
+    #################################################################################
+    ### myPerceptronNetwork method "own_topology" copies the links and the weights
+    ### shared with clones (see "clone"), so that they can be changed without
+    ### changing the clones. It does nothing if they are not shared.
+    #################################################################################
+    def own_topology(self):
+        if self.topology_shared:
+            self.input_node_ids = [list(ids) for ids in self.input_node_ids]
+            self.input_weights = [list(weights) for weights in self.input_weights]
+            self.weights_0 = list(self.weights_0)
+            self.node_triggers = array.array('d',self.node_triggers)
+            self.topology_shared = False
+
+    #################################################################################
+    ### myPerceptronNetwork method "clone" returns a new network with the same nodes
+    ### and statuses. The links, the weights and the triggers (that do not change while
+    ### playing) are shared until one of the networks changes them (copy on write), so
+    ### only the statuses are copied. The clone has its own evaluation engine, if any.
+    #################################################################################
+    def clone(self):
+        network = copy.copy(self)
+        network.perceptron_nodes = myPerceptronNodes(network)
+        network.node_statuses = array.array('d',self.node_statuses)
+        self.topology_shared = True
+        network.topology_shared = True
+        if self.layer_engine is not None:   # the clone starts from the layers already compiled by this network
+            network.layer_engine = self.layer_engine.clone(network)
+        if self.instrumentation is not None:    # the clone counts its evaluations in the same instrumentation
+            network.enable_instrumentation(self.instrumentation)
+        return network
+
+    #################################################################################
+    ### myPerceptronNetwork method "snapshot" returns the statuses of all the nodes
+    ### (the only state that changes while playing), to be used by "restore".
+    #################################################################################
+    def snapshot(self):
+        return tuple(self.node_statuses)
+
+    #################################################################################
+    ### myPerceptronNetwork method "restore" sets the statuses of all the nodes as
+    ### they were when "snapshot" was taken.
+    #################################################################################
+    def restore(self,snapshot):
+        if len(snapshot) != self.network_dimension:
+            print("ERROR 3 from class myPerceptronNetwork: bad snapshot of",len(snapshot),"nodes for a network of",self.network_dimension,"nodes")
+            quit()
+        self.node_statuses[:] = array.array('d',snapshot)
+
+    #################################################################################
+    ### myPerceptronNetwork method "reset_statuses" sets to EMPTY the statuses of all
+    ### the nodes whose ID is greater or equal than "first_node_id".
+    #################################################################################
+    def reset_statuses(self,first_node_id):
+        if first_node_id < self.network_dimension:
+            self.node_statuses[first_node_id:] = array.array('d',bytes(8*(self.network_dimension-first_node_id)))
+
+    #################################################################################
+    ### myPerceptronNetwork method "enable_instrumentation" counts the evaluations
+    ### and activations of every node in "instrumentation" (a new one if None), that
+    ### is returned. The instrumented evaluation methods replace the normal ones only
+    ### for this network (as instance attributes), so the methods of the class are
+    ### not changed and without instrumentation nothing is paid. While instrumented,
+    ### the lists of nodes are still evaluated by the layer engine, if any (so the
+    ### times are the ones of the engine), and counted per list: every node of the
+    ### list is counted as evaluated, and as activated if the list set it to CIRCLE.
+    ### Without a layer engine every node evaluation is counted with its result.
+    #################################################################################
+    def enable_instrumentation(self,instrumentation = None):
+        if instrumentation is None:
+            instrumentation = myNetworkInstrumentation()
+        self.instrumentation = instrumentation
+        self.evaluate_new_node_status = self.instrumented_evaluate_new_node_status
+        self.evaluate_new_status_for_all_nodes_sequentially = self.instrumented_evaluate_new_status_for_all_nodes_sequentially
+        return instrumentation
+
+    #################################################################################
+    ### myPerceptronNetwork method "disable_instrumentation" goes back to the normal
+    ### evaluation methods.
+    #################################################################################
+    def disable_instrumentation(self):
+        self.instrumentation = None
+        self.__dict__.pop("evaluate_new_node_status",None)
+        self.__dict__.pop("evaluate_new_status_for_all_nodes_sequentially",None)
+
+    #################################################################################
+    ### myPerceptronNetwork instrumented versions of "evaluate_new_node_status" and
+    ### "evaluate_new_status_for_all_nodes_sequentially" (see "enable_instrumentation").
+    #################################################################################
+    def instrumented_evaluate_new_node_status(self,node_id):
+        result = myPerceptronNetwork.evaluate_new_node_status(self,node_id)
+        self.instrumentation.count(node_id,result)
+        return result
+
+    def instrumented_evaluate_new_status_for_all_nodes_sequentially(self,node_id_set):
+        if self.layer_engine is None:
+            for node_id in node_id_set:
+                self.instrumented_evaluate_new_node_status(node_id)
+            return
+        statuses = self.node_statuses
+        before = [statuses[node_id] for node_id in node_id_set]
+        self.layer_engine.evaluate_layer(node_id_set)
+        self.instrumentation.count_list(node_id_set,[node_id for (node_id,status) in zip(node_id_set,before)
+                                                     if status != CIRCLE and statuses[node_id] == CIRCLE])
+
+
+
+
+### Class for the NumPy-backed evaluation of lists of nodes of a perceptron network
+###################################################################################
+class myVectorizedLayerEngine:
+
+    #ATTRIBUTES(myVectorizedLayerEngine):
+    #####################################
+    network = None          # the perceptron network evaluated by the engine
+    compiled_layers = None  # dictionary: tuple of node IDs -> (topology version, list of compiled stages)
+    MAX_COMPILED_LAYERS = 1024  # max number of compiled lists kept in memory
+
+    #METHODS(myVectorizedLayerEngine):
+    ##################################
+
+    ##################################################################################
+    ### The myVectorizedLayerEngine constructor just binds the engine to the network.
+    ##################################################################################
+    def __init__(self,network):
+        self.network = network
+        self.compiled_layers = dict()
+
+    ##################################################################################
+    ### myVectorizedLayerEngine method "compile_layer" turns a list of node IDs into
+    ### a list of stages. A stage is a run of consecutive nodes of the list where no
+    ### node reads the output of another node of the same run, so that all its nodes
+    ### can be evaluated at once by a single matrix-vector product plus threshold
+    ### while giving the same result of the sequential evaluation.
+    ### Every stage is (node IDs, input node IDs, weight matrix, weights_0, triggers,
+    ### board-cell mask).
+    ##################################################################################
+    def compile_layer(self,node_id_set,split_in_runs = True):
+        net = self.network
+        runs = list()                               # split the list in runs of independent nodes
+        run = list()
+        run_members = set()
+        for node_id in node_id_set:
+            depends_on_run = node_id in run_members # a node evaluated twice must see its first result
+            for j in net.input_node_ids[node_id]:
+                if j in run_members:                # the node reads a node already evaluated in this run
+                    depends_on_run = True
+                    break
+            if depends_on_run and split_in_runs:    # close the current run and start a new one
+                runs.append(run)
+                run = list()
+                run_members = set()
+            run.append(node_id)
+            run_members.add(node_id)
+        if run:
+            runs.append(run)
+        stages = list()
+        for run in runs:                            # build the weight matrix of every run
+            columns = sorted({j for node_id in run for j in net.input_node_ids[node_id]})
+            column_index = {j:c for (c,j) in enumerate(columns)}
+            weights = numpy.zeros((len(run),len(columns)))
+            for (r,node_id) in enumerate(run):
+                for (j,w) in zip(net.input_node_ids[node_id],net.input_weights[node_id]):
+                    weights[r,column_index[j]] = w
+            bias = numpy.array([net.weights_0[node_id] if net.weights_0[node_id] != None else 0.0 for node_id in run])
+            triggers = numpy.array([net.node_triggers[node_id] for node_id in run])
+            board_cells = numpy.array([node_id < 9 for node_id in run],dtype=bool)
+            stages.append((run,columns,weights,bias,triggers,board_cells))
+        return stages
+
+    ##################################################################################
+    ### myVectorizedLayerEngine method "get_compiled_layer" returns the stages of a
+    ### list of nodes, compiling them on first use or after a change of topology.
+    ### With "split_in_runs" set to False the whole list is a single stage, that is
+    ### all its nodes read the statuses as they are before the evaluation.
+    ##################################################################################
+    def get_compiled_layer(self,node_id_set,split_in_runs = True):
+        key = (tuple(node_id_set),split_in_runs)
+        compiled = self.compiled_layers.get(key)
+        if compiled is None or compiled[0] != self.network.topology_version:   # (re)compile if the topology has changed
+            if len(self.compiled_layers) >= self.MAX_COMPILED_LAYERS:          # many different lists: start again
+                self.compiled_layers.clear()
+            compiled = (self.network.topology_version,self.compile_layer(key[0],split_in_runs))
+            self.compiled_layers[key] = compiled
+        return compiled[1]
+
+    ##################################################################################
+    ### myVectorizedLayerEngine method "evaluate_layer" evaluates a list of nodes with
+    ### the same semantics of evaluate_new_status_for_all_nodes_sequentially: an
+    ### activated board cell (IDs 0-8) becomes CIRCLE only if it is EMPTY ("move_done"),
+    ### any other activated node becomes CIRCLE ("activated_node") and non activated
+    ### nodes keep their status.
+    ### The lists are small, so on a single board the NumPy calls cost more than the
+    ### evaluation itself and this method is not faster than the pure Python one: the
+    ### engine pays off only when many boards share every product ("evaluate_layer_batch",
+    ### myTris "respond_batch"). For a single board use myCompiledLayerEngine.
+    ##################################################################################
+    def evaluate_layer(self,node_id_set):
+        statuses = self.network.node_statuses
+        for (run,columns,weights,bias,triggers,board_cells) in self.get_compiled_layer(node_id_set):
+            inputs = numpy.frombuffer(statuses,dtype=float)[columns]        # (copy of the inputs: the array is not kept busy)
+            activated = (weights @ inputs + bias) > triggers                # activation function of the whole stage
+            for r in numpy.flatnonzero(activated).tolist():
+                if board_cells[r]:
+                    if statuses[run[r]] == EMPTY:   # only an empty cell can be written
+                        statuses[run[r]] = CIRCLE
+                else:
+                    statuses[run[r]] = CIRCLE       # for all the other perceptrons the activation status is CIRCLE
+
+    ##################################################################################
+    ### myVectorizedLayerEngine method "evaluate_layer_batch" is the same as
+    ### "evaluate_layer" but it works on many independent copies of the network
+    ### statuses at once: "statuses" is a 2D NumPy array (one row for every copy,
+    ### one column for every node) that is updated in place.
+    ### It returns the boolean activation matrix of the nodes (one column for every
+    ### node in the list, in the same order).
+    ##################################################################################
+    def evaluate_layer_batch(self,node_id_set,statuses):
+        activations = numpy.zeros((statuses.shape[0],len(node_id_set)),dtype=bool)
+        position = 0                                # position of the first node of the stage in the list
+        for (run,columns,weights,bias,triggers,board_cells) in self.get_compiled_layer(node_id_set):
+            activated = (statuses[:,columns] @ weights.T + bias) > triggers     # activation function of the whole stage
+            writable = activated & (~board_cells | (statuses[:,run] == EMPTY))  # only an empty cell can be written
+            statuses[:,run] = numpy.where(writable,CIRCLE,statuses[:,run])
+            activations[:,position:position+len(run)] = activated
+            position += len(run)
+        return activations
+
+    ##################################################################################
+    ### myVectorizedLayerEngine method "input_values_batch" returns, for every copy
+    ### of the network statuses (rows of "statuses"), the weighted sum of the inputs
+    ### of the nodes in "node_id_set" (one column for every node) without changing
+    ### any status.
+    ##################################################################################
+    def input_values_batch(self,node_id_set,statuses):
+        ((run,columns,weights,bias,triggers,board_cells),) = self.get_compiled_layer(node_id_set,split_in_runs = False)
+        return statuses[:,columns] @ weights.T + bias
+
+    ##################################################################################
+    ### myVectorizedLayerEngine method "clone" returns the same engine for another
+    ### network (see myPerceptronNetwork "clone"), with the same compiled lists.
+    ##################################################################################
+    def clone(self,network):
+        engine = copy.copy(self)
+        engine.network = network
+        engine.compiled_layers = dict(self.compiled_layers)
+        return engine
+
+
+
+
+### Class for the incremental evaluation of lists of nodes of a perceptron network:
+### only the nodes that read (directly or not) the board cells changed since the
+### last evaluation of the same list are evaluated again
+###################################################################################
+class myIncrementalLayerEngine:
+
+    #ATTRIBUTES(myIncrementalLayerEngine):
+    ######################################
+    network = None          # the perceptron network evaluated by the engine
+    full_engine = None      # engine used for the full evaluations and the lists not registered (None means pure Python evaluation)
+    registered_layers = None    # dictionary: key of a registered list of nodes (see "layer_key") -> the list (see "register_layer")
+    compiled_layers = None  # dictionary: key of a registered list -> compiled list (see "compile_layer") or False if the
+                            # list is not evaluated incrementally
+    last_results = None     # dictionary: key of a registered list -> (bytes of the board statuses, board statuses, statuses of the
+                            # nodes of the list)
+    layer_gates = None      # dictionary: key of a compiled list -> how the list is evaluated (see "new_gate")
+    MAX_CHANGED_CELLS = 2   # with more changed board cells the whole list is evaluated again (the cones would cover most of it)
+    COST_SAMPLES = 100      # number of evaluations of a list measured before deciding how to evaluate it
+    COST_PERIOD = 2000      # number of evaluations of a list after which its costs are measured again
+    FULL_COST_SHARE = 4     # while measuring, at least 1 evaluation out of FULL_COST_SHARE is full (to measure its cost)
+
+    #METHODS(myIncrementalLayerEngine):
+    ###################################
+
+    ##################################################################################
+    ### The myIncrementalLayerEngine constructor binds the engine to the network;
+    ### "full_engine" (e.g. a myCompiledLayerEngine) evaluates the lists from scratch.
+    ##################################################################################
+    def __init__(self,network,full_engine = None):
+        self.network = network
+        self.full_engine = full_engine
+        self.registered_layers = dict()
+        self.compiled_layers = dict()
+        self.last_results = dict()
+        self.layer_gates = dict()
+
+    ##################################################################################
+    ### myIncrementalLayerEngine function "layer_key" returns the key of a list of
+    ### nodes: (first node ID, last node ID + 1), None for an empty list. Only the
+    ### runs of consecutive node IDs can be evaluated incrementally (see
+    ### "compile_layer"), so the key identifies a registered list by the nodes it
+    ### holds, whatever list object is passed (the other lists with the same key
+    ### are told apart by their length, see "evaluate_layer").
+    ##################################################################################
+    @staticmethod
+    def layer_key(node_id_set):
+        return (node_id_set[0],node_id_set[-1]+1) if node_id_set else None
+
+    ##################################################################################
+    ### myIncrementalLayerEngine method "register_layer" makes a list of nodes that
+    ### does not change (e.g. the detectors of the basic network) incremental: only
+    ### the lists registered are evaluated incrementally, all the others (e.g. the
+    ### lessons learnt) are evaluated by the full engine without any overhead.
+    ##################################################################################
+    def register_layer(self,node_id_set):
+        key = self.layer_key(node_id_set)
+        if key is None or key[1]-key[0] != len(node_id_set):   # not a run of consecutive nodes: never incremental
+            return
+        self.registered_layers[key] = list(node_id_set)
+        self.compiled_layers.pop(key,None)
+        self.last_results.pop(key,None)
+        self.layer_gates.pop(key,None)
+
+    ##################################################################################
+    ### myIncrementalLayerEngine method "compile_layer" returns, for a list of nodes,
+    ### (topology version, first node ID, last node ID + 1, bytes of the statuses of
+    ### the list when all its nodes are EMPTY, cones, dictionary: changed cells ->
+    ### function of their cones) where the cone of a board cell is the set of the
+    ### nodes of the list that read it, directly or through other nodes of the list.
+    ### The list can be evaluated incrementally only if its nodes are consecutive
+    ### (not board cells) and read only board cells (IDs 0-8) and nodes that come
+    ### before them in the list: in this case, when all its nodes are EMPTY before the
+    ### evaluation (as after "reset_all_but_the_board"), the result depends only on
+    ### the board. Otherwise False is returned.
+    ##################################################################################
+    def compile_layer(self,node_id_set):
+        net = self.network
+        if node_id_set == [] or node_id_set[0] < 9 or list(node_id_set) != list(range(node_id_set[0],node_id_set[0]+len(node_id_set))):
+            return False
+        cells = dict()                              # node ID -> set of the board cells read by the node (directly or not)
+        for node_id in node_id_set:
+            cells[node_id] = set()
+            for j in net.input_node_ids[node_id]:
+                if j < 9:
+                    cells[node_id].add(j)
+                elif j in cells and j != node_id:   # reads a node evaluated before it
+                    cells[node_id] |= cells[j]
+                else:
+                    return False
+        cones = tuple(frozenset(node_id for node_id in node_id_set if i in cells[node_id]) for i in range(9))
+        return (net.topology_version,node_id_set[0],node_id_set[0]+len(node_id_set),bytes(8*len(node_id_set)),cones,dict())
+
+    ##################################################################################
+    ### myIncrementalLayerEngine method "get_cone_function" returns the function that
+    ### evaluates again, from EMPTY and in the order of the list, the nodes of the
+    ### cones of the "changed" board cells (generated by myCompiledLayerEngine and
+    ### kept for the same changed cells).
+    ##################################################################################
+    def get_cone_function(self,compiled,changed):
+        cone_functions = compiled[5]
+        cone_function = cone_functions.get(changed)
+        if cone_function is None:
+            cones = compiled[4]
+            cone_list = sorted(frozenset().union(*(cones[i] for i in changed)))
+            cone_function = myCompiledLayerEngine(self.network).compile_layer(cone_list,reset = True)
+            cone_functions[changed] = cone_function
+        return cone_function
+
+    ##################################################################################
+    ### myIncrementalLayerEngine method "full_evaluation" evaluates a list of nodes
+    ### from scratch, by the full engine or one node after the other.
+    ##################################################################################
+    def full_evaluation(self,node_id_set):
+        if self.full_engine is not None:
+            self.full_engine.evaluate_layer(node_id_set)
+        else:
+            network = self.network
+            evaluate_new_node_status = myPerceptronNetwork.evaluate_new_node_status    # (not counted by the instrumentation)
+            for node_id in node_id_set:
+                evaluate_new_node_status(network,node_id)
+
+    ##################################################################################
+    ### myIncrementalLayerEngine method "new_gate" returns how a compiled list is
+    ### evaluated before its costs are measured: "incremental" is False if the list
+    ### is evaluated by the full engine alone, "use_cones" the flags "use the cones"
+    ### for 0, 1, ... MAX_CHANGED_CELLS changed cells, "countdown" the number of the
+    ### evaluations before the next measure and "costs" the costs measured so far (None
+    ### when not measuring): "paths" is a list of samples (seconds) for every path of
+    ### the evaluation (the cones of 0, 1, ... MAX_CHANGED_CELLS changed cells, then
+    ### the full evaluation with the bookkeeping of the last result), "counts" the
+    ### number of the evaluations that took every path and "full" the samples of the
+    ### full engine alone.
+    ##################################################################################
+    def new_gate(self):
+        return {"incremental":True,"use_cones":[True for k in range(self.MAX_CHANGED_CELLS+1)],"countdown":self.COST_PERIOD,
+                "costs":{"paths":[list() for k in range(self.MAX_CHANGED_CELLS+2)],"counts":[0 for k in range(self.MAX_CHANGED_CELLS+2)],
+                         "full":list()}}
+
+    ##################################################################################
+    ### myIncrementalLayerEngine method "record_cost" records the seconds taken by an
+    ### evaluation of a registered list: "path" is the number of the changed cells
+    ### evaluated by their cones, MAX_CHANGED_CELLS+1 for a full evaluation, "forced"
+    ### is True if the evaluation was full only to measure the full engine and
+    ### "full_seconds" is the part of the full evaluation alone (None for the cones).
+    ### After COST_SAMPLES evaluations the cones are kept only for the numbers of
+    ### changed cells where they cost less than a full evaluation, and the list is
+    ### evaluated by the full engine alone (no bookkeeping at all) if on the measured
+    ### mix of changes the incremental evaluation would not cost less. The decision
+    ### holds for the next COST_PERIOD evaluations.
+    ##################################################################################
+    def record_cost(self,key,gate,path,forced,seconds,full_seconds):
+        costs = gate["costs"]
+        costs["paths"][path].append(seconds)
+        if full_seconds is not None:
+            costs["full"].append(full_seconds)
+        if not forced:
+            costs["counts"][path] += 1
+        if sum(costs["counts"]) < self.COST_SAMPLES:
+            return
+
+        def median(samples):
+            return sorted(samples)[len(samples)//2]
+
+        gate["costs"] = None                        # decide until the next measure
+        full_path = self.MAX_CHANGED_CELLS+1
+        full_cost = median(costs["full"])
+        full_path_cost = median(costs["paths"][full_path])
+        use_cones = gate["use_cones"]
+        incremental_cost = costs["counts"][full_path]*full_path_cost
+        for k in range(full_path):
+            if costs["paths"][k]:
+                use_cones[k] = median(costs["paths"][k]) < full_path_cost
+                incremental_cost += costs["counts"][k]*(median(costs["paths"][k]) if use_cones[k] else full_path_cost)
+        if incremental_cost >= full_cost*sum(costs["counts"]):     # the incremental evaluation does not pay off
+            gate["incremental"] = False
+            self.last_results.pop(key,None)
+
+    ##################################################################################
+    ### myIncrementalLayerEngine method "evaluate_layer" evaluates a list of nodes with
+    ### the same results of evaluate_new_status_for_all_nodes_sequentially. If the
+    ### registered list was evaluated before (from EMPTY nodes, see "compile_layer")
+    ### the statuses of that time are set again, and only the nodes in the cones of
+    ### the changed board cells (at most MAX_CHANGED_CELLS, as between two turns) are
+    ### evaluated again (see "get_cone_function").
+    ### The lists are compiled on first use and again after a change of topology,
+    ### that also forgets their last result. The first COST_SAMPLES evaluations of a
+    ### list, and again after every COST_PERIOD, are timed to decide whether the
+    ### cones pay off against the full engine (see "record_cost").
+    ##################################################################################
+    def evaluate_layer(self,node_id_set):
+        key = (node_id_set[0],node_id_set[-1]+1) if node_id_set else None  # (see "layer_key")
+        gate = self.layer_gates.get(key)
+        if gate is not None and gate["costs"] is None:  # decided: count down to the next measure
+            gate["countdown"] -= 1
+            if gate["countdown"] <= 0:
+                self.layer_gates[key] = self.new_gate()
+            elif not gate["incremental"]:
+                self.full_evaluation(node_id_set)
+                return
+        compiled = self.compiled_layers.get(key)
+        if compiled is None or (compiled is not False and compiled[0] != self.network.topology_version):
+            if key not in self.registered_layers:   # not registered: no incremental evaluation
+                self.full_evaluation(node_id_set)
+                return
+            compiled = self.compile_layer(node_id_set)
+            self.compiled_layers[key] = compiled
+            self.last_results.pop(key,None)
+            self.layer_gates[key] = self.new_gate() # measure the costs again
+        if compiled is False:
+            self.full_evaluation(node_id_set)
+            return
+        gate = self.layer_gates[key]
+        costs = gate["costs"]
+        measuring = costs is not None
+        start = time.perf_counter() if measuring else 0.0   # (the bookkeeping is part of the cost)
+        first = compiled[1]
+        end = compiled[2]
+        statuses = self.network.node_statuses
+        if len(node_id_set) != end-first or statuses[first:end].tobytes() != compiled[3]:    # another list, or the result
+                                                                                            # does not depend only on the board
+            self.full_evaluation(node_id_set)
+            return
+        board = statuses[:9].tobytes()
+        last_result = self.last_results.get(key)
+        changed = None                              # None: full evaluation
+        if last_result is not None:
+            (last_board,last_cells,last_statuses) = last_result
+            if board == last_board:
+                changed = ()
+            else:
+                changed = tuple([i for i in range(9) if statuses[i] != last_cells[i]])
+                if len(changed) > self.MAX_CHANGED_CELLS:   # the cones would cover most of the list
+                    changed = None
+            if changed is not None and not gate["use_cones"][len(changed)]: # the cones do not pay off for so many changes
+                changed = None
+        forced = measuring and changed is not None and len(costs["full"])*self.FULL_COST_SHARE <= sum(costs["counts"])
+        if changed is None or forced:               # (forced: measure the full engine too)
+            full_start = time.perf_counter() if measuring else 0.0
+            self.full_evaluation(node_id_set)
+            full_end = time.perf_counter() if measuring else 0.0
+            self.last_results[key] = (board,tuple(statuses[:9]),statuses[first:end])
+            if measuring:
+                self.record_cost(key,gate,self.MAX_CHANGED_CELLS+1,forced,time.perf_counter()-start,full_end-full_start)
+        else:
+            if changed and changed not in compiled[5]:     # generate the function out of the measure
+                self.get_cone_function(compiled,changed)
+                start = time.perf_counter() if measuring else 0.0
+            cone_function = self.get_cone_function(compiled,changed) if changed else None
+            statuses[first:end] = last_statuses     # start from the last result
+            if cone_function is not None:
+                cone_function(statuses)
+                self.last_results[key] = (board,tuple(statuses[:9]),statuses[first:end])
+            if measuring:
+                self.record_cost(key,gate,len(changed),False,time.perf_counter()-start,None)
+
+    ##################################################################################
+    ### myIncrementalLayerEngine method "clone" returns the same engine for another
+    ### network (see myPerceptronNetwork "clone"), with the same registered and
+    ### compiled lists and last results.
+    ##################################################################################
+    def clone(self,network):
+        engine = copy.copy(self)
+        engine.network = network
+        engine.registered_layers = dict(self.registered_layers)
+        engine.compiled_layers = dict(self.compiled_layers)
+        engine.last_results = dict(self.last_results)
+        engine.layer_gates = copy.deepcopy(self.layer_gates)
+        if self.full_engine is not None:
+            engine.full_engine = self.full_engine.clone(network)
+        return engine
+
+
+
+
+### Class for the evaluation of lists of nodes of a perceptron network by Python
+### functions generated for every list: straight-line code with the weights as
+### constants and without the links of weight 0 (no NumPy needed)
+###################################################################################
+class myCompiledLayerEngine:
+
+    #ATTRIBUTES(myCompiledLayerEngine):
+    ###################################
+    network = None          # the perceptron network evaluated by the engine
+    compiled_layers = None  # dictionary: tuple of node IDs -> (topology version, generated function or False if not compiled yet)
+    MAX_COMPILED_LAYERS = 1024  # max number of compiled lists kept in memory
+
+    #METHODS(myCompiledLayerEngine):
+    ################################
+
+    ##################################################################################
+    ### The myCompiledLayerEngine constructor just binds the engine to the network.
+    ##################################################################################
+    def __init__(self,network):
+        self.network = network
+        self.compiled_layers = dict()
+
+    ##################################################################################
+    ### myCompiledLayerEngine method "generate_source" returns the source of the
+    ### function "layer(statuses)" that evaluates a list of nodes like
+    ### evaluate_new_status_for_all_nodes_sequentially ("statuses" is the array of
+    ### the statuses of the network). The statuses read are kept in local variables
+    ### (v<node ID>), the weighted sums add the same terms in the same order (so the
+    ### results are the same, up to the last bit) and a node that can never be
+    ### activated is not evaluated at all. With "reset" the nodes of the list are
+    ### set to EMPTY before the evaluation (see myIncrementalLayerEngine).
+    ##################################################################################
+    def generate_source(self,node_id_set,reset = False):
+        net = self.network
+        inputs = dict()                             # node ID -> list of (input node ID, weight) of the links with weight other than 0
+        for node_id in node_id_set:
+            if node_id not in inputs:
+                inputs[node_id] = [(j,w) for (j,w) in zip(net.input_node_ids[node_id],net.input_weights[node_id]) if w != 0]
+        read = sorted({j for links in inputs.values() for (j,w) in links} | {node_id for node_id in inputs if node_id < 9})
+        lines = ["def layer(statuses):"]
+        if reset:
+            lines.extend("    statuses["+str(node_id)+"] = 0.0" for node_id in inputs)
+        lines.extend("    v"+str(j)+" = statuses["+str(j)+"]" for j in read)
+        for node_id in node_id_set:
+            terms = list()
+            for (j,w) in inputs[node_id]:
+                if w == 1:
+                    terms.append("v"+str(j))
+                elif w == -1:
+                    terms.append("-v"+str(j))
+                else:
+                    terms.append(repr(float(w))+"*v"+str(j))
+            if net.weights_0[node_id] != None and net.weights_0[node_id] != 0:
+                terms.append(repr(float(net.weights_0[node_id])))
+            trigger = repr(net.node_triggers[node_id])
+            if terms == []:                         # the sum is 0.0: the activation is known now
+                if not 0.0 > net.node_triggers[node_id]:
+                    continue
+                condition = "True"
+            else:
+                condition = " + ".join(terms).replace("+ -","- ")+" > "+trigger
+            if node_id < 9:                         # only an empty cell can be written
+                condition = "v"+str(node_id)+" == 0 and "+condition if condition != "True" else "v"+str(node_id)+" == 0"
+            lines.append("    if "+condition+":")
+            lines.append("        statuses["+str(node_id)+"] = 1.0")
+            if node_id in read:
+                lines.append("        v"+str(node_id)+" = 1.0")
+        lines.append("    return None")
+        return "\n".join(lines)+"\n"
+
+    ##################################################################################
+    ### myCompiledLayerEngine method "compile_layer" returns the generated function
+    ### of a list of nodes ("reset" as in "generate_source"). The functions do not depend on the network, so they are
+    ### kept in COMPILED_LAYER_FUNCTIONS by fingerprint (hash of the source) and shared
+    ### by all the networks with the same nodes, links and weights (e.g. clones).
+    ##################################################################################
+    def compile_layer(self,node_id_set,reset = False):
+        source = self.generate_source(node_id_set,reset)
+        fingerprint = hashlib.sha1(source.encode()).hexdigest()
+        function = COMPILED_LAYER_FUNCTIONS.get(fingerprint)
+        if function is None:
+            if len(COMPILED_LAYER_FUNCTIONS) >= MAX_COMPILED_LAYER_FUNCTIONS:  # many different lists: start again
+                COMPILED_LAYER_FUNCTIONS.clear()
+            namespace = dict()
+            exec(compile(source,"<layer "+fingerprint+">","exec"),namespace)
+            function = namespace["layer"]
+            COMPILED_LAYER_FUNCTIONS[fingerprint] = function
+        return function
+
+    ##################################################################################
+    ### myCompiledLayerEngine method "get_compiled_layer" returns the generated
+    ### function of a list of nodes, or None if the list is used for the first time
+    ### (many lists of lesson nodes are used once, it is not worth compiling them).
+    ### The list is compiled again after a change of topology.
+    ##################################################################################
+    def get_compiled_layer(self,key):
+        compiled = self.compiled_layers.get(key)
+        if compiled is None or compiled[0] != self.network.topology_version:   # first use, or the topology has changed
+            if len(self.compiled_layers) >= self.MAX_COMPILED_LAYERS:          # many different lists: start again
+                self.compiled_layers.clear()
+            self.compiled_layers[key] = (self.network.topology_version,False)
+            return None
+        if compiled[1] is False:
+            compiled = (compiled[0],self.compile_layer(key))
+            self.compiled_layers[key] = compiled
+        return compiled[1]
+
+    ##################################################################################
+    ### myCompiledLayerEngine method "evaluate_layer" evaluates a list of nodes by its
+    ### generated function (one node after the other the first time it is used).
+    ##################################################################################
+    def evaluate_layer(self,node_id_set):
+        key = tuple(node_id_set)
+        function = self.get_compiled_layer(key)
+        if function is None:
+            for node_id in key:
+                myPerceptronNetwork.evaluate_new_node_status(self.network,node_id)
+        else:
+            function(self.network.node_statuses)
+
+    ##################################################################################
+    ### myCompiledLayerEngine method "clone" returns the same engine for another
+    ### network (see myPerceptronNetwork "clone"), with the same compiled lists.
+    ##################################################################################
+    def clone(self,network):
+        engine = copy.copy(self)
+        engine.network = network
+        engine.compiled_layers = dict(self.compiled_layers)
+        return engine
+
+
+
+
+### Class for the optional instrumentation of a perceptron network: counters of the
+### evaluations and activations of every node and timers of the strategy tiers of
+### myTrainedTris "get_computer_move" (see "enable_instrumentation" of both classes)
+####################################################################################
+class myNetworkInstrumentation:
+
+    #ATTRIBUTES(myNetworkInstrumentation):
+    ######################################
+    node_evaluations = None     # dictionary: node ID -> number of evaluations of the node
+    node_activations = None     # dictionary: node ID -> number of activations of the node ("move_done" or "activated_node")
+    evaluations = None          # total number of node evaluations
+    activations = None          # total number of node activations
+    tiers = None                # dictionary: tier label -> "calls", "seconds", "node_evaluations", "node_activations", "moves"
+    moves = None                # dictionary: strategy label -> number of moves produced by that strategy
+    move_calls = None           # number of calls of "get_computer_move"
+    move_seconds = None         # total time spent in "get_computer_move"
+
+    #METHODS(myNetworkInstrumentation):
+    ###################################
+
+    def __init__(self):
+        self.reset()
+
+    ##################################################################################
+    ### myNetworkInstrumentation method "reset" sets all the counters and timers to 0.
+    ##################################################################################
+    def reset(self):
+        self.node_evaluations = collections.Counter()
+        self.node_activations = collections.Counter()
+        self.evaluations = 0
+        self.activations = 0
+        self.tiers = dict()
+        self.moves = dict()
+        self.move_calls = 0
+        self.move_seconds = 0.0
+
+    ##################################################################################
+    ### myNetworkInstrumentation method "count" records the evaluation of a node with
+    ### the result returned by "evaluate_new_node_status".
+    ##################################################################################
+    def count(self,node_id,result):
+        self.node_evaluations[node_id] += 1
+        self.evaluations += 1
+        if result == "move_done" or result == "activated_node":
+            self.node_activations[node_id] += 1
+            self.activations += 1
+
+    ##################################################################################
+    ### myNetworkInstrumentation method "count_list" records the evaluation of a list
+    ### of nodes by a layer engine, with the IDs of the nodes that it activated.
+    ##################################################################################
+    def count_list(self,node_id_set,activated_node_ids):
+        self.node_evaluations.update(node_id_set)
+        self.evaluations += len(node_id_set)
+        self.node_activations.update(activated_node_ids)
+        self.activations += len(activated_node_ids)
+
+    ##################################################################################
+    ### myNetworkInstrumentation methods "start_tier" and "end_tier" time a strategy
+    ### tier (label): "start_tier" returns the starting point to be passed to
+    ### "end_tier", together with True if the tier produced the move.
+    ##################################################################################
+    def start_tier(self):
+        return (time.perf_counter(),self.evaluations,self.activations)
+
+    def end_tier(self,label,start,move_done):
+        tier = self.tiers.get(label)
+        if tier is None:
+            tier = self.tiers[label] = {"calls":0,"seconds":0.0,"node_evaluations":0,"node_activations":0,"moves":0}
+        tier["calls"] += 1
+        tier["seconds"] += time.perf_counter()-start[0]
+        tier["node_evaluations"] += self.evaluations-start[1]
+        tier["node_activations"] += self.activations-start[2]
+        if move_done:
+            tier["moves"] += 1
+
+    ##################################################################################
+    ### myNetworkInstrumentation method "end_move" records the strategy label that
+    ### finally produced the move and the time of the whole "get_computer_move" call
+    ### ("start" as returned by "start_tier" at the beginning of the call).
+    ##################################################################################
+    def end_move(self,label,start):
+        self.moves[label] = self.moves.get(label,0) + 1
+        self.move_calls += 1
+        self.move_seconds += time.perf_counter()-start[0]
+
+    ##################################################################################
+    ### myNetworkInstrumentation method "to_dict" returns all the counters and timers
+    ### as a dictionary that can be saved as JSON. Only the "top_nodes" most evaluated
+    ### nodes are listed (all of them if "top_nodes" is None).
+    ##################################################################################
+    def to_dict(self,top_nodes = None):
+        nodes = self.node_evaluations.most_common(top_nodes)
+        return {"moves":{"calls":self.move_calls,"seconds":self.move_seconds,"labels":dict(self.moves)},
+                "tiers":{label:dict(tier) for (label,tier) in self.tiers.items()},
+                "nodes":{"evaluations":self.evaluations,"activations":self.activations,
+                         "per_node":[{"node_id":node_id,"evaluations":evaluations,"activations":self.node_activations[node_id]}
+                                     for (node_id,evaluations) in nodes]}}
+
+    ##################################################################################
+    ### myNetworkInstrumentation method "to_json" returns "to_dict" as JSON text.
+    ##################################################################################
+    def to_json(self,top_nodes = None,indent = 2):
+        return json.dumps(self.to_dict(top_nodes),indent = indent)
+
+    ##################################################################################
+    ### myNetworkInstrumentation method "summary_table" returns a text table with the
+    ### tiers (in order of first use) and the "top_nodes" most evaluated nodes.
+    ##################################################################################
+    def summary_table(self,top_nodes = 10):
+        lines = list()
+        mean = self.move_seconds/self.move_calls*1e6 if self.move_calls > 0 else 0.0
+        lines.append("Computer moves: "+str(self.move_calls)+" in "+format(self.move_seconds*1e3,".1f")+" ms (mean "+format(mean,".1f")+" us)")
+        lines.append("")
+        lines.append(format("tier","<32")+format("calls",">9")+format("moves",">9")+format("total ms",">11")+format("mean us",">10")+
+                     format("evaluations",">13")+format("activations",">13"))
+        for (label,tier) in self.tiers.items():
+            mean = tier["seconds"]/tier["calls"]*1e6 if tier["calls"] > 0 else 0.0
+            lines.append(format(label,"<32")+format(tier["calls"],">9")+format(tier["moves"],">9")+format(tier["seconds"]*1e3,">11.1f")+
+                         format(mean,">10.1f")+format(tier["node_evaluations"],">13")+format(tier["node_activations"],">13"))
+        lines.append("")
+        lines.append(format("node","<32")+format("evaluations",">13")+format("activations",">13"))
+        for (node_id,evaluations) in self.node_evaluations.most_common(top_nodes):
+            lines.append(format("Node"+str(node_id),"<32")+format(evaluations,">13")+format(self.node_activations[node_id],">13"))
+        lines.append(format("total","<32")+format(self.evaluations,">13")+format(self.activations,">13"))
+        return "\n".join(lines)
+
 
 
 
@@ -182,7 +1373,8 @@ class myTris:
     #ATTRIBUTES(myTris):
     ####################
     perceptrons_network = None                  # Name of the perceptron network associated with the basic game
-    max_number_of_perceptrons = None            # Max number of perceptrons allowed to be initialized in the network
+    max_number_of_perceptrons = None            # Number of perceptrons the network is allocated for (it grows on demand)
+    BASIC_NUMBER_OF_PERCEPTRONS = 129           # Number of perceptrons used by the basic training of the network
     computer_victory_node_id = None             # This is the ID of the perceptron that becomes active when the computer wins
     list_of_computer_victory_node_ids = None    # This is the list of perceptrons that check if the computer has won
     human_victory_node_id = None                # This is the ID of the perceptron that becomes active when the user wins
@@ -194,6 +1386,7 @@ class myTris:
     list_of_node_ids_for_attack_random = None   # This is the list of perceptrons that allow the computer for a random move
     tie_node_id = None                          # This is the ID of the perceptron that becomes active when it is tie (full board)
     list_of_full_board_node_ids = None          # This is the list of perceptrons that check if the board is full (it is tie)
+    batch_engine = None                         # Vectorized engine used by "respond_batch" (built on first use)
 
     #METHODS(myTris):
     #################
@@ -201,10 +1394,21 @@ class myTris:
     #####################################################################################################
     ### The myTris constructor defines the parameters of the network, the network itself and the weighted 
     ### links to embody basic rules and defense.
+    ### With "vectorized" set to True the lists of nodes are evaluated by the NumPy-backed engine: it pays
+    ### off only for many boards at once ("respond_batch"), on a single board it is not faster than the
+    ### pure Python evaluation (see myVectorizedLayerEngine "evaluate_layer").
+    ### "max_number_of_perceptrons" is only the starting size of the network: it grows when needed.
+    ### With "incremental" set to True the lists of nodes of the basic network are evaluated again only
+    ### where the board has changed since their last evaluation (see myIncrementalLayerEngine).
+    ### With "compiled" set to True the lists of nodes are evaluated by generated Python functions (see
+    ### myCompiledLayerEngine) instead of the NumPy-backed engine.
     #####################################################################################################
-    def __init__(self,starting_status = [EMPTY for i in range(9)],verbose = True): # the starting status of the board is EMPTY for every cell
+    def __init__(self,starting_status = [EMPTY for i in range(9)],verbose = True,vectorized = False,max_number_of_perceptrons = None,
+                 incremental = False,compiled = False): # the starting status of the board is EMPTY for every cell
         
-        self.max_number_of_perceptrons = 300    # max number of perceptrons that can be initialized on the network
+        if max_number_of_perceptrons is None:   # by default allocate just the perceptrons of the basic training
+            max_number_of_perceptrons = self.BASIC_NUMBER_OF_PERCEPTRONS
+        self.max_number_of_perceptrons = max(int(max_number_of_perceptrons),self.BASIC_NUMBER_OF_PERCEPTRONS)
         
         net = myPerceptronNetwork("Main perceptron network",self.max_number_of_perceptrons) # Initialize the perceptron network
         if verbose: print("Created a network of",self.max_number_of_perceptrons,"available perceptrons (the first 9 are the board game)")
@@ -219,7 +1423,7 @@ class myTris:
             node_id = net.new_node()                                                # Initialize a new node
             net.new_link(from_node_id = node_id,to_node_id = node_id, weight = 2.0) # Establish full feedback for every node of the board
         for i in range(9):                                      # for every node of the board (cell)
-            net.perceptron_nodes[i].status = starting_status[i] # set the starting status of the perceptrons
+            net.node_statuses[i] = starting_status[i]           # set the starting status of the perceptrons
         if verbose: print("Initialised board game:",net.network_dimension,"nodes (total).")
 
         # NETWORK TO IDENTIFY COMPUTER VICTORY OOO OR CIRCLE-CIRCLE-CIRCLE:
@@ -407,6 +1611,16 @@ class myTris:
         
         self.perceptrons_network = net  # set the object attribute "perceptrons_network" to the contents of the processed local variable "net"
 
+        if compiled and net.enable_compiled_engine():       # optionally evaluate the lists of nodes by generated functions
+            if verbose: print("Enabled the compiled (generated Python) evaluation engine.")
+        elif vectorized and net.enable_vectorized_engine(): # optionally evaluate the lists of nodes by matrix-vector products
+            if verbose: print("Enabled the vectorized (NumPy) evaluation engine.")
+
+        basic_node_id_sets = (self.list_of_computer_victory_node_ids,self.list_of_human_victory_node_ids,self.list_of_full_board_node_ids,
+                              self.list_of_node_ids_for_winning,self.list_of_node_ids_for_defense,self.list_of_node_ids_for_attack_random)
+        if incremental and net.enable_incremental_engine(basic_node_id_sets):   # optionally evaluate again only the nodes reached by the changed cells
+            if verbose: print("Enabled the incremental evaluation engine.")
+
         if verbose: print("Basic initialization done: nr",net.network_dimension,"perceptrons out of",self.max_number_of_perceptrons)
 
     ##################################################################################### 
@@ -423,6 +1637,28 @@ class myTris:
                 return "move_done"                                      # if the cell-status is changed, then return "move_done"
         return "no_move"                    # otherwise return "no_move" performed
 
+    #####################################################################################
+    ### myTris method "try_move_among" is the same as "try_move" for a list of cells
+    ### already known to be movable: the first one in random order is set to CIRCLE.
+    #####################################################################################
+    def try_move_among(self,cells):
+        tris_board = [0,1,2,3,4,5,6,7,8]    # the same random order of "try_move"
+        random.shuffle(tris_board)
+        for cell in tris_board:
+            if cell in cells:
+                self.perceptrons_network.node_statuses[cell] = CIRCLE
+                return "move_done"
+        return "no_move"
+
+    #####################################################################################
+    ### myTris method "movable_cells" returns the list of the board cells that
+    ### "try_move" could set right now (active and EMPTY cells), without changing them.
+    #####################################################################################
+    def movable_cells(self):
+        net = self.perceptrons_network
+        return [cell for cell in range(9) if net.node_statuses[cell] == EMPTY and
+                net.node_input_value(cell) > net.node_triggers[cell]]
+
     ###########################################################################################
     ### myTris method that reset the state of every node (perceptron) to EMPTY
     ### except the game board. It is very important to reset the behavior of the perceptrons
@@ -430,8 +1666,7 @@ class myTris:
     ###########################################################################################       
     def reset_all_but_the_board(self):
         # Consider all nodes except the initial 8 that make up the game board:
-        for i in range(9,self.perceptrons_network.network_dimension):   
-            self.perceptrons_network.perceptron_nodes[i].status = EMPTY # set them to EMPTY, so 0.0
+        self.perceptrons_network.reset_statuses(9)  # set them to EMPTY, so 0.0
             
     ########################################################################################### 
     ### The myTris method "respond" receives a board state as input and provides as output
@@ -443,7 +1678,7 @@ class myTris:
     def respond(self,from_status = [EMPTY for i in range(9)]):  # the starting status by default is a board with all cells EMPTY
         # set the starting status of the board, cell by cell:
         for i in range(9):
-            self.perceptrons_network.perceptron_nodes[i].status = from_status[i]
+            self.perceptrons_network.node_statuses[i] = from_status[i]
         # all perceptrons related to the computer's victory status are evaluated in sequence:
         self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_computer_victory_node_ids)
         # If the following node is active, the game is over and the result is the computer's victory:
@@ -467,7 +1702,7 @@ class myTris:
                 # if the move has been done then the game is over with computer victory
                 to_status = list()  # collect the resulting status of the board, the 9 values of the 9 cells
                 for i in range(9):
-                    to_status.append(self.perceptrons_network.perceptron_nodes[i].status)
+                    to_status.append(self.perceptrons_network.node_statuses[i])
                 return ("computer_victory",from_status,to_status)
         # all perceptrons related to one step to win for user are evaluated in sequence:
         self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_node_ids_for_defense)
@@ -477,7 +1712,7 @@ class myTris:
                 # if the move has been done then the game continues
                 to_status = list()
                 for i in range(9):
-                    to_status.append(self.perceptrons_network.perceptron_nodes[i].status)
+                    to_status.append(self.perceptrons_network.node_statuses[i])
                 return ("basic_defense",from_status,to_status)
         # all the perceptrons related to one step to a random attack are evaluated:
         self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_node_ids_for_attack_random)
@@ -486,11 +1721,148 @@ class myTris:
             # if a move has been done then the game continues
             to_status = list()
             for i in range(9):
-                to_status.append(self.perceptrons_network.perceptron_nodes[i].status)
+                to_status.append(self.perceptrons_network.node_statuses[i])
             return ("random_attack",from_status,to_status)
         # if here then there is no response from the software to the board-status of the input (maybe an error occurred)
         return("unable_to_respond",from_status,from_status)
 
+    ###########################################################################################
+    ### The myTris method "respond_batch" is the batched version of "respond": it receives
+    ### a list (or an N x 9 array) of board states and returns the couple:
+    ### 1. the list of the evaluated situations of the game, one for every board
+    ### 2. the list of the resulting boards (software's response to every board)
+    ### The results are the same obtained by calling "reset_all_but_the_board" and "respond"
+    ### on every board, one after the other (random numbers included), but the perceptron
+    ### network is evaluated once for all the boards by the NumPy-backed engine.
+    ### The statuses of the network are not changed. Without NumPy the boards are
+    ### processed one at a time by "respond".
+    ###########################################################################################
+    def respond_batch(self,from_statuses):
+        from_statuses = [list(from_status) for from_status in from_statuses]
+        if numpy is None:   # no NumPy: respond to every board separately
+            reasons = list()
+            to_statuses = list()
+            for from_status in from_statuses:
+                self.reset_all_but_the_board()
+                (reason,_,to_status) = self.respond(from_status)
+                reasons.append(reason)
+                to_statuses.append(list(to_status))
+            return (reasons,to_statuses)
+        net = self.perceptrons_network
+        engine = net.layer_engine
+        if not isinstance(engine,myVectorizedLayerEngine):  # use a private engine if the network has not a vectorized one
+            if self.batch_engine is None or self.batch_engine.network is not net:
+                self.batch_engine = myVectorizedLayerEngine(net)
+            engine = self.batch_engine
+        statuses = numpy.zeros((len(from_statuses),net.network_dimension))  # one copy of the reset network for every board
+        if from_statuses:
+            statuses[:,:9] = numpy.array(from_statuses,dtype=float)
+        board_ids = list(range(9))
+
+        def evaluate_tier(node_id_set,main_node_id):    # evaluate a tier and return the activations of its main node
+            engine.evaluate_layer_batch(node_id_set,statuses)
+            if main_node_id is None:
+                return None
+            return engine.evaluate_layer_batch([main_node_id],statuses)[:,0].tolist()
+
+        def movable_cells():    # for every board, the flags of the cells that would be set by "try_move" right now
+            activated = engine.input_values_batch(board_ids,statuses) > numpy.array([net.node_triggers[i] for i in board_ids])
+            return (activated & (statuses[:,:9] == EMPTY)).tolist()
+
+        # evaluate all the tiers for every board, in the same order of "respond":
+        computer_victory = evaluate_tier(self.list_of_computer_victory_node_ids,self.computer_victory_node_id)
+        human_victory = evaluate_tier(self.list_of_human_victory_node_ids,self.human_victory_node_id)
+        tie = evaluate_tier(self.list_of_full_board_node_ids,self.tie_node_id)
+        one_step_winning = evaluate_tier(self.list_of_node_ids_for_winning,self.one_step_winning_node_id)
+        winning_cells = movable_cells()
+        defense = evaluate_tier(self.list_of_node_ids_for_defense,self.activated_defense_node_id)
+        defense_cells = movable_cells()
+        evaluate_tier(self.list_of_node_ids_for_attack_random,None)
+        attack_cells = movable_cells()
+
+        def try_move(cells):    # same as "try_move": the first movable cell in random order
+            tris_board = [0,1,2,3,4,5,6,7,8]
+            random.shuffle(tris_board)
+            for cell in tris_board:
+                if cells[cell]:
+                    return cell
+            return None
+
+        # then walk the decisions board by board, consuming random numbers as "respond" does:
+        reasons = list()
+        to_statuses = list()
+        for (b,from_status) in enumerate(from_statuses):
+            reason = None
+            cell = None
+            if computer_victory[b]:
+                reason = "computer_victory"
+            elif human_victory[b]:
+                reason = "human_victory"
+            elif tie[b]:
+                reason = "tie"
+            if reason is None and one_step_winning[b]:
+                cell = try_move(winning_cells[b])
+                if cell is not None:
+                    reason = "computer_victory"
+            if reason is None and defense[b]:
+                cell = try_move(defense_cells[b])
+                if cell is not None:
+                    reason = "basic_defense"
+            if reason is None:
+                cell = try_move(attack_cells[b])
+                reason = "random_attack" if cell is not None else "unable_to_respond"
+            to_status = list(from_status)
+            if cell is not None:
+                to_status[cell] = CIRCLE
+            reasons.append(reason)
+            to_statuses.append(to_status)
+        return (reasons,to_statuses)
+
+    #################################################################################
+    ### The myTris method "get_board" returns the board of the game (myTrisBoard)
+    ### and "set_board" sets it in the first 9 perceptrons of the network.
+    #################################################################################
+    def get_board(self):
+        statuses = self.perceptrons_network.node_statuses
+        o_mask = 0
+        x_mask = 0
+        for i in range(9):
+            status = statuses[i]
+            if status == CIRCLE:
+                o_mask |= 1 << i
+            elif status == STAR:
+                x_mask |= 1 << i
+        return myTrisBoard(o_mask,x_mask)
+
+    def set_board(self,board):
+        statuses = self.perceptrons_network.node_statuses
+        for i in range(9):
+            statuses[i] = board.cell(i)
+
+    #################################################################################
+    ### The myTris method "snapshot" returns the state of the game (the statuses of
+    ### all the perceptrons, board included), to be used by "restore".
+    #################################################################################
+    def snapshot(self):
+        return self.perceptrons_network.snapshot()
+
+    #################################################################################
+    ### The myTris method "restore" sets the state of the game taken by "snapshot".
+    #################################################################################
+    def restore(self,snapshot):
+        self.perceptrons_network.restore(snapshot)
+
+    #################################################################################
+    ### The myTris method "clone" returns a new independent game with the same state.
+    ### The network topology is shared with the original (see myPerceptronNetwork
+    ### "clone"), so no node or link is built again.
+    #################################################################################
+    def clone(self):
+        tris = copy.copy(self)
+        tris.perceptrons_network = self.perceptrons_network.clone()
+        tris.batch_engine = None        # built again on first use, for the new network
+        return tris
+
     #################################################################################
     ### The myTris method "show" draws the tris game on the screen based on the board
     ### (first 9 perceptrons of the network)
@@ -517,158 +1889,693 @@ class myTris:
 
 
 
-### Class for a tris game that includes lessons-learnt from matches
-###################################################################
-class myTrainedTris(myTris):    # This class inherits properties from myTris one.
+### Class for an index of the lesson nodes of a perceptron network
+##################################################################
+class myLessonRuleIndex:
 
-    #ATTRIBUTES(myTrainedTris):
-    ###########################
-    # ID of the perceptron which is active when you can use a lesson learned on how to win for context:
-    recognised_lessons_learnt_win_node_id = None
-    # list of the IDs of the nodes which are used to evaluate whether the context corresponds to a winning strategy:
-    list_of_node_ids_from_lessons_learnt_win = None
-    # ID of the perceptron which is active when you can use a lesson learned on how to get the draw for the context:
-    recognised_lessons_learnt_tie_node_id = None
-    # list of the IDs of the nodes which serve to evaluate whether the context corresponds to a strategy to obtain a tie:
-    list_of_node_ids_from_lessons_learnt_tie = None
-    # ID of the perceptron which is active when you can use a lesson learned on how not to lose for context:
-    recognised_lessons_learnt_not_loosing_node_id = None
-    # list of the IDs of the nodes which are used to evaluate whether the context corresponds to a non-losing strategy:
-    list_of_node_ids_from_lessons_learnt_not_loosing = None
-    
-    match = None                # a match is a list of 10 elements: the first one is the player that begins
-                                # (CIRCLE or STAR), the remaining nine are the IDs of the cells covered during
-                                # the game session. E.g. [CIRCLE,0,4,3,5,7,8,1,2,6]
-    match_move_counter = None   # This is the counter from 0 to 9 for filling the previous list during the match.
+    #ATTRIBUTES(myLessonRuleIndex):
+    ###############################
+    buckets = None      # dictionary: mask of the cells read by a node -> dictionary: (mask of the cells that must
+                        # be CIRCLE, mask of the cells that must be STAR) -> list of the node IDs that can fire
+    always = None       # list of the node IDs that can fire on more than one pattern (always evaluated)
+    position = None     # dictionary: node ID -> position in the original list (to keep the order of evaluation)
 
-    #METHODS(myTrainedTris):
-    ########################
+    #METHODS(myLessonRuleIndex):
+    ############################
 
-    #####################################################################################
-    ### The myTrainedTris constructor calls the inherited constructor from the myTris 
-    ### class, then adds a training for the perceptron network based on the information  
-    ### in 3 external text files:
-    ### - mytris.lessonslearnt_not_loose.txt
-    ### - mytris.lessonslearnt_tie.txt
-    ### - mytris.lessonslearnt_win.txt
-    ### built by the same software during the matches (experience).
-    #####################################################################################
-    def __init__(self,starting_status = [EMPTY for i in range(9)],verbose = True):
-        
-        def load_from_file(verbose,my_kb_file_name):    # load the file whose name is contained in the variable "my_kb_file_name"
-                                                        # structure: list of ( board description , next move to do)
-            lesson_learnt_kb = list()
-            if os.path.exists(my_kb_file_name):
-                if verbose: print("Loading lessons-learnt knowledge base from file [",my_kb_file_name,"]:")
-                if verbose: print("Records: ",end="")
-                with open(my_kb_file_name, 'rt') as my_file_handler:
-                    counter = 0
-                    val_list = list()
-                    while True:
-                        for i in range(9):
-                            r = my_file_handler.readline().strip()
-                            if not r:
-                                break 
-                            val_list.append(float(r))
-                        r = my_file_handler.readline().strip()
-                        if not r:
-                            break 
-                        lesson_learnt_kb.append((val_list,int(r)))  
-                        val_list = list()
-                        counter += 1
-                        if verbose: print(counter,",",end="")
-                    my_file_handler.close()
-                if verbose: print("done.")
-                return lesson_learnt_kb
-            else:
-                if verbose: print("No lessons-learnt knowledge base file [",my_kb_file_name,"] found.")
-                return []
-            
-        super().__init__(starting_status,verbose)   # invoke the inherited constructor from myTris class
-        self.match = [None for i in range(10)]      # set the starting values of match list to None
-        self.match_move_counter = 0                 # set the related counter to zero
-        
-        if verbose:
-            print()
+    ####################################################################################
+    ### The myLessonRuleIndex constructor indexes a list of lesson nodes of a network.
+    ### A lesson node reads the board cells with weights +1/n (for a CIRCLE), -1/n (for
+    ### a STAR) or 0 (cell not considered): it fires only if every considered cell holds
+    ### exactly the expected symbol. So the node is stored in the bucket of the cells
+    ### it reads, under the pattern of symbols it expects.
+    ### A node for which this is not true (it could fire also when some considered cell
+    ### is different, or it reads other nodes) is always evaluated; a node that can
+    ### never fire is never evaluated.
+    ####################################################################################
+    def __init__(self,network,node_id_set):
+        self.buckets = dict()
+        self.always = list()
+        self.position = dict()
+        margin = 1e-9                                       # safety margin for the rounding errors of the weighted sums
+        for (position,node_id) in enumerate(node_id_set):
+            self.position[node_id] = position
+            inputs = list(zip(network.input_node_ids[node_id],network.input_weights[node_id]))
+            bias = network.weights_0[node_id] if network.weights_0[node_id] != None else 0.0
+            trigger = network.node_triggers[node_id]
+            if any(j >= 9 for (j,w) in inputs):             # the node does not read only the board
+                self.always.append(node_id)
+                continue
+            inputs = [(j,w) for (j,w) in inputs if w != 0]
+            best = sum(abs(w) for (j,w) in inputs)+bias     # the greatest possible weighted sum (exact pattern)
+            if best <= trigger-margin:
+                continue                                    # the node can never fire
+            if inputs == [] or best-min(abs(w) for (j,w) in inputs) >= trigger-margin:
+                self.always.append(node_id)                 # the node could fire with some different cell
+                continue
+            cells_mask = 0
+            circle_mask = 0
+            star_mask = 0
+            for (j,w) in inputs:
+                cells_mask |= 1 << j
+                if w > 0:
+                    circle_mask |= 1 << j
+                else:
+                    star_mask |= 1 << j
+            self.buckets.setdefault(cells_mask,dict()).setdefault((circle_mask,star_mask),list()).append(node_id)
+
+    ####################################################################################
+    ### The myLessonRuleIndex method "select" returns the list of the nodes that can
+    ### fire on the given board (myTrisBoard), in the original order.
+    ####################################################################################
+    def select(self,board):
+        circle_mask = board.o_mask
+        star_mask = board.x_mask
+        selected = list(self.always)
+        for (cells_mask,patterns) in self.buckets.items():
+            node_ids = patterns.get((circle_mask & cells_mask,star_mask & cells_mask))
+            if node_ids is not None:
+                selected += node_ids
+        if len(selected) > 1:
+            selected.sort(key = self.position.__getitem__)
+        return selected
+
+
+
+
+### Class for a knowledge base of lessons learnt
+################################################
+class myLessonsLearntKnowledgeBase:
+
+    #ATTRIBUTES(myLessonsLearntKnowledgeBase):
+    ##########################################
+    lessons = None      # dictionary: (tuple of the 9 weights, destination cell) -> None. It is used as a set
+                        # with O(1) membership that also keeps the order of insertion of the lessons.
+    file_format = None  # format of the last loaded file ("text" or "binary"), used by default by "save"
+    journal_records = None  # number of the lessons in the journal of the last loaded file (see "append")
+    canonical = None    # if True the lessons are stored in their canonical form (see function "canonical_lesson"),
+                        # so the symmetric forms of a lesson are the same lesson
+
+    #METHODS(myLessonsLearntKnowledgeBase):
+    #######################################
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase constructor optionally adds a list of lessons,
+    ### i.e. couples (list of 9 weights, destination cell ID).
+    ####################################################################################
+    def __init__(self,lessons = (),canonical = False):
+        self.lessons = dict()
+        self.file_format = "text"
+        self.journal_records = 0
+        self.canonical = canonical
+        self.add_all(lessons)
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "lesson_key" returns the lesson as it is
+    ### stored: (tuple of the 9 weights, destination cell ID), in canonical form if
+    ### the knowledge base is canonical.
+    ####################################################################################
+    def lesson_key(self,weights,destination_node_id):
+        if self.canonical:
+            return canonical_lesson(weights,destination_node_id)
+        return (tuple(weights),destination_node_id)
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "add" adds a lesson if it is not already
+    ### in the knowledge base and returns True if it was new.
+    ####################################################################################
+    def add(self,weights,destination_node_id):
+        key = self.lesson_key(weights,destination_node_id)
+        if key in self.lessons:
+            return False
+        self.lessons[key] = None
+        return True
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "add_all" adds a list of lessons without
+    ### repetitions and returns the number of the new ones.
+    ####################################################################################
+    def add_all(self,lessons):
+        counter = 0
+        for (weights,destination_node_id) in lessons:
+            if self.add(weights,destination_node_id):
+                counter += 1
+        return counter
+
+    def __contains__(self,lesson):
+        return self.lesson_key(lesson[0],lesson[1]) in self.lessons
+
+    def __len__(self):
+        return len(self.lessons)
+
+    def __iter__(self):     # iterate over the lessons (list of 9 weights, destination cell ID) in order of insertion
+        for (weights,destination_node_id) in self.lessons:
+            yield (list(weights),destination_node_id)
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "get_lessons" returns the list of the
+    ### lessons (list of 9 weights, destination cell ID) in order of insertion.
+    ####################################################################################
+    def get_lessons(self):
+        return list(self)
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "load" adds all the lessons stored in a
+    ### file, then the ones in its journal (if any), and returns the number of the
+    ### records read. The format of the file (text or binary) is recognised by its
+    ### first bytes.
+    ####################################################################################
+    def load(self,my_kb_file_name):
+        counter = 0
+        if os.path.exists(my_kb_file_name):
+            with open(my_kb_file_name, 'rb') as my_file_handler:
+                is_binary = my_file_handler.read(len(LESSONS_BINARY_MAGIC)) == LESSONS_BINARY_MAGIC
+            if is_binary:
+                self.file_format = "binary"
+                counter += self.load_binary(my_kb_file_name)
+            else:
+                self.file_format = "text"
+                counter += self.load_text(my_kb_file_name)
+        self.journal_records = self.load_journal(my_kb_file_name+LESSONS_JOURNAL_SUFFIX)
+        return counter+self.journal_records
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "load_journal" adds all the lessons
+    ### stored in a journal file and returns the number of the records read.
+    ### Every line of the journal is a lesson: the 9 comma separated weights, the
+    ### destination cell and the CRC-32 of the previous text, separated by ";".
+    ### Lines with a bad CRC (e.g. the last one, after a crash while writing) are skipped.
+    ####################################################################################
+    def load_journal(self,my_journal_file_name):
+        counter = 0
+        if not os.path.exists(my_journal_file_name):
+            return 0
+        with open(my_journal_file_name, 'rt') as my_file_handler:
+            for line in my_file_handler:
+                (record,_,checksum) = line.strip().rpartition(";")
+                if record == "" or "{:08x}".format(zlib.crc32(record.encode())) != checksum:
+                    continue        # incomplete or damaged record
+                (weights,destination_node_id) = record.split(";")
+                self.add([float(w) for w in weights.split(",")],int(destination_node_id))
+                counter += 1
+        return counter
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "append" adds a list of lessons and
+    ### appends the new ones (not already in the knowledge base, which should be loaded
+    ### from the same file) to the journal of the file, with a single write followed by
+    ### a flush to the disk. It returns the number of the new lessons.
+    ####################################################################################
+    def append(self,my_kb_file_name,lessons):
+        records = list()
+        for (weights,destination_node_id) in lessons:
+            (weights,destination_node_id) = self.lesson_key(weights,destination_node_id)    # the lesson as it is stored
+            if self.add(weights,destination_node_id):
+                record = "{};{}".format(",".join(format_lesson_weight(w) for w in weights),destination_node_id)
+                records.append("{};{:08x}\n".format(record,zlib.crc32(record.encode())))
+        if records:
+            my_journal_file_name = my_kb_file_name+LESSONS_JOURNAL_SUFFIX
+            if os.path.exists(my_journal_file_name) and os.path.getsize(my_journal_file_name) > 0:
+                with open(my_journal_file_name, 'rb') as my_file_handler:
+                    my_file_handler.seek(-1,os.SEEK_END)
+                    if my_file_handler.read(1) != b"\n":  # the last record was not completed (crash while writing)
+                        records[0] = "\n"+records[0]
+            with open(my_journal_file_name, 'at') as my_file_handler:
+                my_file_handler.write("".join(records))
+                my_file_handler.flush()
+                os.fsync(my_file_handler.fileno())
+            self.journal_records += len(records)
+        return len(records)
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "compact" rewrites the knowledge base
+    ### file with all the lessons (the knowledge base should be loaded from the same
+    ### file, journal included) and then deletes the journal. It returns the number of
+    ### the records written.
+    ####################################################################################
+    def compact(self,my_kb_file_name):
+        counter = self.save(my_kb_file_name)
+        if os.path.exists(my_kb_file_name+LESSONS_JOURNAL_SUFFIX):
+            os.remove(my_kb_file_name+LESSONS_JOURNAL_SUFFIX)    # if a crash happens before, the journal is just read again
+        self.journal_records = 0
+        return counter
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "load_text" adds all the lessons stored
+    ### in a text file (9 lines for the weights and 1 line for the destination, for
+    ### every lesson) and returns the number of the records read.
+    ####################################################################################
+    def load_text(self,my_kb_file_name):
+        counter = 0
+        with open(my_kb_file_name, 'rt') as my_file_handler:
+            val_list = list()
+            while True:
+                for i in range(9):
+                    r = my_file_handler.readline().strip()
+                    if not r:
+                        break
+                    val_list.append(float(r))
+                r = my_file_handler.readline().strip()
+                if not r:
+                    break
+                self.add(val_list,int(r))
+                val_list = list()
+                counter += 1
+        return counter
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "load_binary" adds all the lessons
+    ### stored in a binary file and returns the number of the records read.
+    ### The binary format is a header (magic "TRISKB", version, flags, number of
+    ### records, record size, CRC-32 of the records) followed by the 9 weight codes
+    ### (int8, see LESSONS_BINARY_WEIGHTS) of all the records and then by the
+    ### destination cells (uint8) of all the records. The file is memory-mapped and
+    ### decoded by table lookups (by NumPy, if available), without a Python pass for
+    ### every record: the lessons are canonicalized only if the knowledge base is
+    ### canonical and the file is not (one at a time if NumPy is not available).
+    ####################################################################################
+    def load_binary(self,my_kb_file_name):
+        with open(my_kb_file_name, 'rb') as my_file_handler:
+            header = my_file_handler.read(LESSONS_BINARY_HEADER.size)
+            if len(header) < LESSONS_BINARY_HEADER.size:
+                print("Error 1 from class myLessonsLearntKnowledgeBase: truncated header [",my_kb_file_name,"]")
+                quit()
+            (magic,version,flags,counter,record_size,checksum) = LESSONS_BINARY_HEADER.unpack(header)
+            if magic != LESSONS_BINARY_MAGIC or version != LESSONS_BINARY_VERSION or record_size != LESSONS_BINARY_RECORD_SIZE:
+                print("Error 2 from class myLessonsLearntKnowledgeBase: unsupported file [",my_kb_file_name,version,record_size,"]")
+                quit()
+            if counter == 0:
+                return 0
+            with mmap.mmap(my_file_handler.fileno(),0,access = mmap.ACCESS_READ) as records:
+                with memoryview(records) as view:
+                    good_file = (len(view) == LESSONS_BINARY_HEADER.size+counter*record_size and
+                                 zlib.crc32(view[LESSONS_BINARY_HEADER.size:]) == checksum)
+                if not good_file:
+                    print("Error 3 from class myLessonsLearntKnowledgeBase: corrupted file [",my_kb_file_name,"]")
+                    quit()
+                to_canonicalize = self.canonical and not flags & LESSONS_BINARY_CANONICAL
+                if numpy is not None:   # decode all the records at once
+                    codes = numpy.frombuffer(records,dtype = numpy.uint8,count = 9*counter,offset = LESSONS_BINARY_HEADER.size)
+                    destinations = numpy.frombuffer(records,dtype = numpy.uint8,count = counter,
+                                                    offset = LESSONS_BINARY_HEADER.size+9*counter).copy()
+                    weights = numpy.array(LESSONS_BINARY_WEIGHTS)[codes].reshape(counter,9)
+                    del codes           # the memory map can be closed only when no array uses it
+                    if to_canonicalize:
+                        (weights,destinations) = canonical_lesson_table(weights,destinations)
+                        to_canonicalize = False
+                    lessons = zip(map(tuple,weights.tolist()),destinations.tolist())
+                else:
+                    weights = map(LESSONS_BINARY_WEIGHTS.__getitem__,records[LESSONS_BINARY_HEADER.size:LESSONS_BINARY_HEADER.size+9*counter])
+                    lessons = zip(zip(*[weights]*9),records[LESSONS_BINARY_HEADER.size+9*counter:])
+                if to_canonicalize:
+                    lessons = [canonical_lesson(w,k) for (w,k) in lessons]
+                self.lessons.update(dict.fromkeys(lessons))     # the lessons not already in the knowledge base, in order
+        return counter
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "save" writes all the lessons to a file
+    ### in the given format ("text" or "binary", by default the format of the last
+    ### loaded file) and returns the number of the records written.
+    ### The lessons are written to a temporary file that then replaces the old one,
+    ### so a crash while writing cannot truncate the knowledge base.
+    ####################################################################################
+    def save(self,my_kb_file_name,file_format = None):
+        if file_format is None:
+            file_format = self.file_format
+        if file_format not in ("text","binary"):
+            print("Error 4 from class myLessonsLearntKnowledgeBase: bad file format [",file_format,"]")
+            quit()
+        my_temporary_file_name = my_kb_file_name+".tmp"
+        if file_format == "binary":
+            counter = self.save_binary(my_temporary_file_name)
+        else:
+            counter = self.save_text(my_temporary_file_name)
+        os.replace(my_temporary_file_name,my_kb_file_name)     # atomic replacement of the old file
+        return counter
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "save_text" writes all the lessons to a
+    ### text file (same format of "load_text") and returns the number of records written.
+    ####################################################################################
+    def save_text(self,my_kb_file_name):
+        counter = 0
+        with open(my_kb_file_name, 'wt') as my_file_handler:
+            for (w,j) in self.lessons:
+                for val in w:
+                    my_file_handler.write("{}\n".format(format_lesson_weight(val)))
+                my_file_handler.write("{}\n".format(str(j)))
+                counter += 1
+            my_file_handler.flush()
+            os.fsync(my_file_handler.fileno())
+        return counter
+
+    ####################################################################################
+    ### The myLessonsLearntKnowledgeBase method "save_binary" writes all the lessons to
+    ### a binary file (same format of "load_binary") and returns the number of records
+    ### written. Every weight must be exactly 0 or +-1/n (see LESSONS_BINARY_WEIGHTS).
+    ####################################################################################
+    def save_binary(self,my_kb_file_name):
+        codes = bytearray()
+        for (w,j) in self.lessons:
+            for val in w:
+                code = LESSONS_BINARY_CODES.get(val)
+                if code is None:
+                    print("Error 5 from class myLessonsLearntKnowledgeBase: weight not representable in binary format [",val,"]")
+                    quit()
+                codes.append(code)
+        payload = bytes(codes)+bytes(j for (w,j) in self.lessons)
+        flags = LESSONS_BINARY_CANONICAL if self.canonical else 0
+        with open(my_kb_file_name, 'wb') as my_file_handler:
+            my_file_handler.write(LESSONS_BINARY_HEADER.pack(LESSONS_BINARY_MAGIC,LESSONS_BINARY_VERSION,flags,len(self.lessons),
+                                                             LESSONS_BINARY_RECORD_SIZE,zlib.crc32(payload)))
+            my_file_handler.write(payload)
+            my_file_handler.flush()
+            os.fsync(my_file_handler.fileno())
+        return len(self.lessons)
+
+
+
+
+##########################################################################################
+### Function "convert_lessons_learnt_file" converts a lessons-learnt knowledge base file
+### to the given format ("text" or "binary"). The weights are written exactly in both
+### formats (see "format_lesson_weight" and LESSONS_BINARY_WEIGHTS), so the conversion
+### is lossless in both directions.
+### It returns the number of the records converted.
+##########################################################################################
+def convert_lessons_learnt_file(source_file_name,destination_file_name,file_format):
+    knowledge_base = myLessonsLearntKnowledgeBase()
+    knowledge_base.load(source_file_name)
+    return knowledge_base.save(destination_file_name,file_format)
+
+
+
+
+### Class for a tris game that includes lessons-learnt from matches
+###################################################################
+class myTrainedTris(myTris):    # This class inherits properties from myTris one.
+
+    #ATTRIBUTES(myTrainedTris):
+    ###########################
+    # ID of the perceptron which is active when you can use a lesson learned on how to win for context:
+    recognised_lessons_learnt_win_node_id = None
+    # list of the IDs of the nodes which are used to evaluate whether the context corresponds to a winning strategy:
+    list_of_node_ids_from_lessons_learnt_win = None
+    # ID of the perceptron which is active when you can use a lesson learned on how to get the draw for the context:
+    recognised_lessons_learnt_tie_node_id = None
+    # list of the IDs of the nodes which serve to evaluate whether the context corresponds to a strategy to obtain a tie:
+    list_of_node_ids_from_lessons_learnt_tie = None
+    # ID of the perceptron which is active when you can use a lesson learned on how not to lose for context:
+    recognised_lessons_learnt_not_loosing_node_id = None
+    # list of the IDs of the nodes which are used to evaluate whether the context corresponds to a non-losing strategy:
+    list_of_node_ids_from_lessons_learnt_not_loosing = None
+
+    match = None                # a match is a list of 10 elements: the first one is the player that begins
+                                # (CIRCLE or STAR), the remaining nine are the IDs of the cells covered during
+                                # the game session. E.g. [CIRCLE,0,4,3,5,7,8,1,2,6]
+    match_move_counter = None   # This is the counter from 0 to 9 for filling the previous list during the match.
+
+    basic_network_dimension = None  # number of nodes of the basic network (myTris), before the lessons learnt
+    lessons_learnt_indexes = None   # dictionary: strategy label -> index of its lesson nodes (myLessonRuleIndex)
+    move_table = None               # precomputed moves: board (myTrisBoard) -> (strategy label, list of possible cells)
+    move_table_signature = None     # signature of the lessons-learnt files used to compute the move table
+    symmetric_lessons = None        # if True the lessons are loaded in canonical form and matched on the 8 symmetries of the board
+    lessons_learnt_destinations = None  # dictionary: lesson node ID -> destination cell of the lesson
+    position_cache = None           # optional LRU cache: (board, side to move) -> (strategy label, list of possible cells)
+    side_to_move = None             # side the computer plays for (see "compute_move"): the network always sees it as CIRCLE
+    lessons_learnt_signature = None # signature of the lessons-learnt files read to build the lessons learnt (see "get_computer_move_from_cache")
+    position_cache_size = None      # max number of positions in the cache (0 means no cache)
+    position_cache_counters = None  # dictionary of the counters of the cache: "hits", "misses", "evictions"
+    lazy_lessons = None             # if True the network-part of every strategy of the lessons learnt is built on first use
+    background_loading = None       # if True (with "lazy_lessons") the knowledge base files are read by a background thread
+    lessons_learnt_pending = None   # set of the strategy labels whose network-part is not built yet (see "prepare_lessons_learnt")
+    lessons_learnt_loader = None    # future of the background reading of the knowledge base files (None if not used)
+    instrumentation = None          # optional myNetworkInstrumentation that times the tiers of "get_computer_move" (None means no timing)
+    game_learning = None            # myGameLearning of "submit_match", that keeps the loaded knowledge bases (built on first use)
+
+    # strategies of the lessons learnt, in the order their network-parts are built: strategy label -> (knowledge base file,
+    # purpose of the lessons, attribute of the list of the lesson nodes, attribute of the node active when some lesson fits):
+    LESSONS_LEARNT_TIERS = {
+        "lessons_learnt_winning_attack": (LESSONS_LEARNT_WIN_FILE,"winning",
+                                          "list_of_node_ids_from_lessons_learnt_win","recognised_lessons_learnt_win_node_id"),
+        "lessons_learnt_tie_attack": (LESSONS_LEARNT_TIE_FILE,"tie",
+                                      "list_of_node_ids_from_lessons_learnt_tie","recognised_lessons_learnt_tie_node_id"),
+        "learnt_defense": (LESSONS_LEARNT_NOT_LOOSE_FILE,"not loosing",
+                           "list_of_node_ids_from_lessons_learnt_not_loosing","recognised_lessons_learnt_not_loosing_node_id") }
+
+    # messages shown for every strategy label returned by "get_computer_move":
+    MOVE_MESSAGES = {
+        "no_possible_move": "Board if full! I cannot move...",
+        "one_step_winning": "With the next move I win...",
+        "basic_defense": "My next move will be a basic defense...",
+        "learnt_defense": "With my next move I will defend based on what I learned from the games...",
+        "lessons_learnt_winning_attack": "My next move will be based on the lessons learned from a victory...",
+        "lessons_learnt_tie_attack": "My next move will be based on a lesson learned from a draw...",
+        "random_attack": "My next move is random, I can't do better in this situation...",
+        "unable_to_respond": "I don't know what to do, I'm so sorry!!!" }
+
+    #METHODS(myTrainedTris):
+    ########################
+
+    #####################################################################################
+    ### The myTrainedTris constructor calls the inherited constructor from the myTris
+    ### class, then adds a training for the perceptron network based on the information
+    ### in 3 external text files:
+    ### - mytris.lessonslearnt_not_loose.txt
+    ### - mytris.lessonslearnt_tie.txt
+    ### - mytris.lessonslearnt_win.txt
+    ### built by the same software during the matches (experience).
+    ### With "use_move_table" set to True, the moves for every reachable board are
+    ### computed once (or loaded from the file mytris.movetable.txt) and then served
+    ### by a table lookup (see "build_move_table").
+    ### With "symmetric_lessons" set to True (default) the lessons are loaded in canonical
+    ### form (see function "canonical_lesson"), so that a lesson and its rotations and
+    ### reflections are a single node, and they are matched on the 8 symmetries of the
+    ### board (see "get_symmetric_lesson_cells").
+    ### With "position_cache_size" greater than 0 the moves of the last positions are
+    ### kept in a LRU cache (see "enable_position_cache").
+    ### "incremental" and "compiled" enable the evaluation engines with the same names (see myTris).
+    ### With "lazy_lessons" set to True the network-part of the lessons learnt of every strategy
+    ### is built the first time the strategy is tried (see "prepare_lessons_learnt"), so the
+    ### construction does not depend on the size of the knowledge bases; with "background_loading"
+    ### the files are read meanwhile by a background thread.
+    #####################################################################################
+    def __init__(self,starting_status = [EMPTY for i in range(9)],verbose = True,vectorized = False,use_move_table = False,symmetric_lessons = True,
+                 position_cache_size = 0,incremental = False,compiled = False,lazy_lessons = False,background_loading = False):
+        self.symmetric_lessons = symmetric_lessons
+        self.lazy_lessons = lazy_lessons
+        self.background_loading = background_loading
+        self.side_to_move = CIRCLE
+        self.lessons_learnt_signature = lessons_learnt_files_signature()    # taken before reading: a later change is seen
+        lessons_learnt = None
+        if not lazy_lessons:
+            lessons_learnt = self.load_lessons_learnt(False)    # read the knowledge bases first, to size the network on them
+        super().__init__(starting_status,verbose,vectorized,
+                         self.BASIC_NUMBER_OF_PERCEPTRONS+(self.lessons_learnt_size(lessons_learnt) if lessons_learnt is not None else 0),
+                         incremental,compiled)
+        self.match = [None for i in range(10)]      # set the starting values of match list to None
+        self.match_move_counter = 0                 # set the related counter to zero
+        self.basic_network_dimension = self.perceptrons_network.network_dimension   # remember where the lessons learnt begin
+
+        if verbose:
+            print()
             print("Using lessons learnt for perceptron network training...")
             print()
-        
-        # BUILD AND TRAIN THE NETWORK-PART FOR LESSONS LEARNT ABOUT WINNING (ATTACKING STRATEGY):
-        #########################################################################################
-        # Load information from the knowledge base file named mytris.lessonslearnt_win.txt:
-        LESSON_LEARNT_KNOWLEDGE_BASE = load_from_file(verbose,"mytris.lessonslearnt_win.txt")
-        l = len(LESSON_LEARNT_KNOWLEDGE_BASE)
-        self.list_of_node_ids_from_lessons_learnt_win = []  # Initialize the list of structured info
-        # if the file is empty don't do anything
-        if l == 0:
-            if verbose: print("Loaded no rules from lessons learnt knowledge base (it is empty).")
+
+        if lazy_lessons:
+            self.prepare_lessons_learnt(verbose)            # the network-parts for the lessons learnt are added on first use
         else:
-            for (w,k) in LESSON_LEARNT_KNOWLEDGE_BASE:          # for each pair in the list:
-                node_id = self.perceptrons_network.new_node()   # Initialize a new node
-                # apply the information to identify whether the card context is recognized:
-                self.perceptrons_network.node_inputs(to_node_id = node_id, input_list = [(i,w[i]) for i in range(9)] )
-                # if the context matches, set the k-th cell as next move:
-                self.perceptrons_network.node_inputs(to_node_id = k, input_list = [(node_id,1)]) 
-                self.list_of_node_ids_from_lessons_learnt_win.append(node_id)                   # add the new node ID to the list
-            self.recognised_lessons_learnt_win_node_id = self.perceptrons_network.new_node()    # Initialize a new node
-            # set all previous nodes as inputs for this one which will be active only when context is good:
-            self.perceptrons_network.node_inputs(to_node_id = self.recognised_lessons_learnt_win_node_id, 
-            input_list = [(idx,1) for idx in self.list_of_node_ids_from_lessons_learnt_win])
-            if verbose: print("Imported",l,"rules from lessons learnt knowledge base for winning.")
+            self.build_lessons_learnt(verbose,lessons_learnt)   # add the network-parts for the lessons learnt
 
-        if verbose: print()
-        
-        # BUILD AND TRAIN THE NETWORK-PART FOR LESSONS LEARNT ABOUT GETTING TIE:
-        ########################################################################
-        # Load information from the knowledge base file named mytris.lessonslearnt_tie.txt:
-        LESSON_LEARNT_KNOWLEDGE_BASE = load_from_file(verbose,"mytris.lessonslearnt_tie.txt")
-        l = len(LESSON_LEARNT_KNOWLEDGE_BASE)
-        self.list_of_node_ids_from_lessons_learnt_tie = []  # Initialize the list of structured info
+        if verbose:
+            print()
+            print("Total: used nr",self.perceptrons_network.network_dimension,"perceptrons out of",self.max_number_of_perceptrons)
+
+        if use_move_table:
+            self.load_or_build_move_table(verbose)  # precompute the moves for every reachable board
+
+        self.enable_position_cache(position_cache_size)
+
+    #####################################################################################
+    ### The myTrainedTris method "load_lessons_learnt" reads the 3 knowledge base files.
+    ### It returns a dictionary: file name -> list of ( board description , next move to do)
+    #####################################################################################
+    def load_lessons_learnt(self,verbose = True):
+        lessons_learnt = {}
+        for my_kb_file_name in LESSONS_LEARNT_FILES:
+            lessons_learnt[my_kb_file_name] = self.load_lessons_learnt_file(my_kb_file_name,verbose)
+        return lessons_learnt
+
+    #####################################################################################
+    ### The myTrainedTris method "load_lessons_learnt_file" reads one knowledge base file
+    ### and returns its list of ( board description , next move to do) (empty if the file
+    ### does not exist).
+    #####################################################################################
+    def load_lessons_learnt_file(self,my_kb_file_name,verbose = True):
+        if lessons_learnt_file_exists(my_kb_file_name):
+            if verbose: print("Loading lessons-learnt knowledge base from file [",my_kb_file_name,"]:")
+            knowledge_base = myLessonsLearntKnowledgeBase(canonical = self.symmetric_lessons)
+            counter = knowledge_base.load(my_kb_file_name)  # the file can be in text or binary format
+            if verbose: print("Records:",counter,"(",len(knowledge_base),"lessons ), done.")
+            return knowledge_base.get_lessons()
+        if verbose: print("No lessons-learnt knowledge base file [",my_kb_file_name,"] found.")
+        return []
+
+    #####################################################################################
+    ### The myTrainedTris method "lessons_learnt_size" returns the number of perceptrons
+    ### needed by the network-parts for the lessons learnt: one node for each lesson
+    ### plus the node that recognises each knowledge base.
+    #####################################################################################
+    def lessons_learnt_size(self,lessons_learnt):
+        return sum(len(lessons)+1 for lessons in lessons_learnt.values() if len(lessons) > 0)
+
+    #####################################################################################
+    ### The myTrainedTris method "build_lessons_learnt" builds the network-parts for
+    ### the lessons learnt, reading the 3 knowledge base files (unless "lessons_learnt"
+    ### already contains them, as returned by "load_lessons_learnt").
+    #####################################################################################
+    def build_lessons_learnt(self,verbose = True,lessons_learnt = None):
+
+        if lessons_learnt is None:
+            lessons_learnt = self.load_lessons_learnt(verbose)
+        elif verbose:
+            for my_kb_file_name in LESSONS_LEARNT_FILES:
+                print("Lessons-learnt knowledge base [",my_kb_file_name,"]: records:",len(lessons_learnt[my_kb_file_name]))
+        # allocate the whole network at once, instead of growing it while adding the lessons:
+        self.perceptrons_network.reserve(self.perceptrons_network.network_dimension+self.lessons_learnt_size(lessons_learnt))
+        self.max_number_of_perceptrons = self.perceptrons_network.MAX_NR_OF_NODES
+        self.lessons_learnt_destinations = dict()
+        self.lessons_learnt_indexes = dict()
+        self.lessons_learnt_pending = set()     # all the network-parts are built now
+        self.lessons_learnt_loader = None
+
+        # BUILD AND TRAIN THE NETWORK-PARTS FOR LESSONS LEARNT ABOUT WINNING, GETTING TIE AND NOT LOOSING:
+        ##################################################################################################
+        for (n,label) in enumerate(self.LESSONS_LEARNT_TIERS):
+            if verbose and n > 0: print()
+            self.build_lessons_learnt_tier(label,lessons_learnt[self.LESSONS_LEARNT_TIERS[label][0]],verbose)
+
+    #####################################################################################
+    ### The myTrainedTris method "build_lessons_learnt_tier" builds the network-part for
+    ### the lessons of a strategy (label, see LESSONS_LEARNT_TIERS): a node for every
+    ### lesson, that recognises the context of the board and sets the cell of the lesson
+    ### as next move, plus the node that is active when some lesson fits the board. The
+    ### lesson nodes are indexed (see myLessonRuleIndex), so that only the ones that can
+    ### fire on the board are evaluated.
+    #####################################################################################
+    def build_lessons_learnt_tier(self,label,lessons,verbose = True):
+        (my_kb_file_name,purpose,list_of_node_ids_attribute,recognised_node_id_attribute) = self.LESSONS_LEARNT_TIERS[label]
+        net = self.perceptrons_network
+        list_of_node_ids = []       # Initialize the list of structured info
+        recognised_node_id = None
+        l = len(lessons)
         # if the file is empty don't do anything
         if l == 0:
             if verbose: print("Loaded no rules from lessons learnt knowledge base (it is empty).")
         else:
-            for (w,k) in LESSON_LEARNT_KNOWLEDGE_BASE:          # for each pair in the list:
-                node_id = self.perceptrons_network.new_node()   # Initialize a new node
+            net.reserve(net.network_dimension+l+1)  # (nothing to do if the whole network was already allocated)
+            for (w,k) in lessons:                   # for each pair in the list:
+                node_id = net.new_node()            # Initialize a new node
                 # apply the information to identify whether the card context is recognized:
-                self.perceptrons_network.node_inputs(to_node_id = node_id, input_list = [(i,w[i]) for i in range(9)] )
+                net.node_inputs(to_node_id = node_id, input_list = [(i,w[i]) for i in range(9)] )
                 # if the context matches, set the k-th cell as next move:
-                self.perceptrons_network.node_inputs(to_node_id = k, input_list = [(node_id,1)]) 
-                self.list_of_node_ids_from_lessons_learnt_tie.append(node_id)   # add the new node ID to the list
-            self.recognised_lessons_learnt_tie_node_id = self.perceptrons_network.new_node()    # Initialize a new node
+                net.node_inputs(to_node_id = k, input_list = [(node_id,1)])
+                self.lessons_learnt_destinations[node_id] = k   # remember the cell set by the lesson
+                list_of_node_ids.append(node_id)                # add the new node ID to the list
+            recognised_node_id = net.new_node()     # Initialize a new node
             # set all previous nodes as inputs for this one which will be active only when context is good:
-            self.perceptrons_network.node_inputs(to_node_id = self.recognised_lessons_learnt_tie_node_id, 
-            input_list = [(idx,1) for idx in self.list_of_node_ids_from_lessons_learnt_tie])
-            if verbose: print("Imported",l,"rules from lessons learnt knowledge base for tie.")  
-            
-        if verbose: print()
-
-        # BUILD AND TRAIN THE NETWORK-PART FOR LESSONS LEARNT ABOUT NOT LOOSING (DEFENSIVE STRATEGY):
-        #############################################################################################
-        # Load information from the knowledge base file named mytris.lessonslearnt_not_loose.txt:
-        LESSON_LEARNT_KNOWLEDGE_BASE = load_from_file(verbose,"mytris.lessonslearnt_not_loose.txt")
-        l = len(LESSON_LEARNT_KNOWLEDGE_BASE)
-        self.list_of_node_ids_from_lessons_learnt_not_loosing = []  # Initialize the list of structured info
-        # if the file is empty don't do anything
-        if l == 0:
-            if verbose: print("Loaded no rules from lessons learnt knowledge base (it is empty).")
+            net.node_inputs(to_node_id = recognised_node_id, input_list = [(idx,1) for idx in list_of_node_ids])
+            if verbose: print("Imported",l,"rules from lessons learnt knowledge base for",purpose+".")
+        setattr(self,list_of_node_ids_attribute,list_of_node_ids)
+        setattr(self,recognised_node_id_attribute,recognised_node_id)
+        self.lessons_learnt_indexes[label] = myLessonRuleIndex(net,list_of_node_ids)
+        self.max_number_of_perceptrons = net.MAX_NR_OF_NODES
+
+    #####################################################################################
+    ### The myTrainedTris method "prepare_lessons_learnt" is used instead of
+    ### "build_lessons_learnt" with "lazy_lessons": no network-part is built now, every
+    ### one is built by "get_lessons_learnt_tier" the first time its strategy is tried.
+    ### With "background_loading" the knowledge base files are read at once by a
+    ### background thread, otherwise every file is read when its lessons are needed.
+    #####################################################################################
+    def prepare_lessons_learnt(self,verbose = True):
+        self.lessons_learnt_destinations = dict()
+        self.lessons_learnt_indexes = dict()
+        for (my_kb_file_name,purpose,list_of_node_ids_attribute,recognised_node_id_attribute) in self.LESSONS_LEARNT_TIERS.values():
+            setattr(self,list_of_node_ids_attribute,[])
+            setattr(self,recognised_node_id_attribute,None)
+        self.lessons_learnt_pending = set(self.LESSONS_LEARNT_TIERS)
+        self.lessons_learnt_loader = None
+        if self.background_loading:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers = 1)
+            self.lessons_learnt_loader = executor.submit(self.load_lessons_learnt,False)
+            executor.shutdown(wait = False)     # the thread ends when the files are read
+        if verbose: print("The lessons learnt will be used from the first time they are needed.")
+
+    #####################################################################################
+    ### The myTrainedTris method "get_lessons_learnt_tier" returns the couple (list of
+    ### the lesson nodes, ID of the node that is active when some lesson fits the board)
+    ### of a strategy (label, see LESSONS_LEARNT_TIERS), building its network-part first
+    ### if it is still pending (see "prepare_lessons_learnt").
+    #####################################################################################
+    def get_lessons_learnt_tier(self,label):
+        (my_kb_file_name,purpose,list_of_node_ids_attribute,recognised_node_id_attribute) = self.LESSONS_LEARNT_TIERS[label]
+        if label in self.lessons_learnt_pending:
+            if self.lessons_learnt_loader is not None:  # wait for the background thread, if it is still reading
+                lessons = self.lessons_learnt_loader.result()[my_kb_file_name]
+            else:
+                lessons = self.load_lessons_learnt_file(my_kb_file_name,False)
+            self.build_lessons_learnt_tier(label,lessons,False)
+            self.lessons_learnt_pending.discard(label)
+        return (getattr(self,list_of_node_ids_attribute),getattr(self,recognised_node_id_attribute))
+
+    #####################################################################################
+    ### The myTrainedTris method "clone" returns a new independent game with the same
+    ### state (board, network statuses and match). The lessons learnt, their indexes
+    ### and the move table are shared with the original: "reload_lessons_learnt"
+    ### replaces them, so after a reload the two games are independent.
+    #####################################################################################
+    def clone(self):
+        tris = super().clone()
+        tris.match = list(self.match)
+        tris.lessons_learnt_indexes = dict(self.lessons_learnt_indexes)        # the clone builds its own pending network-parts
+        tris.lessons_learnt_destinations = dict(self.lessons_learnt_destinations)
+        tris.lessons_learnt_pending = set(self.lessons_learnt_pending)
+        if self.perceptrons_network.instrumentation is not None:   # the clone counts in the same instrumentation
+            tris.enable_instrumentation(self.perceptrons_network.instrumentation)
+        if self.position_cache is not None:     # the clone starts from the same cached positions
+            tris.position_cache = collections.OrderedDict(self.position_cache)
+            tris.position_cache_counters = dict(self.position_cache_counters)
+        return tris
+
+    #####################################################################################
+    ### The myTrainedTris method "restore" sets the state of the game taken by "snapshot".
+    ### If the lessons learnt were built (lazily) or reloaded after the snapshot, the
+    ### network has changed: only the basic network (board included) is restored and
+    ### the new network-parts for the lessons learnt are set to EMPTY.
+    #####################################################################################
+    def restore(self,snapshot):
+        network_dimension = self.perceptrons_network.network_dimension
+        if len(snapshot) != network_dimension:
+            snapshot = snapshot[:self.basic_network_dimension]+(EMPTY,)*(network_dimension-self.basic_network_dimension)
+        super().restore(snapshot)
+
+    #####################################################################################
+    ### The myTrainedTris method "reload_lessons_learnt" removes the network-parts for
+    ### the lessons learnt and builds them again from the (changed) knowledge base files
+    ### (on first use with "lazy_lessons"). The board and the basic network are not changed.
+    #####################################################################################
+    def reload_lessons_learnt(self,verbose = False):
+        self.lessons_learnt_signature = lessons_learnt_files_signature()
+        self.perceptrons_network.truncate(self.basic_network_dimension)    # remove the old lessons learnt
+        if self.lazy_lessons:
+            self.prepare_lessons_learnt(verbose)                            # and load them again when needed
         else:
-            for (w,k) in LESSON_LEARNT_KNOWLEDGE_BASE:          # for each pair in the list:
-                node_id = self.perceptrons_network.new_node()   # Initialize a new node
-                # apply the information to identify whether the card context is recognized:
-                self.perceptrons_network.node_inputs(to_node_id = node_id, input_list = [(i,w[i]) for i in range(9)] )
-                # if the context matches, set the k-th cell as next move:
-                self.perceptrons_network.node_inputs(to_node_id = k, input_list = [(node_id,1)]) 
-                self.list_of_node_ids_from_lessons_learnt_not_loosing.append(node_id)   # add the new node ID to the list
-            self.recognised_lessons_learnt_not_loosing_node_id = self.perceptrons_network.new_node()    # Initialize a new node
-            # set all previous nodes as inputs for this one which will be active only when context is good:
-            self.perceptrons_network.node_inputs(to_node_id = self.recognised_lessons_learnt_not_loosing_node_id, 
-            input_list = [(idx,1) for idx in self.list_of_node_ids_from_lessons_learnt_not_loosing])
-            if verbose: print("Imported",l,"rules from lessons learnt knowledge base for not loosing.") 
-            
-        if verbose:
-            print()
-            print("Total: used nr",self.perceptrons_network.network_dimension,"perceptrons out of",self.max_number_of_perceptrons)
+            self.build_lessons_learnt(verbose)                              # and load them again
+        self.clear_position_cache()                                         # the cached moves are not valid anymore
+        if self.move_table is not None:                                     # the precomputed moves are not valid anymore
+            self.build_move_table(verbose)
+            self.save_move_table(verbose)
 
     ##################################################################################################################
     ### The myTrainedTris method "check" evaluates whether there is a win or a draw between computer/user on the board
@@ -689,73 +2596,360 @@ class myTrainedTris(myTris):    # This class inherits properties from myTris one
         # all perceptrons related to tie status are evaluated in sequence:
         self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_full_board_node_ids)
         # if the following node is active then the game is over and the result is tie:
-        if self.perceptrons_network.evaluate_new_node_status(self.tie_node_id) == "activated_node": 
+        if self.perceptrons_network.evaluate_new_node_status(self.tie_node_id) == "activated_node":
             if verbose: print("It's a tie!")
             return "tie"
 
+    ##############################################################################################################
+    ### The myTrainedTris method "get_move_strategies" yields the strategies used by "get_computer_move", in
+    ### order of priority. Every strategy is (label, list of node IDs to evaluate, ID of the node that must be
+    ### active to apply the strategy or None if it is always applicable).
+    ### For the lessons learnt, only the lesson nodes that can fire on the current board are listed. With
+    ### "symmetric_lessons" the list of the lessons learnt is None: they are evaluated on every symmetry of
+    ### the board by "get_symmetric_lesson_cells".
+    ### The strategies are yielded one at a time, so with "lazy_lessons" the network-part of the lessons
+    ### learnt of a strategy is built only when the strategy is tried (see "get_lessons_learnt_tier").
+    ##############################################################################################################
+    def get_move_strategies(self):
+        yield ("one_step_winning",self.list_of_node_ids_for_winning,self.one_step_winning_node_id)
+        yield ("basic_defense",self.list_of_node_ids_for_defense,self.activated_defense_node_id)
+        # if info from experience are available on related files:
+        for label in ("learnt_defense","lessons_learnt_winning_attack","lessons_learnt_tie_attack"):
+            (list_of_node_ids,main_node_id) = self.get_lessons_learnt_tier(label)
+            if list_of_node_ids != []:
+                if self.symmetric_lessons:
+                    yield (label,None,None)
+                else:
+                    yield (label,self.lessons_learnt_indexes[label].select(self.get_board()),main_node_id)
+        # if nothing worked then apply a random strategy:
+        yield ("random_attack",self.list_of_node_ids_for_attack_random,None)
+
     ##############################################################################################################
     ### The myTrainedTris method "get_computer_move" evaluates the computer's next move based on the current state
     ### of the board, using basic knowledge and experience (lessons learnt).
+    ### With "instrumentation" (see "enable_instrumentation") every tier (the move table, the position cache, the
+    ### check of the full board and every strategy) is timed, and the strategy that produced the move is recorded.
     ##############################################################################################################
     def get_computer_move(self,verbose = True):
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            label = self.get_computer_move_label(None)
+        else:
+            call_start = instrumentation.start_tier()
+            label = self.get_computer_move_label(instrumentation)
+            instrumentation.end_move(label,call_start)
+        if verbose: print(self.MOVE_MESSAGES[label])
+        return label
+
+    def get_computer_move_label(self,instrumentation):     # the tiers of "get_computer_move", timed by "instrumentation" if not None
+        if self.move_table is not None:     # if the moves are precomputed, look the board up in the table
+            start = instrumentation.start_tier() if instrumentation is not None else None
+            label = self.get_computer_move_from_table()
+            if instrumentation is not None: instrumentation.end_tier("move_table",start,label is not None)
+            if label is not None:
+                return label
+        if self.position_cache is not None: # if the cache is enabled, look the board up in the cache
+            start = instrumentation.start_tier() if instrumentation is not None else None
+            label = self.get_computer_move_from_cache()
+            if instrumentation is not None: instrumentation.end_tier("position_cache",start,True)
+            return label
+        start = instrumentation.start_tier() if instrumentation is not None else None
         # all perceptrons related to full board status are evaluated in sequence:
         self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_full_board_node_ids)
         # if the following node is active then the game is over and the result is impossible to make a move:
-        if self.perceptrons_network.evaluate_new_node_status(self.tie_node_id) == "activated_node":
-            if verbose: print("Board if full! I cannot move...")
+        full_board = self.perceptrons_network.evaluate_new_node_status(self.tie_node_id) == "activated_node"
+        if instrumentation is not None: instrumentation.end_tier("no_possible_move",start,full_board)
+        if full_board:
             return "no_possible_move"
-        # all perceptrons related to elementary winning strategy are evaluated in sequence:
-        self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_node_ids_for_winning)
-        # if the following node is active then try to make a move and win:
-        if self.perceptrons_network.evaluate_new_node_status(self.one_step_winning_node_id) == "activated_node":
-            if self.try_move() == "move_done":
-                if verbose: print("With the next move I win...")
-                return "one_step_winning"
-        # all perceptrons related to elementary defensive strategy are evaluated in sequence:
-        self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_node_ids_for_defense)
-        # if the following node is active then try to make a move and defend:
-        if self.perceptrons_network.evaluate_new_node_status(self.activated_defense_node_id) == "activated_node":
-            if self.try_move() == "move_done":
-                if verbose: print("My next move will be a basic defense...")
-                return "basic_defense"
-        # if info from experience are available on related files:
-        if self.list_of_node_ids_from_lessons_learnt_not_loosing != []:
-            # all perceptrons related to lessons-learnt for not loosing strategies are evaluated in sequence:
-            self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_node_ids_from_lessons_learnt_not_loosing)
-            # if the following node is active then try to make a move and defend:
-            if self.perceptrons_network.evaluate_new_node_status(self.recognised_lessons_learnt_not_loosing_node_id) == "activated_node":
-                if self.try_move() == "move_done" :
-                    if verbose: print("With my next move I will defend based on what I learned from the games...")
-                    return "learnt_defense"
-        # if info from experience are available on related files:
-        if self.list_of_node_ids_from_lessons_learnt_win != []:
-            # all perceptrons related to lessons-learnt for winning strategies are evaluated in sequence:
-            self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_node_ids_from_lessons_learnt_win)
-            # if the following node is active then try to make a move and attack:
-            if self.perceptrons_network.evaluate_new_node_status(self.recognised_lessons_learnt_win_node_id) == "activated_node":
-                if self.try_move() == "move_done":
-                    if verbose: print("My next move will be based on the lessons learned from a victory...")
-                    return "lessons_learnt_winning_attack"
-        # if info from experience are available on related files:
-        if self.list_of_node_ids_from_lessons_learnt_tie != []:
-            # all perceptrons related to lessons-learnt for tie strategies are evaluated in sequence:
-            self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_node_ids_from_lessons_learnt_tie)
-            # if the following node is active then try to move and defend:
-            if self.perceptrons_network.evaluate_new_node_status(self.recognised_lessons_learnt_tie_node_id) == "activated_node":
-                if self.try_move() == "move_done":
-                    if verbose: print("My next move will be based on a lesson learned from a draw...")
-                    return "lessons_learnt_tie_attack"
-        # if nothing worked then apply a random strategy...
-        # all perceptrons related to a random strategy are evaluated in sequence:
-        self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_node_ids_for_attack_random)
-        # try to randomly make a move
-        if self.try_move() == "move_done":
-            if verbose: print("My next move is random, I can't do better in this situation...")
-            return "random_attack"
+        # try every strategy in order of priority (winning, defense, lessons learnt, random):
+        for (label,node_id_set,main_node_id) in self.get_move_strategies():
+            start = instrumentation.start_tier() if instrumentation is not None else None
+            if node_id_set is None:         # lessons learnt evaluated on every symmetry of the board
+                move_done = self.try_move_among(self.get_symmetric_lesson_cells(label)) == "move_done"
+            else:
+                # all perceptrons related to the strategy are evaluated in sequence:
+                self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(node_id_set)
+                # if the main node of the strategy is active then try to make a move:
+                move_done = ((main_node_id is None or self.perceptrons_network.evaluate_new_node_status(main_node_id) == "activated_node")
+                             and self.try_move() == "move_done")
+            if instrumentation is not None: instrumentation.end_tier(label,start,move_done)
+            if move_done:
+                return label
         # The following part should never be reachable, it's just a precaution...
-        if verbose: print("I don't know what to do, I'm so sorry!!!")
         return "unable_to_respond"
 
+    ##############################################################################################################
+    ### The myTrainedTris method "get_symmetric_lesson_cells" evaluates the lesson nodes of a strategy (label)
+    ### on the 8 symmetries of the board and returns the list of the empty cells that the lessons that fire
+    ### would set, moved back on the board. So every lesson in canonical form works as its 8 symmetric forms.
+    ### The board and the statuses of the lesson nodes are restored at the end.
+    ##############################################################################################################
+    def get_symmetric_lesson_cells(self,label):
+        index = self.lessons_learnt_indexes[label]
+        statuses = self.perceptrons_network.node_statuses
+        board = self.get_board()
+        fired = dict()              # moved board -> destination cells (on the moved board) of the lessons that fire
+        cells = set()
+        for k in range(8):
+            moved_board = board.transformed(k)
+            destinations = fired.get(moved_board)
+            if destinations is None:    # the same board can be obtained by more than one symmetry
+                node_id_set = index.select(moved_board)
+                self.set_board(moved_board)
+                self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(node_id_set)
+                destinations = [self.lessons_learnt_destinations[node_id] for node_id in node_id_set if statuses[node_id] == CIRCLE]
+                for node_id in node_id_set:
+                    statuses[node_id] = EMPTY
+                fired[moved_board] = destinations
+            for cell in destinations:
+                cells.add(TRIS_SYMMETRIES_INVERSE[k][cell])
+        self.set_board(board)
+        return [cell for cell in sorted(cells) if board.cell(cell) == EMPTY]
+
+    ##############################################################################################################
+    ### The myTrainedTris method "evaluate_move_options" is the same as "get_computer_move" but it does not make
+    ### the move: it returns the strategy label together with the list of all the cells that the strategy could
+    ### set (the move is one of them chosen at random).
+    ##############################################################################################################
+    def evaluate_move_options(self):
+        self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(self.list_of_full_board_node_ids)
+        if self.perceptrons_network.evaluate_new_node_status(self.tie_node_id) == "activated_node":
+            return ("no_possible_move",[])
+        for (label,node_id_set,main_node_id) in self.get_move_strategies():
+            if node_id_set is None:         # lessons learnt evaluated on every symmetry of the board
+                cells = self.get_symmetric_lesson_cells(label)
+                if cells != []:
+                    return (label,cells)
+                continue
+            self.perceptrons_network.evaluate_new_status_for_all_nodes_sequentially(node_id_set)
+            if main_node_id is None or self.perceptrons_network.evaluate_new_node_status(main_node_id) == "activated_node":
+                cells = self.movable_cells()
+                if cells != []:
+                    return (label,cells)
+        return ("unable_to_respond",[])
+
+    ##############################################################################################################
+    ### The myTrainedTris method "build_move_table" evaluates the move options (see "evaluate_move_options") for
+    ### every board that can be reached during a match where it is the computer's turn (whoever started) and
+    ### the match is not over. The board and the network status are restored at the end.
+    ##############################################################################################################
+    def build_move_table(self,verbose = True):
+        if verbose: print("Building the table of the moves for every reachable board...",end="")
+        saved_board = self.get_board()
+        table = dict()
+        visited = set()
+        pending = [(myTrisBoard(),CIRCLE),(myTrisBoard(),STAR)]   # (board, player to move): the computer or the user can begin
+        while pending:
+            (board,player) = pending.pop()
+            if (board,player) in visited:
+                continue
+            visited.add((board,player))
+            if board.is_over():
+                continue                    # the match is over
+            if player == CIRCLE and board not in table:
+                self.reset_all_but_the_board()
+                self.set_board(board)
+                table[board] = self.evaluate_move_options()
+            for cell in board.empty_cells():    # every legal move of the player leads to another reachable board
+                pending.append((board.play(cell,player),-player))
+        self.set_board(saved_board)
+        self.reset_all_but_the_board()
+        self.move_table = table
+        self.move_table_signature = lessons_learnt_files_signature()
+        if verbose: print("done (",len(table),"boards).")
+
+    ##############################################################################################################
+    ### The myTrainedTris method "save_move_table" writes the move table to the file mytris.movetable.txt.
+    ### The first line stores the fingerprint of the lessons-learnt files used to build the table, then
+    ### every line is: 9 cells of the board ; strategy label ; cells of the possible moves.
+    ##############################################################################################################
+    def save_move_table(self,verbose = True):
+        with open(MOVE_TABLE_FILE, 'wt') as my_file_handler:
+            my_file_handler.write("{}\n".format(self.move_table_fingerprint()))
+            for (board,(label,cells)) in self.move_table.items():
+                my_file_handler.write("{};{};{}\n".format(",".join(str(v) for v in board.to_status()),label,",".join(str(c) for c in cells)))
+        if verbose: print("Move table saved to file [",MOVE_TABLE_FILE,"].")
+
+    ##############################################################################################################
+    ### The myTrainedTris method "move_table_fingerprint" returns the fingerprint of what the move table depends
+    ### on: the lessons-learnt files and the way the lessons are matched.
+    ##############################################################################################################
+    def move_table_fingerprint(self):
+        return lessons_learnt_files_fingerprint()+(":symmetric" if self.symmetric_lessons else "")
+
+    ##############################################################################################################
+    ### The myTrainedTris method "load_or_build_move_table" loads the move table from mytris.movetable.txt if
+    ### it was built from the current lessons-learnt files, otherwise it builds the table and saves it.
+    ##############################################################################################################
+    def load_or_build_move_table(self,verbose = True):
+        if os.path.exists(MOVE_TABLE_FILE):
+            signature = lessons_learnt_files_signature()
+            with open(MOVE_TABLE_FILE, 'rt') as my_file_handler:
+                if my_file_handler.readline().strip() == self.move_table_fingerprint():
+                    table = dict()
+                    for line in my_file_handler:
+                        (board,label,cells) = line.strip().split(";")
+                        table[myTrisBoard.from_status([int(v) for v in board.split(",")])] = (label,[int(c) for c in cells.split(",") if c != ""])
+                    self.move_table = table
+                    self.move_table_signature = signature
+                    if verbose: print("Loaded the table of the moves from file [",MOVE_TABLE_FILE,"]:",len(table),"boards.")
+                    return
+        self.build_move_table(verbose)
+        self.save_move_table(verbose)
+
+    ##############################################################################################################
+    ### The myTrainedTris method "get_computer_move_from_table" makes the computer's move by a lookup in the
+    ### move table, choosing at random among the possible cells. If any lessons-learnt file has changed, the
+    ### lessons learnt and the table are reloaded first. It returns None if the board is not in the table.
+    ##############################################################################################################
+    def get_computer_move_from_table(self):
+        if lessons_learnt_files_signature() != self.move_table_signature:  # the knowledge base has changed
+            self.reload_lessons_learnt(verbose = False)
+        entry = self.move_table.get(self.get_board())
+        if entry is None:
+            return None
+        (label,cells) = entry
+        if cells != []:
+            self.perceptrons_network.node_statuses[random.choice(cells)] = CIRCLE
+        return label
+
+    ##############################################################################################################
+    ### The myTrainedTris method "enable_position_cache" keeps the move options (strategy label and possible
+    ### cells, see "evaluate_move_options") of the last "size" positions in a LRU cache, so that the moves for
+    ### the most frequent positions are not evaluated again. A size of 0 disables the cache.
+    ##############################################################################################################
+    def enable_position_cache(self,size):
+        self.position_cache_size = int(size)
+        self.position_cache = collections.OrderedDict() if self.position_cache_size > 0 else None
+        self.position_cache_counters = {"hits":0,"misses":0,"evictions":0}
+
+    ##############################################################################################################
+    ### The myTrainedTris method "clear_position_cache" empties the cache (e.g. when the lessons learnt change).
+    ### The counters are not reset.
+    ##############################################################################################################
+    def clear_position_cache(self):
+        if self.position_cache is not None:
+            self.position_cache = collections.OrderedDict()     # a new cache: the clones keep their own one
+
+    ##############################################################################################################
+    ### The myTrainedTris method "get_computer_move_from_cache" makes the computer's move using the LRU cache:
+    ### on a miss, the move options are evaluated and cached. The move is chosen among the possible cells in the
+    ### same random order of "try_move". It returns the strategy label.
+    ### The positions are the boards of the side to move (see "compute_move"). If any lessons-learnt file has
+    ### changed, the lessons learnt are reloaded first, and so the cache is emptied.
+    ##############################################################################################################
+    def get_computer_move_from_cache(self):
+        if lessons_learnt_files_signature() != self.lessons_learnt_signature:  # the knowledge base has changed
+            self.reload_lessons_learnt(verbose = False)
+        board = self.get_board()
+        key = (board,CIRCLE) if self.side_to_move == CIRCLE else (board.flipped(),self.side_to_move)
+        entry = self.position_cache.get(key)
+        if entry is not None:
+            self.position_cache.move_to_end(key)
+            self.position_cache_counters["hits"] += 1
+        else:
+            self.position_cache_counters["misses"] += 1
+            entry = self.evaluate_move_options()
+            self.position_cache[key] = entry
+            if len(self.position_cache) > self.position_cache_size:
+                self.position_cache.popitem(last = False)     # remove the least recently used position
+                self.position_cache_counters["evictions"] += 1
+        (label,cells) = entry
+        if cells != []:
+            self.try_move_among(cells)
+        return label
+
+    ##############################################################################################################
+    ### The myTrainedTris method "get_position_cache_stats" returns the counters of the cache together with its
+    ### current size, its max size and the hit rate.
+    ##############################################################################################################
+    def get_position_cache_stats(self):
+        stats = dict(self.position_cache_counters)
+        stats["size"] = len(self.position_cache) if self.position_cache is not None else 0
+        stats["max_size"] = self.position_cache_size
+        lookups = stats["hits"]+stats["misses"]
+        stats["hit_rate"] = stats["hits"]/lookups if lookups > 0 else 0.0
+        return stats
+
+    ##############################################################################################################
+    ### The myTrainedTris method "enable_instrumentation" instruments the perceptron network (see the same method
+    ### of myPerceptronNetwork) and times every strategy tier of "get_computer_move": it returns the
+    ### myNetworkInstrumentation with the counters (see its "summary_table" and "to_json").
+    ### Without instrumentation "get_computer_move" only checks that "instrumentation" is None.
+    ##############################################################################################################
+    def enable_instrumentation(self,instrumentation = None):
+        self.instrumentation = self.perceptrons_network.enable_instrumentation(instrumentation)
+        return self.instrumentation
+
+    ##############################################################################################################
+    ### The myTrainedTris method "disable_instrumentation" stops the counters and the timers.
+    ##############################################################################################################
+    def disable_instrumentation(self):
+        self.perceptrons_network.disable_instrumentation()
+        self.instrumentation = None
+
+    ##############################################################################################################
+    ### The myTrainedTris method "compute_move" is the non-interactive API of the game: it receives a board
+    ### (myTrisBoard or list of the 9 cell statuses) and the side to move (CIRCLE or STAR) and returns, without
+    ### any console I/O and without changing the state of the game, the dictionary:
+    ### - "move": ID of the cell of the move (None if no move is possible)
+    ### - "strategy": strategy label of the move (see "get_computer_move")
+    ### - "status": status of the game for the side to move, after the move: "in_progress", "victory",
+    ###   "defeat" (only if the board was already lost), "tie" or "invalid_board" (also if it is not the turn of
+    ###   the side to move: the side that did not start has one symbol less or as many as the other side, and if
+    ###   the list has not 9 cells or a cell is not CIRCLE, STAR or EMPTY)
+    ### - "board": the board after the move (myTrisBoard, None if the list is not a board)
+    ##############################################################################################################
+    def compute_move(self,board,side = CIRCLE):
+        if not isinstance(board,myTrisBoard):
+            if not isinstance(board,(list,tuple)) or len(board) != 9 or any(cell not in (CIRCLE,STAR,EMPTY) for cell in board):
+                return {"move":None,"strategy":"no_possible_move","status":"invalid_board","board":None}
+            board = myTrisBoard.from_status(board)
+        result = {"move":None,"strategy":"no_possible_move","status":"invalid_board","board":board}
+        circles = bin(board.o_mask).count("1")
+        stars = bin(board.x_mask).count("1")
+        (own,opponent) = (circles,stars) if side == CIRCLE else (stars,circles)
+        if side not in (CIRCLE,STAR) or board.o_mask & board.x_mask or own not in (opponent,opponent-1):
+            return result                                       # overlapping symbols or not the turn of "side"
+        view = board if side == CIRCLE else board.flipped()     # the network always plays CIRCLE
+        winner = view.winner()
+        if winner is not None or view.is_full():                # the game is already over
+            result["status"] = "victory" if winner == CIRCLE else ("defeat" if winner == STAR else "tie")
+            return result
+        snapshot = self.snapshot()
+        self.set_board(view)
+        self.reset_all_but_the_board()
+        self.side_to_move = side
+        label = self.get_computer_move(verbose = False)
+        self.side_to_move = CIRCLE
+        new_cells = self.get_board().o_mask & ~view.o_mask
+        self.restore(snapshot)
+        result["strategy"] = label
+        if new_cells == 0:
+            result["status"] = "in_progress"
+            return result
+        result["move"] = new_cells.bit_length()-1
+        result["board"] = board.play(result["move"],side)
+        view = view.play(result["move"],CIRCLE)
+        result["status"] = "victory" if view.winner() == CIRCLE else ("tie" if view.is_full() else "in_progress")
+        return result
+
+    ##############################################################################################################
+    ### The myTrainedTris method "submit_match" learns, without any console I/O, from a finished match (match
+    ### list as built by "play", see myGameLearning.get_match_lessons). With "reload" the lessons learnt of the
+    ### game are reloaded at once. It returns the dictionary: match status ("win","tie","loose") -> number of
+    ### lessons learnt, or None if the match is not complete and legal.
+    ### The same myGameLearning learns all the matches, so the knowledge base files are read again only when
+    ### they are changed by someone else (see myGameLearning.get_knowledge_base).
+    ##############################################################################################################
+    def submit_match(self,match,reload = False):
+        if self.game_learning is None:
+            self.game_learning = myGameLearning(self.symmetric_lessons)
+        counters = self.game_learning.learn_match(match,verbose = False)
+        if counters is not None and reload:
+            self.reload_lessons_learnt(verbose = False)
+        return counters
+
     ####################################################################
     ### The myTrainedTris method "get_user_move" gets the user's next 
     ### move. The user can enter a number between 0 and 8 (inclusive) 
@@ -835,7 +3029,7 @@ class myTrainedTris(myTris):    # This class inherits properties from myTris one
                             self.match[0] = STAR
                         else:
                             self.match[0] = CIRCLE      # if count is odd the first who started playing has won
-                        game_learning_for_winning = myGameLearning()
+                        game_learning_for_winning = myGameLearning(self.symmetric_lessons)
                         game_learning_for_winning.analyze_my_match(self.match,"win")    # activate the learning process by class myGameLearning
                         print()
                         print("I'm learning this match as a non loosing scheme:")
@@ -843,13 +3037,13 @@ class myTrainedTris(myTris):    # This class inherits properties from myTris one
                             self.match[0] = CIRCLE      # if count is even the first who started playing has lost
                         else:
                             self.match[0] = STAR        # if count is odd the second who started playing has lost
-                        game_learning_for_not_loosing = myGameLearning()
+                        game_learning_for_not_loosing = myGameLearning(self.symmetric_lessons)
                         game_learning_for_not_loosing.analyze_my_match(self.match,"loose")  # activate the learning process by class myGameLearning
                     # for a tie, the software can learn lessons for defending:
                     elif r == "tie":
                         print()
                         print("I'm learning this game as a draw pattern:")
-                        game_learning_for_tie = myGameLearning()
+                        game_learning_for_tie = myGameLearning(self.symmetric_lessons)
                         game_learning_for_tie.analyze_my_match(self.match,"tie")    # activate the learning process by class myGameLearning
                 # if the user does not authorize the learning procedure everything ends:
                 print("End.")
@@ -867,259 +3061,1166 @@ class myGameLearning:
     lessons_learnt_for_winning = None       # list of the lessons learnt as a winning strategy
     lessons_learnt_for_tie = None           # list of the lessons learnt as a tie strategy
     lessons_learnt_for_not_loosing = None   # list of the lessons learnt as a non loosing strategy
+    shared_tris = None                      # basic game (myTris) shared by all the analyses to evaluate the boards
+    use_journal = True                      # if True the new lessons are appended to the journals of the files (see "update_knowledge_base")
+    symmetric_lessons = True                # if True the lessons are stored in canonical form (see function "canonical_lesson")
+    knowledge_bases = None                  # dictionary: knowledge base file -> (signature of the files, loaded knowledge base)
 
     #METHODS(myGameLearning):
     #########################
 
     ########################################################################
-    ### The myGameLearning method "analyze_my_match" works on game history
-    ### to define lessons learned that will be stored in 3 text files.
+    ### The myGameLearning constructor: "symmetric_lessons" must be the one
+    ### of the game that learns (see myTrainedTris), so that the files of a
+    ### game that does not use the symmetries are not rewritten in canonical
+    ### form (that game would then play rotated lessons).
     ########################################################################
-    def analyze_my_match(self,match,match_status):
+    def __init__(self,symmetric_lessons = True):
+        self.symmetric_lessons = symmetric_lessons
+        self.knowledge_bases = dict()
 
-        ####################################################################################
-        ### The local procedure "analyze_single_match_if_win_or_tie" works on the
-        ### list of the match only when the match ended with a winner or a draw.
-        ####################################################################################
-        def analyze_single_match_if_win_or_tie(match):
-            l = len(match)
-            if l != 10:     # the length of the list of the match must be 10, otherwise error:
-                print("Error 1 from class myGameLearning: bad match-list [",match,"]")
-                quit()
-            player = match[0]       # the first position of the list of the match is the first player
-            lessons = list()        # initialize the list of the lessons learnt
-            # set some parameters to process the lessons learned:
-            if player == CIRCLE:
-                idx_start = 1
-                myexp = 1
-            elif player == STAR:
-                idx_start = 2
-                myexp = 0
-            else:
-                print("Error 2 from class myGameLearning: bad player...[",player,"]")
-                quit()
-            # Evaluate the final status of the board after playing accordingly with the list of the match:
-            final_status = [EMPTY for i in range(9)]
-            for i in range(1,10):
+    ########################################################################
+    ### The myGameLearning method "get_tris" returns the basic game used to
+    ### evaluate the boards during the analysis. It is built only once and
+    ### shared by all the instances of the class: before every use its state
+    ### is reset, but the board, by "reset_all_but_the_board".
+    ########################################################################
+    def get_tris(self):
+        if myGameLearning.shared_tris is None:
+            myGameLearning.shared_tris = myTris(verbose = False)
+        tris = myGameLearning.shared_tris
+        tris.reset_all_but_the_board()
+        return tris
+
+    ####################################################################################
+    ### The myGameLearning method "analyze_single_match_if_win_or_tie" works on the
+    ### list of the match only when the match ended with a winner or a draw.
+    ####################################################################################
+    def analyze_single_match_if_win_or_tie(self,match):
+        l = len(match)
+        if l != 10:     # the length of the list of the match must be 10, otherwise error:
+            print("Error 1 from class myGameLearning: bad match-list [",match,"]")
+            quit()
+        player = match[0]       # the first position of the list of the match is the first player
+        lessons = list()        # initialize the list of the lessons learnt
+        # set some parameters to process the lessons learned:
+        if player == CIRCLE:
+            idx_start = 1
+            myexp = 1
+        elif player == STAR:
+            idx_start = 2
+            myexp = 0
+        else:
+            print("Error 2 from class myGameLearning: bad player...[",player,"]")
+            quit()
+        # Evaluate the final status of the board after playing accordingly with the list of the match:
+        final_status = [EMPTY for i in range(9)]
+        for i in range(1,10):
+            if match[i] != None:
+                final_status[match[i]] = (-1)**(i-myexp)
+        tris_check = self.get_tris()                    # use the class myTris to work on the board and
+        (reason,_,_) = tris_check.respond(final_status) # evaluate the final status of the board after the match
+        if reason != "computer_victory" and reason != "tie":
+            print("Error 3 from class myGameLearning: bad match final reason...[",match,reason,"]")
+            quit()
+        # if here the response from myTris class is that the board (at the end of match) describes a victory or a tie
+        for idx in range(idx_start,9,2):
+            # analyze every move of the game and get evolution patterns to remember (something like rules or strategies):
+            from_status = [EMPTY for i in range(9)]
+            for i in range(1,idx):
                 if match[i] != None:
-                    final_status[match[i]] = (-1)**(i-myexp)
-            tris_check = myTris(verbose = False)            # use the class myTris to work on the board and
-            (reason,_,_) = tris_check.respond(final_status) # evaluate the final status of the board after the match
-            if reason != "computer_victory" and reason != "tie":
-                print("Error 3 from class myGameLearning: bad match final reason...[",match,reason,"]")
-                quit()
-            # if here the response from myTris class is that the board (at the end of match) describes a victory or a tie
-            for idx in range(idx_start,9,2):
-                # analyze every move of the game and get evolution patterns to remember (something like rules or strategies):
-                from_status = [EMPTY for i in range(9)]
-                for i in range(1,idx):
-                    if match[i] != None:
-                        from_status[match[i]] = (-1)**(i-myexp)     # define the starting status
-                to_status = [EMPTY for i in range(9)]
-                for i in range(1,idx+1):
-                    if match[i] != None:
-                        to_status[match[i]] = (-1)**(i-myexp)       # define the target status
-                tris = myTris(verbose = False)                      # use the class myTris to work on the board and
-                (reason,_,_) = tris.respond(from_status)            # evaluate the final status of the board after the match
-                if reason == "computer_victory" or reason == "tie":
-                    # if here the situation of the board is a game over so nothing to learn (the last moves cannot be avoided)
-                    continue
-                if reason == "unable_to_respond" or reason == "random_attack":
-                    # If the myTris class doesn't know how to make a move, it's okay to get a strategy by remembering the game move;
-                    # create the strategy: match a corresponding board pattern and the right move:
-                    weights = [0 for i in range(9)]                 # Initialize the list of weights
-                    acc = 0                                         # Initialize the counter of the non EMPTY cells that didn't change
-                    for j in range(9):
-                        if from_status[j] == to_status[j]:
-                            if from_status[j] != EMPTY:
-                                acc += 1
-                    destination_node_id = -1                        # Initialize the destination node ID with an impossible value
-                                                                    # (IDs can be 0 or positive, not negative)
-                    for j in range(9):
-                        if from_status[j] == CIRCLE and to_status[j] == CIRCLE: # no status change for CIRCLE: 
-                            weights[j] = 1/acc                                  # associate a positive weight 1/acc
-                        elif from_status[j] == STAR and to_status[j] == STAR:   # no status change for STAR: 
-                            weights[j] = -1/acc                                 # associate a negative weight -1/acc
-                        elif from_status[j] == EMPTY and to_status[j] != EMPTY: # status change from EMPTY to non EMPTY: 
-                            destination_node_id = j                             # define the destination node ID (the cell for the good move)
-                        elif from_status[j] == EMPTY and to_status[j] == EMPTY: # no status change for EMPTY: 
-                            weights[j] = 0                                      # associate a weight 0
-                        else:
-                            print("Error 4 from class myGameLearning: bad tris configuration...[",j,from_status,to_status,"]")
-                            quit()
-                    if destination_node_id < 0:     # if the destination node ID is not good an error occurred:
-                        print("Error 5 from class myGameLearning: bad destination node id...[",destination_node_id,"]")
+                    from_status[match[i]] = (-1)**(i-myexp)     # define the starting status
+            to_status = [EMPTY for i in range(9)]
+            for i in range(1,idx+1):
+                if match[i] != None:
+                    to_status[match[i]] = (-1)**(i-myexp)       # define the target status
+            tris = self.get_tris()                              # use the class myTris to work on the board and
+            (reason,_,_) = tris.respond(from_status)            # evaluate the final status of the board after the match
+            if reason == "computer_victory" or reason == "tie":
+                # if here the situation of the board is a game over so nothing to learn (the last moves cannot be avoided)
+                continue
+            if reason == "unable_to_respond" or reason == "random_attack":
+                # If the myTris class doesn't know how to make a move, it's okay to get a strategy by remembering the game move;
+                # create the strategy: match a corresponding board pattern and the right move:
+                weights = [0 for i in range(9)]                 # Initialize the list of weights
+                acc = 0                                         # Initialize the counter of the non EMPTY cells that didn't change
+                for j in range(9):
+                    if from_status[j] == to_status[j]:
+                        if from_status[j] != EMPTY:
+                            acc += 1
+                destination_node_id = -1                        # Initialize the destination node ID with an impossible value
+                                                                # (IDs can be 0 or positive, not negative)
+                for j in range(9):
+                    if from_status[j] == CIRCLE and to_status[j] == CIRCLE: # no status change for CIRCLE: 
+                        weights[j] = 1/acc                                  # associate a positive weight 1/acc
+                    elif from_status[j] == STAR and to_status[j] == STAR:   # no status change for STAR: 
+                        weights[j] = -1/acc                                 # associate a negative weight -1/acc
+                    elif from_status[j] == EMPTY and to_status[j] != EMPTY: # status change from EMPTY to non EMPTY: 
+                        destination_node_id = j                             # define the destination node ID (the cell for the good move)
+                    elif from_status[j] == EMPTY and to_status[j] == EMPTY: # no status change for EMPTY: 
+                        weights[j] = 0                                      # associate a weight 0
+                    else:
+                        print("Error 4 from class myGameLearning: bad tris configuration...[",j,from_status,to_status,"]")
                         quit()
-                    lessons.append((weights,destination_node_id))   # add the new lesson learnt (board pattern,move) to the list
-            return lessons                                          # return the list of all the lessons learnt
-
-        ####################################################################################
-        ### The local procedure "analyze_single_match_if_loose" works on the list of matches
-        ### only when the game ended with a winner.
-        ### The difference with the previous procedure is the point of view considered:
-        ### the strategy that the software is learning now is defensive (the target is 
-        ### not top loose.
-        ####################################################################################
-        def analyze_single_match_if_loose(match):
-            l = len(match)
-            if l != 10:     # the length of the match list has to be 10 otherwise error:
-                print("Error 6 from class myGameLearning: bad match [",match,"]")
-                quit()
-            player = match[0]   # the first position of the match list is the first player
-            lessons = list()    # Initialize the list of the lesson learnt
-            # set some parameters to process the lessons learned:
-            if player == CIRCLE:
-                idx_start = 1
-                myexp = 1
-            elif player == STAR:
-                idx_start = 2
-                myexp = 0
-            else:
-                print("Error 7 from class myGameLearning: bad player...[",player,"]")
-                quit()
-            # Evaluate the final status of the board after playing accordingly with the list of the match:
-            final_status = [EMPTY for i in range(9)]
-            for i in range(1,10):
+                if destination_node_id < 0:     # if the destination node ID is not good an error occurred:
+                    print("Error 5 from class myGameLearning: bad destination node id...[",destination_node_id,"]")
+                    quit()
+                lessons.append((weights,destination_node_id))   # add the new lesson learnt (board pattern,move) to the list
+        return lessons                                          # return the list of all the lessons learnt
+
+    ####################################################################################
+    ### The myGameLearning method "analyze_single_match_if_loose" works on the list of matches
+    ### only when the game ended with a winner.
+    ### The difference with the previous procedure is the point of view considered:
+    ### the strategy that the software is learning now is defensive (the target is 
+    ### not top loose.
+    ####################################################################################
+    def analyze_single_match_if_loose(self,match):
+        l = len(match)
+        if l != 10:     # the length of the match list has to be 10 otherwise error:
+            print("Error 6 from class myGameLearning: bad match [",match,"]")
+            quit()
+        player = match[0]   # the first position of the match list is the first player
+        lessons = list()    # Initialize the list of the lesson learnt
+        # set some parameters to process the lessons learned:
+        if player == CIRCLE:
+            idx_start = 1
+            myexp = 1
+        elif player == STAR:
+            idx_start = 2
+            myexp = 0
+        else:
+            print("Error 7 from class myGameLearning: bad player...[",player,"]")
+            quit()
+        # Evaluate the final status of the board after playing accordingly with the list of the match:
+        final_status = [EMPTY for i in range(9)]
+        for i in range(1,10):
+            if match[i] != None:
+                final_status[match[i]] = (-1)**(i-myexp)
+        tris_check = self.get_tris()                        # use the class myTris to work on the board and
+        (reason,_,_) = tris_check.respond(final_status)     # evaluate the final status of the board after the match
+        if reason != "human_victory":
+            print("Error 8 from class myGameLearning: bad match final reason...[",match,reason,"]")
+            quit()
+        # if here the response from myTris class is that the board (at the end of the match) describes a user victory
+        for idx in range(idx_start,9,2):
+            # analyze every move of the game and get evolution patterns to remember (something like rules or strategies:
+            from_status = [EMPTY for i in range(9)]
+            for i in range(1,idx):
                 if match[i] != None:
-                    final_status[match[i]] = (-1)**(i-myexp)
-            tris_check = myTris(verbose = False)                # use the class myTris to work on the board and
-            (reason,_,_) = tris_check.respond(final_status)     # evaluate the final status of the board after the match
-            if reason != "human_victory":
-                print("Error 8 from class myGameLearning: bad match final reason...[",match,reason,"]")
-                quit()
-            # if here the response from myTris class is that the board (at the end of the match) describes a user victory
-            for idx in range(idx_start,9,2):
-                # analyze every move of the game and get evolution patterns to remember (something like rules or strategies:
-                from_status = [EMPTY for i in range(9)]
-                for i in range(1,idx):
-                    if match[i] != None:
-                        from_status[match[i]] = (-1)**(i-myexp)     # define the starting status
-                to_status = [EMPTY for i in range(9)]
-                for i in range(1,idx+1):
-                    if match[i] != None:
-                        to_status[match[i]] = (-1)**(i-myexp)       # define the target status
-                tris = myTris(verbose = False)                      # use the class myTris to evaluate the board and
-                (reason,_,to_status_evaluated) = tris.respond(from_status)  # evaluate the final status of the board after the match
-                if to_status_evaluated == to_status or reason == "random_attack":
-                    # if myTris class doesn't know how to make a move or if it made a move for loosing
-                    # it is possible to create a strategy for defense avoiding the move:
-                    weights = [0 for i in range(9)]         # Initialize the list of weights
-                    acc = 0                                 # Initialize the counter of the non EMPTY cells that didn't change
-                    for j in range(9):
-                        if from_status[j] == to_status[j]:
-                            if from_status[j] != EMPTY:
-                                acc += 1
-                    destination_node_id = -1                # Initialize the destination node ID with an impossible value
-                                                            # (IDs can be 0 or positive, not negative)
-                    for j in range(9):
-                        if from_status[j] == CIRCLE and to_status[j] == CIRCLE:     # no status change for CIRCLE: 
-                            weights[j] = 1/acc                                      # associate a positive weight 1/acc
-                        elif from_status[j] == STAR and to_status[j] == STAR:       # no status change for STAR: 
-                            weights[j] = -1/acc                                     # associate a negative weight -1/acc
-                        elif from_status[j] == EMPTY and to_status[j] != EMPTY:     # status change from EMPTY to non EMPTY:
-                            # find a different destination node ID than the one that is described by the match, that for avoiding loosing:
-                            available_cells = list()                        # find the EMPTY board cell list (not considering the cell j)
-                            for j1 in range(9):
-                                if from_status[j1] == EMPTY and j1 != j:
-                                    available_cells.append(j1)
-                            if available_cells != []:                       # if there are EMPTY cells:
-                                random.shuffle(available_cells)             # randomize the order of the EMPTY cell list
-                                destination_node_id = available_cells[0]    # find a new random destination node ID for the move
-                        elif from_status[j] == EMPTY and to_status[j] == EMPTY:     # no status change for EMPTY:
-                            weights[j] = 0                                          # associate a weight 0
-                        else:
-                            print("Error 9 from class myGameLearning: bad tris configuration...[",j,from_status,to_status,"]")
-                            quit()
-                    if destination_node_id >= 0:                        # if the destination node ID is good:
-                        lessons.append((weights,destination_node_id))   # add the new lesson learnt to the list  
-            return lessons                                              # return the list of all the lessons learnt
-
-        ##############################################################################
-        ### The local procedure "save_to_file" saves the lessons learnt (all of them,
-        ### existing and new) to a text file.
-        ##############################################################################
-        def save_to_file(lessons_learnt,my_kb_file_name):
-            print("Saving lessons-learnt to output file [",my_kb_file_name,"]...",end="")
-            counter = 0
-            with open(my_kb_file_name, 'wt') as my_file_handler:
-                for (w,j) in lessons_learnt:
-                    for val in w:
-                        my_file_handler.write("{}\n".format(str(val)))
-                    my_file_handler.write("{}\n".format(str(j)))
-                    counter += 1
-                my_file_handler.close()
-            print("done.")
-            print("Nr",counter," rules stored.")
-
-        ##############################################################################
-        ### The local procedure "load_from_file" load all the already defined lessons  
-        ### learnt rules from an existing text file.
-        ##############################################################################
-        def load_from_file(my_kb_file_name):
-            cleaned_list = list()
-            if os.path.exists(my_kb_file_name):
-                print("Loading lessons-learnt knowledge base from file [",my_kb_file_name,"]...",end="")
-                with open(my_kb_file_name, 'rt') as my_file_handler:
-                    counter = 0
-                    val_list = list()
-                    while True:
-                        for i in range(9):
-                            r = my_file_handler.readline().strip()
-                            if not r:
-                                break 
-                            val_list.append(float(r))
-                        r = my_file_handler.readline().strip()
-                        if not r:
-                            break 
-                        cleaned_list.append((val_list,int(r)))
-                        val_list = list()
-                        counter += 1
-                    my_file_handler.close()
-                    print("done (",counter,"record loaded)")
-                    return cleaned_list
-            else:
-                return [] 
+                    from_status[match[i]] = (-1)**(i-myexp)     # define the starting status
+            to_status = [EMPTY for i in range(9)]
+            for i in range(1,idx+1):
+                if match[i] != None:
+                    to_status[match[i]] = (-1)**(i-myexp)       # define the target status
+            tris = self.get_tris()                              # use the class myTris to evaluate the board and
+            (reason,_,to_status_evaluated) = tris.respond(from_status)  # evaluate the final status of the board after the match
+            if to_status_evaluated == to_status or reason == "random_attack":
+                # if myTris class doesn't know how to make a move or if it made a move for loosing
+                # it is possible to create a strategy for defense avoiding the move:
+                weights = [0 for i in range(9)]         # Initialize the list of weights
+                acc = 0                                 # Initialize the counter of the non EMPTY cells that didn't change
+                for j in range(9):
+                    if from_status[j] == to_status[j]:
+                        if from_status[j] != EMPTY:
+                            acc += 1
+                destination_node_id = -1                # Initialize the destination node ID with an impossible value
+                                                        # (IDs can be 0 or positive, not negative)
+                for j in range(9):
+                    if from_status[j] == CIRCLE and to_status[j] == CIRCLE:     # no status change for CIRCLE: 
+                        weights[j] = 1/acc                                      # associate a positive weight 1/acc
+                    elif from_status[j] == STAR and to_status[j] == STAR:       # no status change for STAR: 
+                        weights[j] = -1/acc                                     # associate a negative weight -1/acc
+                    elif from_status[j] == EMPTY and to_status[j] != EMPTY:     # status change from EMPTY to non EMPTY:
+                        # find a different destination node ID than the one that is described by the match, that for avoiding loosing:
+                        available_cells = list()                        # find the EMPTY board cell list (not considering the cell j)
+                        for j1 in range(9):
+                            if from_status[j1] == EMPTY and j1 != j:
+                                available_cells.append(j1)
+                        if available_cells != []:                       # if there are EMPTY cells:
+                            random.shuffle(available_cells)             # randomize the order of the EMPTY cell list
+                            destination_node_id = available_cells[0]    # find a new random destination node ID for the move
+                    elif from_status[j] == EMPTY and to_status[j] == EMPTY:     # no status change for EMPTY:
+                        weights[j] = 0                                          # associate a weight 0
+                    else:
+                        print("Error 9 from class myGameLearning: bad tris configuration...[",j,from_status,to_status,"]")
+                        quit()
+                if destination_node_id >= 0:                        # if the destination node ID is good:
+                    lessons.append((weights,destination_node_id))   # add the new lesson learnt to the list  
+        return lessons                                              # return the list of all the lessons learnt
+
+    ##############################################################################
+    ### The myGameLearning method "save_to_file" saves the lessons learnt (all of them,
+    ### existing and new) to a text file.
+    ##############################################################################
+    def save_to_file(self,lessons_learnt,my_kb_file_name,verbose = True):
+        if verbose: print("Saving lessons-learnt to output file [",my_kb_file_name,"]...",end="")
+        if not isinstance(lessons_learnt,myLessonsLearntKnowledgeBase):
+            lessons_learnt = myLessonsLearntKnowledgeBase(lessons_learnt)
+        counter = lessons_learnt.save(my_kb_file_name)
+        if verbose: print("done.")
+        if verbose: print("Nr",counter," rules stored.")
+
+    ##############################################################################
+    ### The myGameLearning method "load_from_file" load all the already defined lessons  
+    ### learnt rules from an existing text file into a knowledge base (without repetitions).
+    ##############################################################################
+    def load_from_file(self,my_kb_file_name,verbose = True):
+        knowledge_base = myLessonsLearntKnowledgeBase(canonical = self.symmetric_lessons)
+        if lessons_learnt_file_exists(my_kb_file_name):
+            if verbose: print("Loading lessons-learnt knowledge base from file [",my_kb_file_name,"]...",end="")
+            counter = knowledge_base.load(my_kb_file_name)
+            if verbose: print("done (",counter,"record loaded)")
+        return knowledge_base
 
+    ##############################################################################
+    ### The myGameLearning method "get_knowledge_base" returns the knowledge base of
+    ### a file as loaded by "load_from_file", and keeps it: the file is read again
+    ### only when its signature or the one of its journal (size and time of the last
+    ### change, see function "lessons_learnt_file_signature") is changed.
+    ##############################################################################
+    def get_knowledge_base(self,my_kb_file_name,verbose = True):
+        signature = lessons_learnt_file_signature(my_kb_file_name)   # taken before reading: a later change is seen next time
+        if my_kb_file_name in self.knowledge_bases:
+            (known_signature,knowledge_base) = self.knowledge_bases[my_kb_file_name]
+            if known_signature == signature:
+                return knowledge_base
+        knowledge_base = self.load_from_file(my_kb_file_name,verbose)
+        self.knowledge_bases[my_kb_file_name] = (signature,knowledge_base)
+        return knowledge_base
+
+    ##############################################################################
+    ### The myGameLearning method "keep_knowledge_base" records a knowledge base just
+    ### written to a file (see "get_knowledge_base"), with the new signature of the file.
+    ##############################################################################
+    def keep_knowledge_base(self,knowledge_base,my_kb_file_name):
+        self.knowledge_bases[my_kb_file_name] = (lessons_learnt_file_signature(my_kb_file_name),knowledge_base)
+
+    ##############################################################################
+    ### The myGameLearning method "update_knowledge_base" mixes new lessons with the
+    ### ones of a knowledge base file, without repetitions, and returns the resulting
+    ### knowledge base. With "use_journal" only the new lessons are appended to the
+    ### journal of the file, which is compacted into the file once it is big enough,
+    ### otherwise the whole file is written again. The knowledge base is kept for the
+    ### next updates (see "get_knowledge_base").
+    ##############################################################################
+    def update_knowledge_base(self,new_lessons,my_kb_file_name,verbose = True):
+        knowledge_base = self.get_knowledge_base(my_kb_file_name,verbose)
+        if self.use_journal:
+            counter = knowledge_base.append(my_kb_file_name,new_lessons)
+            if verbose: print("Nr",counter,"new rules appended to the journal [",my_kb_file_name+LESSONS_JOURNAL_SUFFIX,"].")
+            if knowledge_base.journal_records >= LESSONS_JOURNAL_COMPACTION_THRESHOLD:
+                if verbose: print("Compacting the journal into the file [",my_kb_file_name,"]...",end="")
+                counter = knowledge_base.compact(my_kb_file_name)
+                if verbose: print("done (",counter,"rules stored).")
+        else:
+            knowledge_base.add_all(new_lessons)
+            self.save_to_file(knowledge_base,my_kb_file_name,verbose)
+        self.keep_knowledge_base(knowledge_base,my_kb_file_name)
+        return knowledge_base
+
+    ########################################################################
+    ### The myGameLearning method "analyze_my_match" works on game history
+    ### to define lessons learned that will be stored in 3 text files.
+    ########################################################################
+    def analyze_my_match(self,match,match_status):
         if match_status == "win":
             # evaluates the learnt lessons from a match from the winner point of view:
-            cleaned_list_for_winning = load_from_file("mytris.lessonslearnt_win.txt")       # get the lessons from the file
-            self.lessons_learnt_for_winning = list()
-            self.lessons_learnt_for_winning += analyze_single_match_if_win_or_tie(match)    # get the new lessons from the match
-            for x in self.lessons_learnt_for_winning:                                       # mix them without repetitions
-                if not x in cleaned_list_for_winning:
-                    cleaned_list_for_winning.append(x)
-            self.lessons_learnt_for_winning = cleaned_list_for_winning
+            self.lessons_learnt_for_winning = self.analyze_single_match_if_win_or_tie(match)    # get the new lessons from the match
             print("Updating lessons learnt for winning:")
-            save_to_file(self.lessons_learnt_for_winning,"mytris.lessonslearnt_win.txt")    # save all the lessons to the same file
-                    
+            # mix them without repetitions with the lessons in the file and store the new ones:
+            self.lessons_learnt_for_winning = self.update_knowledge_base(self.lessons_learnt_for_winning,LESSONS_LEARNT_WIN_FILE).get_lessons()
+
         elif match_status == "tie":
             # evaluates the learnt lessons from a match from the tie point of view:
-            cleaned_list_for_tie = load_from_file("mytris.lessonslearnt_tie.txt")       # get the lessons from the file
-            self.lessons_learnt_for_tie = list()
-            self.lessons_learnt_for_tie += analyze_single_match_if_win_or_tie(match)    # get the new lessons from the match
-            for x in self.lessons_learnt_for_tie:                                       # mix them without repetitions
-                if not x in cleaned_list_for_tie:
-                    cleaned_list_for_tie.append(x)
-            self.lessons_learnt_for_tie = cleaned_list_for_tie
+            self.lessons_learnt_for_tie = self.analyze_single_match_if_win_or_tie(match)        # get the new lessons from the match
             print("Updating lessons learnt for tie:")
-            save_to_file(self.lessons_learnt_for_tie,"mytris.lessonslearnt_tie.txt")    # save all the lessons to the same file
+            # mix them without repetitions with the lessons in the file and store the new ones:
+            self.lessons_learnt_for_tie = self.update_knowledge_base(self.lessons_learnt_for_tie,LESSONS_LEARNT_TIE_FILE).get_lessons()
 
         elif match_status == "loose":
             # evaluates the learnt lessons from a match from the looser point of view:
-            cleaned_list_for_not_loosing = load_from_file("mytris.lessonslearnt_not_loose.txt")     # get the lessons from the file
-            self.lessons_learnt_for_not_loosing = list()
-            self.lessons_learnt_for_not_loosing += analyze_single_match_if_loose(match)             # get the new lessons from the match
-            for x in self.lessons_learnt_for_not_loosing:                                           # mix them without repetitions
-                if not x in cleaned_list_for_not_loosing:
-                    cleaned_list_for_not_loosing.append(x)
-            self.lessons_learnt_for_not_loosing = cleaned_list_for_not_loosing
+            self.lessons_learnt_for_not_loosing = self.analyze_single_match_if_loose(match)     # get the new lessons from the match
             print("Updating lessons learnt for not loosing:")
-            save_to_file(self.lessons_learnt_for_not_loosing,"mytris.lessonslearnt_not_loose.txt")  # save all the lessons to the same file
-            
+            # mix them without repetitions with the lessons in the file and store the new ones:
+            self.lessons_learnt_for_not_loosing = self.update_knowledge_base(self.lessons_learnt_for_not_loosing,LESSONS_LEARNT_NOT_LOOSE_FILE).get_lessons()
+
         else:
             print("Error 10 from class myGameLearning: bad match status...[",match_status,"]")
             quit()
 
+    ########################################################################
+    ### The myGameLearning method "learn_match" learns all the lessons of a
+    ### finished match (see "get_match_lessons") and stores them in the 3
+    ### knowledge base files. It returns the dictionary: match status
+    ### ("win","tie","loose") -> number of lessons, or None if the match is
+    ### not complete and legal.
+    ########################################################################
+    def learn_match(self,match,verbose = True):
+        lessons = self.get_match_lessons(match)
+        if lessons is None:
+            return None
+        for (key,my_kb_file_name) in (("win",LESSONS_LEARNT_WIN_FILE),("tie",LESSONS_LEARNT_TIE_FILE),("loose",LESSONS_LEARNT_NOT_LOOSE_FILE)):
+            if lessons[key] != []:
+                self.update_knowledge_base(lessons[key],my_kb_file_name,verbose)
+        return {key:len(lessons[key]) for key in lessons}
+
+    ########################################################################
+    ### The myGameLearning method "parse_match" converts a line of a match
+    ### archive into a match list. A line has 10 comma separated values:
+    ### the first player (1 = CIRCLE, the computer, or -1 = STAR, the user)
+    ### and the 9 cell IDs covered during the game (empty or None after the
+    ### end of the game), e.g. "1,0,4,3,5,7,8,1,2,6" or "-1,4,0,8,2,1,,,,".
+    ### It returns None if the line is not a match.
+    ########################################################################
+    def parse_match(self,line):
+        values = [v.strip() for v in line.strip().split(",")]
+        if len(values) != 10:
+            return None
+        try:
+            return [int(v) if v not in ("","None") else None for v in values]
+        except ValueError:
+            return None
+
+    ########################################################################
+    ### The myGameLearning method "format_match" converts a match list into
+    ### a line of a match archive (see "parse_match").
+    ########################################################################
+    def format_match(self,match):
+        return ",".join("" if v == None else str(v) for v in match)
+
+    ########################################################################
+    ### The myGameLearning method "get_match_result" replays a match list and
+    ### returns "win" if the last move made a tris, "tie" if it filled the
+    ### board, or None if the match is not a complete and legal game.
+    ########################################################################
+    def get_match_result(self,match):
+        if len(match) != 10 or match[0] not in (CIRCLE,STAR):
+            return None
+        board = myTrisBoard()
+        player = match[0]
+        for i in range(1,10):
+            cell = match[i]
+            if cell == None:
+                return None                 # the match stopped before the end of the game
+            if cell not in range(9) or board.cell(cell) != EMPTY:
+                return None                 # not a legal move
+            board = board.play(cell,player)
+            if board.winner() == player:
+                if any(v != None for v in match[i+1:]):
+                    return None             # moves after the end of the game
+                return "win"
+            player = -player
+        return "tie"
+
+    ########################################################################
+    ### The myGameLearning method "get_match_lessons" computes, without any
+    ### file access, all the lessons learnt from a complete match list (as
+    ### built by "play": the first value is the player that begins).
+    ### It returns the dictionary: match status ("win","tie","loose") ->
+    ### list of lessons, or None if the match is not complete and legal.
+    ### For a win, the match is learnt as a winning scheme from the point of
+    ### view of the winner and as a non loosing scheme from the point of
+    ### view of the looser, as "play" does.
+    ########################################################################
+    def get_match_lessons(self,match):
+        result = self.get_match_result(match)
+        if result is None:
+            return None
+        lessons = {"win":[],"tie":[],"loose":[]}
+        match = list(match)
+        if result == "win":
+            counter = 0
+            for i in range(1,10):           # counts values other than None in the list of the match
+                if match[i] != None:
+                    counter += 1
+            match[0] = STAR if (-1)**counter == 1 else CIRCLE       # the winner is CIRCLE
+            lessons["win"] = self.analyze_single_match_if_win_or_tie(match)
+            match[0] = CIRCLE if (-1)**counter == 1 else STAR       # the looser is CIRCLE
+            lessons["loose"] = self.analyze_single_match_if_loose(match)
+        else:
+            lessons["tie"] = self.analyze_single_match_if_win_or_tie(match)
+        return lessons
+
+    ########################################################################
+    ### The myGameLearning method "learn_from_match_archive" learns from a
+    ### whole archive of recorded matches: "archive" is the name of a file
+    ### with one match per line (see "parse_match") or any iterable of match
+    ### lists. The matches are analyzed in chunks of "chunk_size" by a pool
+    ### of "processes" worker processes (all the CPUs if None, no pool if 1),
+    ### with at most 2 chunks in flight for every process. The new lessons of
+    ### every chunk are merged without repetitions with the existing ones as
+    ### soon as the chunk is analyzed, and the 3 knowledge base files are
+    ### written once at the end.
+    ### The analysis chooses some destination cells at random: with "seed"
+    ### every chunk is analyzed with its own random seed (derived from "seed"
+    ### in the order of the archive), so that the lessons learnt can be
+    ### repeated with any number of processes. Without "seed" the chunks are
+    ### analyzed with the random state of this process, or with random seeds
+    ### in the worker processes.
+    ### Lines that are not complete and legal matches are skipped.
+    ### It returns the dictionary of the counters of the processed matches.
+    ########################################################################
+    def learn_from_match_archive(self,archive,processes = None,chunk_size = 500,seed = None,verbose = True):
+
+        def read_chunks():                  # split the archive in chunks of matches
+            if isinstance(archive,str):
+                with open(archive, 'rt') as my_file_handler:
+                    matches = (self.parse_match(line) for line in my_file_handler if line.strip() != "")
+                    yield from chunks_of(matches)
+            else:
+                yield from chunks_of(archive)
+
+        def chunks_of(matches):
+            chunk = list()
+            for match in matches:
+                chunk.append(match)
+                if len(chunk) == chunk_size:
+                    yield chunk
+                    chunk = list()
+            if chunk:
+                yield chunk
+
+        if seed is not None:
+            seeds = random.Random(seed)
+        elif processes != 1:
+            seeds = random.SystemRandom()   # the worker processes must not share the random state of this one
+        else:
+            seeds = None
+
+        def chunk_job(chunk):               # the arguments of the worker for a chunk
+            return (chunk,self.symmetric_lessons,seeds.randrange(2**32) if seeds is not None else None)
+
+        counters = {"matches":0,"skipped":0,"win":0,"tie":0,"loose":0}
+        knowledge_bases = dict()            # key -> knowledge base of the file, loaded when the first lessons arrive
+        my_kb_file_names = {"win":LESSONS_LEARNT_WIN_FILE,"tie":LESSONS_LEARNT_TIE_FILE,"loose":LESSONS_LEARNT_NOT_LOOSE_FILE}
+
+        def merge(chunk_lessons,chunk_counters):    # merge the results of a chunk, in the order of the archive
+            for key in counters:
+                counters[key] += chunk_counters[key]
+            for key in my_kb_file_names:
+                if chunk_lessons[key] != []:
+                    if key not in knowledge_bases:
+                        knowledge_bases[key] = self.load_from_file(my_kb_file_names[key],verbose)
+                    knowledge_bases[key].add_all(chunk_lessons[key])   # mix them without repetitions
+
+        if processes == 1:                  # analyze the matches in this process
+            for chunk in read_chunks():
+                merge(*analyze_matches_worker(chunk_job(chunk)))
+        else:                               # analyze the matches in a pool of worker processes
+            workers = processes if processes is not None else (os.cpu_count() or 1)
+            with concurrent.futures.ProcessPoolExecutor(max_workers = workers) as executor:
+                pending = collections.deque()   # chunks in flight, in the order of the archive
+                for chunk in read_chunks():
+                    pending.append(executor.submit(analyze_matches_worker,chunk_job(chunk)))
+                    if len(pending) >= 2*workers:
+                        merge(*pending.popleft().result())
+                while pending:
+                    merge(*pending.popleft().result())
+        if verbose: print("Analyzed",counters["matches"],"matches (",counters["skipped"],"skipped ).")
+        # save the knowledge bases with new lessons:
+        for (key,knowledge_base) in knowledge_bases.items():
+            counter = knowledge_base.compact(my_kb_file_names[key])    # write the file once, journal included
+            self.keep_knowledge_base(knowledge_base,my_kb_file_names[key])
+            if verbose: print("Nr",counter,"rules stored to file [",my_kb_file_names[key],"].")
+        return counters
+
+
+
+
+###################################################################################
+### Function "analyze_matches_worker" computes the lessons learnt from a chunk of
+### match lists (see myGameLearning.learn_from_match_archive). It is a function of
+### the module so that it can run in a worker process. "chunk" is (list of the
+### matches, "symmetric_lessons" of the myGameLearning that learns them, random
+### seed of the analysis or None to keep the random state of the process).
+### It returns (dictionary of the lists of lessons, dictionary of the counters).
+###################################################################################
+def analyze_matches_worker(chunk):
+    (matches,symmetric_lessons,seed) = chunk
+    if seed is not None:
+        random.seed(seed)
+    game_learning = myGameLearning(symmetric_lessons)
+    lessons = {"win":[],"tie":[],"loose":[]}
+    counters = {"matches":0,"skipped":0,"win":0,"tie":0,"loose":0}
+    for match in matches:
+        counters["matches"] += 1
+        match_lessons = None if match is None else game_learning.get_match_lessons(match)
+        if match_lessons is None:
+            counters["skipped"] += 1
+            continue
+        for key in lessons:
+            if match_lessons[key] != []:
+                counters[key] += 1
+            lessons[key] += match_lessons[key]
+    return (lessons,counters)
+
+
+
+
+
+### Classes for the players of the self-play (see class myTrisSelfPlay)
+#######################################################################
+### A player receives the board (myTrisBoard) from its own point of view (its
+### pieces are CIRCLE, the ones of the opponent are STAR) and returns the ID of
+### the cell of its move, or None if it is unable to move.
+class myTrisPlayer:
+
+    #ATTRIBUTES(myTrisPlayer):
+    ##########################
+    name = None                 # name of the player (used in the reports)
+    strategies = None           # dictionary: strategy label -> number of moves made by that strategy
+    last_strategy = None        # strategy label of the last move
+
+    #METHODS(myTrisPlayer):
+    #######################
+
+    def __init__(self,name):
+        self.name = name
+        self.strategies = {}
+
+    def move(self,board):
+        print("Error 1 from class myTrisPlayer: method \"move\" not implemented by [",self.name,"]")
+        quit()
+
+    def count_strategy(self,label):     # count the moves made by a strategy
+        self.strategies[label] = self.strategies.get(label,0) + 1
+        self.last_strategy = label
+
+
+### Player that moves in a random empty cell
+class myRandomPlayer(myTrisPlayer):
+
+    def __init__(self,name = "random"):
+        super().__init__(name)
+
+    def move(self,board):
+        cells = board.empty_cells()
+        if cells == []:
+            return None
+        self.count_strategy("random")
+        return random.choice(cells)
+
+
+### Player that never looses: it chooses at random among the best moves found by minimax
+class myPerfectPlayer(myTrisPlayer):
+
+    board_values = {}           # shared by all the instances: board (CIRCLE to move) -> value of the best move (1 win, 0 tie, -1 loss)
+
+    def __init__(self,name = "perfect"):
+        super().__init__(name)
+
+    def move_values(self,board):    # dictionary: empty cell -> value of the move for CIRCLE
+        values = {}
+        for c in board.empty_cells():
+            next_board = board.play(c,CIRCLE)
+            if next_board.winner() == CIRCLE:
+                values[c] = 1
+            elif next_board.is_full():
+                values[c] = 0
+            else:
+                values[c] = -self.board_value(next_board.flipped())   # the opponent moves on the flipped board
+        return values
+
+    def board_value(self,board):
+        value = self.board_values.get(board)
+        if value is None:
+            value = max(self.move_values(board).values())
+            self.board_values[board] = value
+        return value
+
+    def move(self,board):
+        values = self.move_values(board)
+        if values == {}:
+            return None
+        best = max(values.values())
+        self.count_strategy("perfect")
+        return random.choice([c for c in sorted(values) if values[c] == best])
+
+
+### Player that asks the perceptron network for its move: "tris" can be a myTrainedTris
+### (all the strategies of "get_computer_move") or a basic myTris (strategies of "respond").
+class myNetworkPlayer(myTrisPlayer):
+
+    tris = None                 # network used to choose the moves
+
+    def __init__(self,tris,name = None):
+        super().__init__(name if name is not None else type(tris).__name__)
+        self.tris = tris
+
+    def move(self,board):
+        if isinstance(self.tris,myTrainedTris):
+            self.tris.set_board(board)
+            self.tris.reset_all_but_the_board()
+            label = self.tris.get_computer_move(verbose = False)
+            to_board = self.tris.get_board()
+        else:
+            self.tris.reset_all_but_the_board()
+            (label,_,to_status) = self.tris.respond(board.to_status())
+            to_board = myTrisBoard.from_status(to_status)
+        new_cells = to_board.o_mask & ~board.o_mask        # the cell of the move is the new CIRCLE
+        if new_cells == 0:
+            return None
+        self.count_strategy(label)
+        return new_cells.bit_length()-1
+
+
+### Class for the headless self-play: two players play against each other, without
+### console I/O, and the finished matches are learnt by myGameLearning
+##################################################################################
+class myTrisSelfPlay:
+
+    #ATTRIBUTES(myTrisSelfPlay):
+    ############################
+    player_one = None           # first player (CIRCLE in the match lists)
+    player_two = None           # second player (STAR in the match lists)
+    game_learning = None        # myGameLearning used to learn the finished matches
+    matches = None              # list of the matches played and not learnt yet
+    match_strategies = None     # strategy labels used in the last match: "player_one"/"player_two" -> list of labels
+
+    #METHODS(myTrisSelfPlay):
+    #########################
+
+    def __init__(self,player_one,player_two,game_learning = None):
+        self.player_one = player_one
+        self.player_two = player_two
+        if game_learning is None:           # learn with the "symmetric_lessons" of the first trained player, if any
+            symmetric_lessons = True
+            for player in (player_one,player_two):
+                tris = getattr(player,"tris",None)
+                if isinstance(tris,myTrainedTris):
+                    symmetric_lessons = tris.symmetric_lessons
+                    break
+            game_learning = myGameLearning(symmetric_lessons)
+        self.game_learning = game_learning
+        self.matches = []
+
+    ####################################################################################
+    ### The myTrisSelfPlay method "play_match" plays a game, with "first" (CIRCLE or
+    ### STAR) making the first move. It returns (match list as built by "play", result)
+    ### where the result is "player_one", "player_two" or "tie".
+    ####################################################################################
+    def play_match(self,first = CIRCLE):
+        board = myTrisBoard()
+        match = [first]
+        turn = first
+        self.match_strategies = {"player_one":[],"player_two":[]}
+        for n in range(9):
+            if turn == CIRCLE:
+                cell = self.player_one.move(board)
+                self.match_strategies["player_one"].append(self.player_one.last_strategy)
+            else:
+                cell = self.player_two.move(board.flipped())    # the second player sees the board from its point of view
+                self.match_strategies["player_two"].append(self.player_two.last_strategy)
+            if cell is None or board.cell(cell) != EMPTY:
+                print("Error 1 from class myTrisSelfPlay: bad move [",cell,"] on board [",board,"]")
+                quit()
+            board = board.play(cell,turn)
+            match.append(cell)
+            if board.winner() == turn:
+                match += [None for i in range(9-n-1)]
+                return (match,"player_one" if turn == CIRCLE else "player_two")
+            turn = -turn
+        return (match,"tie")
+
+    ####################################################################################
+    ### The myTrisSelfPlay method "learn" feeds the matches played so far to
+    ### myGameLearning and then reloads the lessons learnt of the players that use
+    ### them, so that the next games are played with the new lessons. The seed of
+    ### the analysis comes from the random state of the games (see "run").
+    ####################################################################################
+    def learn(self,processes = 1,verbose = False):
+        if self.matches == []:
+            return None
+        counters = self.game_learning.learn_from_match_archive(self.matches,processes = processes,seed = random.randrange(2**32),verbose = verbose)
+        self.matches = []
+        reloaded = []
+        for player in (self.player_one,self.player_two):
+            tris = getattr(player,"tris",None)
+            if isinstance(tris,myTrainedTris) and not any(tris is t for t in reloaded):
+                tris.reload_lessons_learnt()
+                reloaded.append(tris)
+        return counters
+
+    ####################################################################################
+    ### The myTrisSelfPlay method "run" plays "number_of_games" games (the players
+    ### make the first move in turn). With "seed" the games can be repeated. If
+    ### "learn" is True, the matches are learnt every "learn_every" games and at the
+    ### end. If "archive_file_name" is given, the matches are also appended to that
+    ### archive (see myGameLearning.parse_match). It returns the dictionary of the
+    ### results, including the number of games per second.
+    ####################################################################################
+    def run(self,number_of_games,seed = None,learn = True,learn_every = 10000,processes = 1,archive_file_name = None,verbose = True):
+        if seed is not None:
+            random.seed(seed)
+        results = {"games":0,"player_one":0,"player_two":0,"tie":0,"learnt_matches":0}
+        archive = open(archive_file_name,'at') if archive_file_name is not None else None
+        start_time = time.perf_counter()
+        try:
+            for n in range(number_of_games):
+                (match,result) = self.play_match(CIRCLE if n % 2 == 0 else STAR)
+                results["games"] += 1
+                results[result] += 1
+                if archive is not None:
+                    archive.write(self.game_learning.format_match(match)+"\n")
+                if learn:
+                    self.matches.append(match)
+                    if learn_every is not None and len(self.matches) >= learn_every:
+                        results["learnt_matches"] += len(self.matches)
+                        self.learn(processes)
+                if verbose and (n+1) % 10000 == 0:
+                    print("Played",n+1,"games:",round((n+1)/(time.perf_counter()-start_time)),"games per second.")
+            if learn:
+                results["learnt_matches"] += len(self.matches)
+                self.learn(processes)
+        finally:
+            if archive is not None:
+                archive.close()
+        results["seconds"] = time.perf_counter()-start_time
+        results["games_per_second"] = results["games"]/results["seconds"] if results["seconds"] > 0 else 0.0
+        if verbose:
+            print("Games:",results["games"],"-",self.player_one.name,"won",results["player_one"],"-",
+                  self.player_two.name,"won",results["player_two"],"- tie",results["tie"])
+            print("Games per second:",round(results["games_per_second"]),"( learnt matches:",results["learnt_matches"],")")
+        return results
+
+
+### Class for the tournaments: the games between two kinds of players (see function
+### "get_self_play_player") are split in shards and played by a pool of worker
+### processes, each one with its own players (networks included) built once and
+### reused for all its games. The results are aggregated by the main process.
+###################################################################################
+class myTrisTournament:
+
+    #ATTRIBUTES(myTrisTournament):
+    ##############################
+    player_one_kind = None      # kind of the first player ("trained", "basic", "random" or "perfect")
+    player_two_kind = None      # kind of the second player
+    processes = None            # number of worker processes (all the CPUs if None, no pool if 1)
+    symmetric_lessons = None    # "symmetric_lessons" of the trained players and of the learning (see myTrainedTris)
+
+    #METHODS(myTrisTournament):
+    ###########################
+
+    def __init__(self,player_one_kind = "trained",player_two_kind = "trained",processes = None,symmetric_lessons = True):
+        self.player_one_kind = player_one_kind
+        self.player_two_kind = player_two_kind
+        self.processes = processes
+        self.symmetric_lessons = symmetric_lessons
+
+    ####################################################################################
+    ### The myTrisTournament method "run" plays "number_of_games" games in shards of
+    ### "games_per_shard" games. Every shard has its own random seed (derived from
+    ### "seed", if given, so that the tournament can be repeated with any number of
+    ### processes). If "learn" is True the matches are learnt at the end, with a
+    ### seed of the analysis derived in the same way.
+    ### It returns the dictionary of the results: the counters of the games and, in
+    ### "strategies", for every player and every strategy label the number of games
+    ### won, tied and lost by the player using that strategy at least once.
+    ####################################################################################
+    def run(self,number_of_games,seed = None,games_per_shard = 1000,learn = False,verbose = True):
+        seeds = random.Random(seed) if seed is not None else random.SystemRandom()
+        shards = []
+        for first_game in range(0,number_of_games,games_per_shard):
+            shards.append((first_game,min(games_per_shard,number_of_games-first_game),seeds.randrange(2**32),learn))
+        start_time = time.perf_counter()
+        if self.processes == 1:             # play the games in this process
+            tournament_worker_initializer(self.player_one_kind,self.player_two_kind,self.symmetric_lessons)
+            outcomes = map(tournament_worker,shards)
+            executor = None
+        else:                               # play the games in a pool of worker processes
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers = self.processes,initializer = tournament_worker_initializer,
+                                                              initargs = (self.player_one_kind,self.player_two_kind,self.symmetric_lessons))
+            outcomes = executor.map(tournament_worker,shards)
+        results = {"games":0,"player_one":0,"player_two":0,"tie":0,"strategies":{"player_one":{},"player_two":{}}}
+        matches = []
+        try:
+            for (shard_results,shard_matches) in outcomes:
+                for key in ("games","player_one","player_two","tie"):
+                    results[key] += shard_results[key]
+                for player in ("player_one","player_two"):
+                    for (label,counters) in shard_results["strategies"][player].items():
+                        total = results["strategies"][player].setdefault(label,{"win":0,"tie":0,"loss":0})
+                        for key in total:
+                            total[key] += counters[key]
+                matches += shard_matches
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        results["seconds"] = time.perf_counter()-start_time
+        results["games_per_second"] = results["games"]/results["seconds"] if results["seconds"] > 0 else 0.0
+        if learn:
+            myGameLearning(self.symmetric_lessons).learn_from_match_archive(matches,processes = self.processes,seed = seeds.randrange(2**32),verbose = verbose)
+        if verbose:
+            self.show(results)
+        return results
+
+    ####################################################################################
+    ### The myTrisTournament method "show" prints the results returned by "run".
+    ####################################################################################
+    def show(self,results):
+        print("Games:",results["games"],"-",self.player_one_kind,"won",results["player_one"],"-",
+              self.player_two_kind,"won",results["player_two"],"- tie",results["tie"])
+        print("Games per second:",round(results["games_per_second"]))
+        for (player,kind) in (("player_one",self.player_one_kind),("player_two",self.player_two_kind)):
+            for (label,counters) in sorted(results["strategies"][player].items()):
+                print(" ",player,"(",kind,")",label,": win",counters["win"],"- tie",counters["tie"],"- loss",counters["loss"])
+
+
+tournament_worker_self_play = None      # players of the worker process (see function "tournament_worker_initializer")
+
+###################################################################################
+### Function "tournament_worker_initializer" builds the players of a tournament
+### worker process, once for all the shards played by the process.
+###################################################################################
+def tournament_worker_initializer(player_one_kind,player_two_kind,symmetric_lessons = True):
+    global tournament_worker_self_play
+    tournament_worker_self_play = myTrisSelfPlay(get_self_play_player(player_one_kind,symmetric_lessons),
+                                                 get_self_play_player(player_two_kind,symmetric_lessons))
+
+###################################################################################
+### Function "tournament_worker" plays a shard (first game index, number of games,
+### random seed, keep the matches) of a tournament (see myTrisTournament.run).
+### It returns (dictionary of the results, list of the matches or []).
+###################################################################################
+def tournament_worker(shard):
+    (first_game,number_of_games,seed,keep_matches) = shard
+    self_play = tournament_worker_self_play
+    random.seed(seed)
+    results = {"games":0,"player_one":0,"player_two":0,"tie":0,"strategies":{"player_one":{},"player_two":{}}}
+    matches = []
+    for n in range(first_game,first_game+number_of_games):
+        (match,result) = self_play.play_match(CIRCLE if n % 2 == 0 else STAR)   # the players make the first move in turn
+        results["games"] += 1
+        results[result] += 1
+        for player in ("player_one","player_two"):
+            if result == "tie":
+                outcome = "tie"
+            else:
+                outcome = "win" if result == player else "loss"
+            for label in set(self_play.match_strategies[player]):
+                counters = results["strategies"][player].setdefault(label,{"win":0,"tie":0,"loss":0})
+                counters[outcome] += 1
+        if keep_matches:
+            matches.append(match)
+    return (results,matches)
+
+
+###################################################################################
+### Function "get_self_play_player" returns the player named "kind": "trained"
+### (myTrainedTris, with "symmetric_lessons"), "basic" (myTris), "random" or "perfect".
+###################################################################################
+def get_self_play_player(kind,symmetric_lessons = True):
+    if kind == "trained":
+        return myNetworkPlayer(myTrainedTris(verbose = False,symmetric_lessons = symmetric_lessons),"trained")
+    if kind == "basic":
+        return myNetworkPlayer(myTris(verbose = False),"basic")
+    if kind == "random":
+        return myRandomPlayer()
+    if kind == "perfect":
+        return myPerfectPlayer()
+    print("Error 1 from function get_self_play_player: bad player [",kind,"]")
+    quit()
+
+
+
+
+### Class for the game server: an asyncio server (TCP or Unix socket) that hosts many
+### concurrent matches between users and a single shared myTrainedTris. Every connection
+### is a session with its own board; the network is only used through "compute_move",
+### which does not change its state. The finished matches that the users allow to learn
+### are queued and learnt in batches by a background task, then the lessons are reloaded.
+###
+### Line protocol (one command per line, one reply per line):
+###   NEW [user|computer]   start a new match (the user begins by default)
+###                         -> "OK <board>" or, if the computer begins, its move (see MOVE)
+###   MOVE <cell>           the user (X) sets the cell 0-8
+###                         -> "MOVE <cell> <strategy> <status> <board>" (computer's answer)
+###                         or "END <status> <board>" if the move of the user ended the match
+###   BOARD                 -> "BOARD <board> <status>"
+###   LEARN                 queue the finished match for learning -> "OK queued"
+###   QUIT                  -> "BYE" and the connection is closed
+### <board> is made of the 9 cells from the top row: "O" computer, "X" user, "_" empty.
+### <status> is "in_progress", "computer_victory", "human_victory" or "tie".
+### A bad command gets "ERROR <message>".
+#########################################################################################
+class myTrisServer:
+
+    #ATTRIBUTES(myTrisServer):
+    ##########################
+    tris = None                 # shared game (myTrainedTris) used to compute the moves of the computer
+    learn_batch_size = None     # max number of matches learnt together
+    learn_interval = None       # max seconds a queued match waits for the other matches of its batch
+    learning_queue = None       # queue (asyncio.Queue) of the finished matches to learn
+    learning_task = None        # background task that learns the queued matches
+    server = None               # asyncio server
+    counters = None             # dictionary of the counters: "sessions", "matches", "moves", "learnt_matches"
+
+    #METHODS(myTrisServer):
+    #######################
+
+    def __init__(self,tris = None,learn_batch_size = 100,learn_interval = 5.0):
+        self.tris = tris if tris is not None else myTrainedTris(verbose = False)
+        self.learn_batch_size = learn_batch_size
+        self.learn_interval = learn_interval
+        self.counters = {"sessions":0,"matches":0,"moves":0,"learnt_matches":0}
+
+    ####################################################################################
+    ### The myTrisServer method "start" starts listening on a TCP "port" of "host", or
+    ### on the Unix socket "path" if given, and starts the background learning.
+    ### It returns the asyncio server (e.g. to know the port when "port" is 0).
+    ####################################################################################
+    async def start(self,host = "127.0.0.1",port = 8765,path = None):
+        self.learning_queue = asyncio.Queue()
+        self.learning_task = asyncio.ensure_future(self.learning_loop())
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_session,path = path)
+        else:
+            self.server = await asyncio.start_server(self.handle_session,host,port)
+        return self.server
+
+    ####################################################################################
+    ### The myTrisServer method "close" stops listening, learns the matches still in
+    ### the queue and stops the background learning.
+    ####################################################################################
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self.learning_queue.put_nowait(None)    # the background learning ends after the matches in the queue
+        await self.learning_task
+
+    ####################################################################################
+    ### The myTrisServer method "handle_session" serves a connection: it reads the
+    ### commands, one per line, and writes the replies until QUIT or disconnection.
+    ####################################################################################
+    async def handle_session(self,reader,writer):
+        self.counters["sessions"] += 1
+        session = {"board":myTrisBoard(),"match":None,"status":None,"learnt":False}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = self.execute(session,line.decode(errors = "replace").strip())
+                writer.write((reply+"\n").encode())
+                await writer.drain()
+                if reply == "BYE":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    ####################################################################################
+    ### The myTrisServer method "execute" runs a command of a session and returns the
+    ### reply (see the line protocol of the class).
+    ####################################################################################
+    def execute(self,session,command):
+        words = command.split()
+        if words == []:
+            return "ERROR empty command"
+        verb = words[0].upper()
+        if verb == "NEW":
+            first = words[1].lower() if len(words) > 1 else "user"
+            if first not in ("user","computer"):
+                return "ERROR bad first player [ "+first+" ]"
+            session["board"] = myTrisBoard()
+            session["match"] = [STAR if first == "user" else CIRCLE]    # first value: the player that begins (as in "play")
+            session["status"] = "in_progress"
+            session["learnt"] = False
+            self.counters["matches"] += 1
+            if first == "computer":
+                return self.computer_move(session)
+            return "OK "+session["board"].to_text()
+        if verb == "MOVE":
+            if session["status"] != "in_progress":
+                return "ERROR no match in progress"
+            try:
+                cell = int(words[1])
+            except (IndexError,ValueError):
+                return "ERROR bad cell"
+            if cell < 0 or cell > 8 or session["board"].cell(cell) != EMPTY:
+                return "ERROR cell "+str(cell)+" is not available"
+            session["board"] = session["board"].play(cell,STAR)
+            session["match"].append(cell)
+            self.counters["moves"] += 1
+            if session["board"].winner() == STAR:
+                session["status"] = "human_victory"
+            elif session["board"].is_full():
+                session["status"] = "tie"
+            if session["status"] != "in_progress":
+                return "END "+session["status"]+" "+session["board"].to_text()
+            return self.computer_move(session)
+        if verb == "BOARD":
+            return "BOARD "+session["board"].to_text()+" "+str(session["status"])
+        if verb == "LEARN":
+            if session["status"] not in ("computer_victory","human_victory","tie"):
+                return "ERROR the match is not finished"
+            if session["learnt"]:
+                return "ERROR the match is already queued"
+            match = session["match"]+[None for i in range(10-len(session["match"]))]
+            self.learning_queue.put_nowait(match)
+            session["learnt"] = True
+            return "OK queued"
+        if verb == "QUIT":
+            return "BYE"
+        return "ERROR unknown command [ "+words[0]+" ]"
+
+    def computer_move(self,session):    # the computer moves on the board of the session and the reply is returned
+        result = self.tris.compute_move(session["board"],CIRCLE)
+        if result["move"] is None:
+            return "ERROR "+result["strategy"]
+        session["board"] = result["board"]
+        session["match"].append(result["move"])
+        self.counters["moves"] += 1
+        session["status"] = {"victory":"computer_victory","tie":"tie"}.get(result["status"],"in_progress")
+        return "MOVE {} {} {} {}".format(result["move"],result["strategy"],session["status"],session["board"].to_text())
+
+    ####################################################################################
+    ### The myTrisServer method "learning_loop" is the background task that waits for
+    ### the finished matches and learns them in batches: a batch is learnt when it
+    ### has "learn_batch_size" matches or its first match has waited "learn_interval"
+    ### seconds. A None in the queue (see "close") ends the task.
+    ####################################################################################
+    async def learning_loop(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            match = await self.learning_queue.get()
+            if match is None:
+                return
+            matches = [match]
+            deadline = loop.time()+self.learn_interval
+            while len(matches) < self.learn_batch_size:
+                try:
+                    match = await asyncio.wait_for(self.learning_queue.get(),max(deadline-loop.time(),0))
+                except asyncio.TimeoutError:
+                    break
+                if match is None:
+                    await self.learn(matches)
+                    return
+                matches.append(match)
+            await self.learn(matches)
+
+    ####################################################################################
+    ### The myTrisServer method "learn" learns a batch of matches and reloads the lessons
+    ### learnt into a clone of the shared game, both in a thread so that the sessions are
+    ### served in the meantime by the shared game. Then the clone, with the new lessons,
+    ### replaces the shared game.
+    ####################################################################################
+    async def learn(self,matches):
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None,lambda: myGameLearning(self.tris.symmetric_lessons).learn_from_match_archive(matches,processes = 1,verbose = False))
+        tris = self.tris.clone()            # the clone changes its own copy of the network (see myPerceptronNetwork.truncate)
+        await loop.run_in_executor(None,lambda: tris.reload_lessons_learnt(verbose = False))
+        self.tris = tris
+        self.counters["learnt_matches"] += len(matches)
+
+
+### Stand-in client of myTrisServer (see the line protocol of the server)
+#########################################################################
+class myTrisClient:
+
+    #ATTRIBUTES(myTrisClient):
+    ##########################
+    reader = None               # asyncio stream of the replies
+    writer = None               # asyncio stream of the commands
+
+    #METHODS(myTrisClient):
+    #######################
+
+    async def connect(self,host = "127.0.0.1",port = 8765,path = None):
+        if path is not None:
+            (self.reader,self.writer) = await asyncio.open_unix_connection(path)
+        else:
+            (self.reader,self.writer) = await asyncio.open_connection(host,port)
+
+    async def command(self,command):    # send a command and return the reply
+        self.writer.write((command+"\n").encode())
+        await self.writer.drain()
+        return (await self.reader.readline()).decode().strip()
+
+    async def close(self):
+        await self.command("QUIT")
+        self.writer.close()
+
+    ####################################################################################
+    ### The myTrisClient method "play_random_match" plays a match with random moves
+    ### and, if "learn" is True, asks the server to learn it. It returns the final
+    ### status of the match.
+    ####################################################################################
+    async def play_random_match(self,first = "user",learn = False):
+        reply = (await self.command("NEW "+first)).split()
+        while True:
+            board = myTrisBoard.from_text(reply[-1])
+            if reply[0] == "END" or (reply[0] == "MOVE" and reply[3] != "in_progress"):
+                status = reply[1] if reply[0] == "END" else reply[3]
+                break
+            if reply[0] == "ERROR":
+                return None
+            reply = (await self.command("MOVE "+str(random.choice(board.empty_cells())))).split()
+        if learn:
+            await self.command("LEARN")
+        return status
+
+
+###################################################################################
+### Function "serve" runs myTrisServer until it is interrupted (see the line
+### protocol of the server): on TCP "port" of "host" or on the Unix socket "path".
+###################################################################################
+def serve(host = "127.0.0.1",port = 8765,path = None,verbose = True):
+
+    async def main():
+        server = myTrisServer()
+        await server.start(host,port,path)
+        if verbose: print("Serving myTris on",path if path is not None else host+":"+str(port),"...")
+        try:
+            await asyncio.Event().wait()    # until interrupted
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+###################################################################################
+### Function "serve_test" starts myTrisServer on a free local port and connects
+### "clients" stand-in clients (myTrisClient), each one playing "matches" random
+### matches (learnt if "learn" is True). It returns the dictionary of the results:
+### the counters of the server, the final statuses and the matches per second.
+###################################################################################
+def serve_test(clients = 100,matches = 10,learn = False,verbose = True):
+
+    async def main():
+        server = myTrisServer(learn_interval = 0.5)
+        listener = await server.start(port = 0)
+        port = listener.sockets[0].getsockname()[1]
+        statuses = {}
+
+        async def client_session(n):
+            client = myTrisClient()
+            await client.connect(port = port)
+            for i in range(matches):
+                status = await client.play_random_match("user" if (n+i) % 2 == 0 else "computer",learn)
+                statuses[status] = statuses.get(status,0) + 1
+            await client.close()
+
+        start_time = time.perf_counter()
+        await asyncio.gather(*(client_session(n) for n in range(clients)))
+        seconds = time.perf_counter()-start_time
+        await server.close()
+        results = dict(server.counters)
+        results["statuses"] = statuses
+        results["seconds"] = seconds
+        results["matches_per_second"] = clients*matches/seconds if seconds > 0 else 0.0
+        return results
+
+    results = asyncio.run(main())
+    if verbose:
+        print("Sessions:",results["sessions"],"- matches:",results["matches"],"- moves:",results["moves"],"- learnt matches:",results["learnt_matches"])
+        print("Results:",results["statuses"])
+        print("Matches per second:",round(results["matches_per_second"]))
+    return results
             
             
             
@@ -1128,6 +4229,45 @@ class myGameLearning:
 #################
 
 if __name__ == '__main__':
+    # Headless self-play: python mytris_neural_learning.py --self-play <games> [<player one> <player two> [<seed>]]
+    if len(sys.argv) > 1 and sys.argv[1] == "--self-play":
+        number_of_games = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+        player_one = get_self_play_player(sys.argv[3] if len(sys.argv) > 3 else "trained")
+        player_two = get_self_play_player(sys.argv[4] if len(sys.argv) > 4 else "trained")
+        seed = int(sys.argv[5]) if len(sys.argv) > 5 else None
+        myTrisSelfPlay(player_one,player_two).run(number_of_games,seed = seed)
+        quit()
+    # Instrumented self-play: python mytris_neural_learning.py --instrument <games> [<opponent> [<JSON file>]]
+    # the trained network plays (without learning) and the counters of its moves are shown or saved as JSON
+    if len(sys.argv) > 1 and sys.argv[1] == "--instrument":
+        number_of_games = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+        trained_tris = myTrainedTris(verbose = False)
+        instrumentation = trained_tris.enable_instrumentation()
+        myTrisSelfPlay(myNetworkPlayer(trained_tris),get_self_play_player(sys.argv[3] if len(sys.argv) > 3 else "random")).run(number_of_games,seed = 0,learn = False)
+        if len(sys.argv) > 4:
+            with open(sys.argv[4],'wt') as json_file:
+                json_file.write(instrumentation.to_json()+"\n")
+        else:
+            print(instrumentation.summary_table())
+        quit()
+    # Game server: python mytris_neural_learning.py --serve [<port> | <Unix socket path>]
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve":
+        if len(sys.argv) > 2 and not sys.argv[2].isdigit():
+            serve(path = sys.argv[2])
+        else:
+            serve(port = int(sys.argv[2]) if len(sys.argv) > 2 else 8765)
+        quit()
+    # Local test of the game server: python mytris_neural_learning.py --serve-test [<clients> [<matches per client>]]
+    if len(sys.argv) > 1 and sys.argv[1] == "--serve-test":
+        serve_test(int(sys.argv[2]) if len(sys.argv) > 2 else 100,int(sys.argv[3]) if len(sys.argv) > 3 else 10)
+        quit()
+    # Tournament: python mytris_neural_learning.py --tournament <games> [<player one> <player two> [<processes> [<seed>]]]
+    if len(sys.argv) > 1 and sys.argv[1] == "--tournament":
+        number_of_games = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+        processes = int(sys.argv[5]) if len(sys.argv) > 5 else None
+        seed = int(sys.argv[6]) if len(sys.argv) > 6 else None
+        myTrisTournament(sys.argv[3] if len(sys.argv) > 3 else "trained",sys.argv[4] if len(sys.argv) > 4 else "trained",processes).run(number_of_games,seed = seed)
+        quit()
     print("Welcome to myTris game:")
     # Create an instance of myTrainedTris class (using basic knowledge + lesson learnt knowledge):
     trained_tris = myTrainedTris()  
@@ -0,0 +1,26 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_DIR)
+
+import mytris_neural_learning as tris
+
+
+@pytest.fixture
+def kb_dir(tmp_path, monkeypatch):
+    """Work in a temporary directory with a copy of the knowledge base files."""
+    for my_kb_file_name in tris.LESSONS_LEARNT_FILES:
+        shutil.copy(os.path.join(REPO_DIR, my_kb_file_name), tmp_path)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def literal_lessons(my_kb_file_name):
+    """Return the set of the lessons of a knowledge base file, as they are written."""
+    knowledge_base = tris.myLessonsLearntKnowledgeBase(canonical=False)
+    knowledge_base.load(my_kb_file_name)
+    return {(tuple(weights), destination) for (weights, destination) in knowledge_base}
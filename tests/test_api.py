@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+import mytris_neural_learning as tris
+
+
+@pytest.mark.parametrize("options", [{}, {"use_move_table": True}, {"lazy_lessons": True}])
+def test_compute_move_and_submit_match(kb_dir, options):
+    trained_tris = tris.myTrainedTris(verbose=False, **options)
+    random.seed(0)
+    first = trained_tris.compute_move([1, 0, 0, 0, -1, 0, 0, 0, 0])
+    assert first["status"] == "in_progress" and first["move"] is not None
+    random.seed(0)
+    assert trained_tris.compute_move([1, 0, 0, 0, -1, 0, 0, 0, 0]) == first     # the state of the game is not changed
+    counters = trained_tris.submit_match([1, 0, 3, 1, 4, 2, None, None, None, None],
+                                         reload="use_move_table" not in options)
+    assert counters is not None
+    after = trained_tris.compute_move([1, 0, 0, 0, -1, 0, 0, 0, 0])
+    assert after["status"] == "in_progress" and after["board"].o_mask & 1 << after["move"]
+    star = trained_tris.compute_move([0, 0, 0, 0, 1, 0, 0, 0, 0], tris.STAR)
+    assert star["status"] == "in_progress" and star["board"].x_mask & 1 << star["move"]
+
+
+@pytest.mark.parametrize("board", [
+    [1, 0, 0, 0, -1, 0, 0, 0, 1],          # not the turn of CIRCLE
+    [1, 0, 0, 0, -1, 0, 0, 0],             # 8 cells
+    [1, 0, 0, 0, -1, 0, 0, 0, 0, 0],       # 10 cells
+    [2, 0, 0, 0, -1, 0, 0, 0, 0],          # not a symbol
+    [1, 0, 0, 0, -1, 0, 0, 0, "x"],
+    None,
+])
+def test_compute_move_rejects_invalid_boards(kb_dir, monkeypatch, board):
+    trained_tris = tris.myTrainedTris(verbose=False)
+
+    def no_network_call(*arguments, **keywords):
+        raise AssertionError("the network was used")
+
+    monkeypatch.setattr(trained_tris, "get_computer_move", no_network_call)
+    result = trained_tris.compute_move(board)
+    assert result["status"] == "invalid_board"
+    assert result["move"] is None
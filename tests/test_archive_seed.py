@@ -0,0 +1,41 @@
+import random
+
+import mytris_neural_learning as tris
+from conftest import literal_lessons
+from test_game_learning import random_matches
+
+
+def learnt_lessons(matches, **options):
+    tris.myGameLearning().learn_from_match_archive(matches, chunk_size=7, verbose=False, **options)
+    return {name: literal_lessons(name) for name in tris.LESSONS_LEARNT_FILES}
+
+
+def test_seeded_archive_learning_can_be_repeated(tmp_path, monkeypatch):
+    matches = random_matches(40, seed=6)
+    results = list()
+    for (n, processes) in enumerate((1, 1, 2)):
+        directory = tmp_path/str(n)
+        directory.mkdir()
+        monkeypatch.chdir(directory)            # start from empty knowledge bases
+        random.seed(n)                          # the random state of the process does not matter
+        results.append(learnt_lessons(matches, processes=processes, seed=11))
+    assert results[0] == results[1] == results[2]
+
+
+def test_chunks_have_their_own_seeds(monkeypatch):
+    jobs = list()
+    analyze_matches_worker = tris.analyze_matches_worker
+
+    def recording_worker(chunk):
+        jobs.append(chunk)
+        return analyze_matches_worker(chunk)
+
+    monkeypatch.setattr(tris, "analyze_matches_worker", recording_worker)
+    monkeypatch.setattr(tris.myGameLearning, "load_from_file",
+                        lambda self, my_kb_file_name, verbose=True: tris.myLessonsLearntKnowledgeBase())
+    monkeypatch.setattr(tris.myLessonsLearntKnowledgeBase, "compact", lambda self, my_kb_file_name: 0)
+    tris.myGameLearning().learn_from_match_archive(random_matches(20, seed=7), processes=1, chunk_size=5, seed=3, verbose=False)
+    seeds = [seed for (matches, symmetric_lessons, seed) in jobs]
+    assert len(seeds) == 4 and len(set(seeds)) == 4
+    generator = random.Random(3)
+    assert seeds == [generator.randrange(2**32) for chunk in range(4)]
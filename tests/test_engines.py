@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+import mytris_neural_learning as tris
+
+ENGINES = [
+    {"vectorized": True},
+    {"compiled": True},
+    {"incremental": True},
+    {"compiled": True, "incremental": True},
+]
+
+
+def reachable_boards():
+    """Return every board reachable from the empty board, whoever begins."""
+    boards = set()
+    pending = [(tris.myTrisBoard(), tris.CIRCLE), (tris.myTrisBoard(), tris.STAR)]
+    while pending:
+        (board, player) = pending.pop()
+        if (board, player) in boards:
+            continue
+        boards.add((board, player))
+        if board.winner() is None and not board.is_full():
+            for cell in board.empty_cells():
+                pending.append((board.play(cell, player), -player))
+    return sorted({board for (board, player) in boards}, key=lambda board: board.to_status())
+
+
+BOARDS = reachable_boards()
+
+
+def moves(trained_tris):
+    statuses = list()
+    for (k, board) in enumerate(BOARDS):
+        trained_tris.set_board(board)
+        trained_tris.reset_all_but_the_board()
+        random.seed(k)
+        label = trained_tris.get_computer_move(verbose=False)
+        statuses.append((label, trained_tris.snapshot()))
+    return statuses
+
+
+@pytest.fixture(scope="module", params=[True, False], ids=["symmetric", "literal"])
+def reference(request):
+    symmetric_lessons = request.param
+    return (symmetric_lessons, moves(tris.myTrainedTris(verbose=False, symmetric_lessons=symmetric_lessons)))
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: "_".join(engine))
+def test_engines_agree_on_every_reachable_board(reference, engine):
+    if engine.get("vectorized") and tris.numpy is None:
+        pytest.skip("NumPy not available")
+    (symmetric_lessons, expected) = reference
+    trained_tris = tris.myTrainedTris(verbose=False, symmetric_lessons=symmetric_lessons, **engine)
+    for _ in range(2):              # the second pass reuses the compiled layers and the last results
+        assert moves(trained_tris) == expected
+
+
+@pytest.mark.parametrize("engine", ENGINES, ids=lambda engine: "_".join(engine))
+def test_engines_agree_on_the_basic_network(engine):
+    if engine.get("vectorized") and tris.numpy is None:
+        pytest.skip("NumPy not available")
+    basic = tris.myTris(verbose=False)
+    other = tris.myTris(verbose=False, **engine)
+    for (k, board) in enumerate(BOARDS):
+        random.seed(k)
+        expected = basic.respond(board.to_status())
+        random.seed(k)
+        assert other.respond(board.to_status()) == expected
+    statuses = [board.to_status() for board in BOARDS]
+    random.seed(0)
+    expected = basic.respond_batch(statuses)
+    random.seed(0)
+    assert other.respond_batch(statuses) == expected
@@ -0,0 +1,85 @@
+import os
+import random
+
+import mytris_neural_learning as tris
+
+
+def random_matches(number, seed):
+    """Return complete random matches, as match lists (first player, then the cells played)."""
+    generator = random.Random(seed)
+    matches = list()
+    while len(matches) < number:
+        board = tris.myTrisBoard()
+        player = generator.choice((tris.CIRCLE, tris.STAR))
+        match = [player]
+        while board.winner() is None and not board.is_full():
+            cell = generator.choice(board.empty_cells())
+            board = board.play(cell, player)
+            match.append(cell)
+            player = -player
+        matches.append(match+[None]*(10-len(match)))
+    return matches
+
+
+def count_loads(game_learning, monkeypatch):
+    loads = list()
+    load_from_file = game_learning.load_from_file
+
+    def counting_load_from_file(my_kb_file_name, verbose=True):
+        loads.append(my_kb_file_name)
+        return load_from_file(my_kb_file_name, verbose)
+
+    monkeypatch.setattr(game_learning, "load_from_file", counting_load_from_file)
+    return loads
+
+
+def journal_lines(my_kb_file_name):
+    my_journal_file_name = my_kb_file_name+tris.LESSONS_JOURNAL_SUFFIX
+    if not os.path.exists(my_journal_file_name):
+        return []
+    with open(my_journal_file_name, 'rt') as my_file_handler:
+        return my_file_handler.readlines()
+
+
+def test_knowledge_bases_are_loaded_once(kb_dir, monkeypatch):
+    monkeypatch.setattr(tris, "LESSONS_JOURNAL_COMPACTION_THRESHOLD", 10**6)
+    game_learning = tris.myGameLearning()
+    loads = count_loads(game_learning, monkeypatch)
+    for match in random_matches(40, seed=1):
+        game_learning.learn_match(match, verbose=False)
+    assert sorted(loads) == sorted(set(loads))
+    for my_kb_file_name in tris.LESSONS_LEARNT_FILES:
+        lines = journal_lines(my_kb_file_name)
+        assert len(lines) == len(set(lines))    # only the new lessons are appended
+        assert game_learning.get_knowledge_base(my_kb_file_name).get_lessons() == \
+            tris.myGameLearning().load_from_file(my_kb_file_name, verbose=False).get_lessons()
+
+
+def test_knowledge_bases_are_reloaded_when_the_files_change(kb_dir, monkeypatch):
+    matches = random_matches(20, seed=2)
+    game_learning = tris.myGameLearning()
+    loads = count_loads(game_learning, monkeypatch)
+    for match in matches[:10]:
+        game_learning.learn_match(match, verbose=False)
+    other = tris.myGameLearning()              # another learner changes the files
+    for match in matches[10:]:
+        other.learn_match(match, verbose=False)
+    del loads[:]
+    for match in matches:
+        game_learning.learn_match(match, verbose=False)
+    assert loads != []
+    for my_kb_file_name in tris.LESSONS_LEARNT_FILES:
+        lines = journal_lines(my_kb_file_name)
+        assert len(lines) == len(set(lines))
+        assert game_learning.get_knowledge_base(my_kb_file_name).get_lessons() == \
+            other.get_knowledge_base(my_kb_file_name).get_lessons()
+
+
+def test_submit_match_keeps_its_game_learning(kb_dir):
+    trained_tris = tris.myTrainedTris(verbose=False)
+    for match in random_matches(5, seed=3):
+        trained_tris.submit_match(match)
+    game_learning = trained_tris.game_learning
+    assert game_learning is not None and len(game_learning.knowledge_bases) > 0
+    trained_tris.submit_match(random_matches(1, seed=4)[0])
+    assert trained_tris.game_learning is game_learning
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import mytris_neural_learning as tris
+
+
+def match_statuses(number, seed):
+    """Return the board statuses of random matches, in the order they are played."""
+    rng = random.Random(seed)
+    statuses = []
+    for n in range(number):
+        board = tris.myTrisBoard()
+        player = tris.CIRCLE if n % 2 == 0 else tris.STAR
+        while not board.is_over():
+            board = board.play(rng.choice(board.empty_cells()), player)
+            player = -player
+            statuses.append(board.to_status())
+    return statuses
+
+
+def respond_all(basic_tris, statuses):
+    results = []
+    for status in statuses:
+        basic_tris.reset_all_but_the_board()
+        random.seed(len(results))
+        (reason, _, to_status) = basic_tris.respond(list(status))
+        results.append((reason, list(to_status), list(basic_tris.perceptrons_network.node_statuses)))
+    return results
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+@pytest.mark.parametrize("cost_samples,cost_period", [(10**9, 10**9), (5, 20)])
+def test_incremental_respond_matches_full_evaluation(monkeypatch, compiled, cost_samples, cost_period):
+    monkeypatch.setattr(tris.myIncrementalLayerEngine, "COST_SAMPLES", cost_samples)
+    monkeypatch.setattr(tris.myIncrementalLayerEngine, "COST_PERIOD", cost_period)
+    statuses = match_statuses(60, 0)
+    expected = respond_all(tris.myTris(verbose=False), statuses)
+    assert respond_all(tris.myTris(verbose=False, incremental=True, compiled=compiled), statuses) == expected
+
+
+def test_layer_is_identified_by_its_nodes():
+    basic_tris = tris.myTris(verbose=False, incremental=True)
+    net = basic_tris.perceptrons_network
+    engine = net.layer_engine
+    node_id_set = basic_tris.list_of_node_ids_for_winning
+    key = engine.layer_key(node_id_set)
+    assert key in engine.registered_layers
+    assert engine.layer_key(list(node_id_set)) == key   # a new list with the same nodes is the same layer
+    for status in ([tris.CIRCLE, tris.CIRCLE] + [tris.EMPTY]*7, [tris.CIRCLE, tris.EMPTY, tris.CIRCLE] + [tris.EMPTY]*6):
+        for i in range(9):
+            net.node_statuses[i] = status[i]
+        basic_tris.reset_all_but_the_board()
+        net.evaluate_new_status_for_all_nodes_sequentially(list(node_id_set))
+        incremental = list(net.node_statuses)
+        net.disable_layer_engine()
+        basic_tris.reset_all_but_the_board()
+        net.evaluate_new_status_for_all_nodes_sequentially(node_id_set)
+        assert list(net.node_statuses) == incremental
+        net.layer_engine = engine
@@ -0,0 +1,95 @@
+import itertools
+import os
+
+import pytest
+
+import mytris_neural_learning as tris
+
+
+@pytest.mark.parametrize("my_kb_file_name", tris.LESSONS_LEARNT_FILES)
+def test_text_binary_text_round_trip(kb_dir, my_kb_file_name):
+    tris.convert_lessons_learnt_file(my_kb_file_name, "kb.txt", "text")
+    tris.convert_lessons_learnt_file("kb.txt", "kb.bin", "binary")
+    tris.convert_lessons_learnt_file("kb.bin", "kb.back.txt", "text")
+    with open("kb.txt") as before, open("kb.back.txt") as after:
+        assert before.read() == after.read()
+    assert os.path.getsize("kb.bin") < os.path.getsize("kb.txt")
+
+
+def test_text_writer_keeps_zero_weights(kb_dir):
+    knowledge_base = tris.myLessonsLearntKnowledgeBase([([0.0, 0, 0.5, -1.0, 0, 0, 0, 0, 0], 4)])
+    knowledge_base.save("kb.txt", "text")
+    with open("kb.txt") as my_file_handler:
+        assert my_file_handler.read().split() == ["0", "0", "0.5", "-1.0", "0", "0", "0", "0", "0", "4"]
+
+
+@pytest.mark.parametrize("canonical", [False, True])
+@pytest.mark.parametrize("saved_canonical", [False, True])
+@pytest.mark.parametrize("with_numpy", [False, True])
+def test_binary_load_matches_text_load(kb_dir, monkeypatch, canonical, saved_canonical, with_numpy):
+    if not with_numpy:
+        monkeypatch.setattr(tris, "numpy", None)
+    elif tris.numpy is None:
+        pytest.skip("NumPy is not installed")
+    for my_kb_file_name in tris.LESSONS_LEARNT_FILES:
+        saved = tris.myLessonsLearntKnowledgeBase(canonical=saved_canonical)
+        saved.load(my_kb_file_name)
+        saved.save("kb.bin", "binary")
+        expected = tris.myLessonsLearntKnowledgeBase(canonical=canonical)
+        expected.load(my_kb_file_name)
+        if saved_canonical and not canonical:   # the file holds the canonical forms, as they are
+            expected = tris.myLessonsLearntKnowledgeBase(saved.get_lessons())
+        loaded = tris.myLessonsLearntKnowledgeBase(canonical=canonical)
+        assert loaded.load("kb.bin") == len(saved)
+        assert loaded.get_lessons() == expected.get_lessons()
+
+
+def new_lessons(number):
+    """Return lessons that are not in the knowledge base files (2 CIRCLE and 2 STAR on the board)."""
+    lessons = list()
+    for (a, b, c, d) in itertools.islice(itertools.combinations(range(9), 4), number):
+        weights = [0]*9
+        (weights[a], weights[b], weights[c], weights[d]) = (0.25, 0.25, -0.25, -0.25)
+        lessons.append((weights, weights.index(0)))
+    return lessons
+
+
+def test_journal_skips_damaged_records(kb_dir):
+    my_kb_file_name = tris.LESSONS_LEARNT_WIN_FILE
+    knowledge_base = tris.myLessonsLearntKnowledgeBase(canonical=False)
+    knowledge_base.load(my_kb_file_name)
+    size = len(knowledge_base)
+    lessons = new_lessons(20)
+    appended = knowledge_base.append(my_kb_file_name, lessons)
+    assert appended > 3
+    my_journal_file_name = my_kb_file_name+tris.LESSONS_JOURNAL_SUFFIX
+    with open(my_journal_file_name) as my_file_handler:
+        lines = my_file_handler.readlines()
+    lines[0] = lines[0].replace(";", ",", 1)               # a damaged record
+    lines[-1] = lines[-1][:len(lines[-1])//2]              # the last record, cut by a crash while writing
+    with open(my_journal_file_name, "w") as my_file_handler:
+        my_file_handler.write("".join(lines))
+    loaded = tris.myLessonsLearntKnowledgeBase(canonical=False)
+    assert loaded.load(my_kb_file_name) == size+appended-2
+    assert loaded.journal_records == appended-2
+    assert loaded.append(my_kb_file_name, lessons) == 2    # the lost lessons are appended again, on a new line
+    reloaded = tris.myLessonsLearntKnowledgeBase(canonical=False)
+    assert reloaded.load(my_kb_file_name) == size+appended
+    assert sorted(reloaded.get_lessons()) == sorted(knowledge_base.get_lessons())
+
+
+def test_journal_is_compacted_into_the_file(kb_dir, monkeypatch):
+    monkeypatch.setattr(tris, "LESSONS_JOURNAL_COMPACTION_THRESHOLD", 10)
+    my_kb_file_name = tris.LESSONS_LEARNT_TIE_FILE
+    my_journal_file_name = my_kb_file_name+tris.LESSONS_JOURNAL_SUFFIX
+    game_learning = tris.myGameLearning(symmetric_lessons=False)
+    lessons = new_lessons(30)
+    game_learning.update_knowledge_base(lessons[:5], my_kb_file_name, verbose=False)
+    assert os.path.exists(my_journal_file_name)
+    knowledge_base = game_learning.update_knowledge_base(lessons[5:], my_kb_file_name, verbose=False)
+    assert not os.path.exists(my_journal_file_name)
+    loaded = tris.myLessonsLearntKnowledgeBase(canonical=False)
+    loaded.load(my_kb_file_name)
+    assert loaded.journal_records == 0
+    assert loaded.get_lessons() == knowledge_base.get_lessons()
+    assert all((weights, destination) in loaded for (weights, destination) in lessons)
@@ -0,0 +1,58 @@
+import mytris_neural_learning as tris
+from test_game_learning import random_matches
+
+BOARD = [1, 0, 0, 0, -1, 0, 0, 0, 0]
+
+
+def first_line(my_file_name):
+    with open(my_file_name) as my_file_handler:
+        return my_file_handler.readline().strip()
+
+
+def count_builds(monkeypatch):
+    builds = list()
+    build_move_table = tris.myTrainedTris.build_move_table
+
+    def counting_build_move_table(self, verbose=True):
+        builds.append(self)
+        build_move_table(self, verbose)
+
+    monkeypatch.setattr(tris.myTrainedTris, "build_move_table", counting_build_move_table)
+    return builds
+
+
+def learn(number, seed):
+    game_learning = tris.myGameLearning()
+    for match in random_matches(number, seed):
+        game_learning.learn_match(match, verbose=False)
+
+
+def test_saved_move_table_is_used_only_for_the_same_knowledge_base(kb_dir, monkeypatch):
+    builds = count_builds(monkeypatch)
+    tris.myTrainedTris(verbose=False, use_move_table=True)
+    assert len(builds) == 1
+    assert first_line(tris.MOVE_TABLE_FILE) == tris.lessons_learnt_files_fingerprint()+":symmetric"
+    tris.myTrainedTris(verbose=False, use_move_table=True)
+    assert len(builds) == 1                     # loaded from the file
+    tris.myTrainedTris(verbose=False, use_move_table=True, symmetric_lessons=False)
+    assert len(builds) == 2                     # the lessons are matched in another way
+    learn(20, seed=8)
+    tris.myTrainedTris(verbose=False, use_move_table=True, symmetric_lessons=False)
+    assert len(builds) == 3                     # the knowledge base has changed
+    assert first_line(tris.MOVE_TABLE_FILE) == tris.lessons_learnt_files_fingerprint()
+
+
+def test_move_table_is_rebuilt_when_the_knowledge_base_changes(kb_dir, monkeypatch):
+    trained_tris = tris.myTrainedTris(verbose=False, use_move_table=True)
+    table = trained_tris.move_table
+    builds = count_builds(monkeypatch)
+    trained_tris.compute_move(BOARD)
+    assert builds == []
+    learn(20, seed=9)
+    trained_tris.compute_move(BOARD)
+    assert builds == [trained_tris] and trained_tris.move_table is not table
+    assert trained_tris.move_table_signature == tris.lessons_learnt_files_signature()
+    assert first_line(tris.MOVE_TABLE_FILE) == trained_tris.move_table_fingerprint()
+    rebuilt = tris.myTrainedTris(verbose=False)
+    rebuilt.build_move_table(verbose=False)
+    assert trained_tris.move_table == rebuilt.move_table
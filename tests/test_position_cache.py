@@ -0,0 +1,32 @@
+import mytris_neural_learning as tris
+from test_game_learning import random_matches
+
+BOARD = [1, 0, 0, 0, -1, 0, 0, 0, 0]
+
+
+def test_cache_key_is_the_board_and_the_side_to_move(kb_dir):
+    trained_tris = tris.myTrainedTris(verbose=False, position_cache_size=16)
+    circle = tris.myTrisBoard.from_status(BOARD)
+    star = tris.myTrisBoard.from_status([1, 0, 0, 0, 0, 0, 0, 0, 0])
+    trained_tris.compute_move(circle, tris.CIRCLE)
+    trained_tris.compute_move(star, tris.STAR)
+    assert set(trained_tris.position_cache) == {(circle, tris.CIRCLE), (star, tris.STAR)}
+    trained_tris.compute_move(star, tris.STAR)
+    assert trained_tris.get_position_cache_stats()["hits"] == 1
+    assert trained_tris.side_to_move == tris.CIRCLE
+
+
+def test_cache_is_emptied_when_the_knowledge_base_changes(kb_dir):
+    trained_tris = tris.myTrainedTris(verbose=False, position_cache_size=16)
+    trained_tris.compute_move(BOARD)
+    dimension = trained_tris.perceptrons_network.network_dimension
+    game_learning = tris.myGameLearning()
+    for match in random_matches(20, seed=5):
+        game_learning.learn_match(match, verbose=False)
+    trained_tris.compute_move(BOARD)
+    stats = trained_tris.get_position_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (0, 2, 1)
+    assert trained_tris.perceptrons_network.network_dimension > dimension     # the new lessons are loaded
+    assert trained_tris.lessons_learnt_signature == tris.lessons_learnt_files_signature()
+    trained_tris.compute_move(BOARD)
+    assert trained_tris.get_position_cache_stats()["hits"] == 1
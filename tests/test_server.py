@@ -0,0 +1,36 @@
+import asyncio
+import threading
+
+import mytris_neural_learning as tris
+
+
+def test_learning_reloads_a_clone_off_the_event_loop(kb_dir, monkeypatch):
+    reload_threads = list()
+    reload_lessons_learnt = tris.myTrainedTris.reload_lessons_learnt
+
+    def recording_reload(self, verbose=False):
+        reload_threads.append(threading.current_thread())
+        reload_lessons_learnt(self, verbose)
+
+    monkeypatch.setattr(tris.myTrainedTris, "reload_lessons_learnt", recording_reload)
+
+    async def main():
+        server = tris.myTrisServer(learn_interval=0.1)
+        listener = await server.start(port=0)
+        shared_tris = server.tris
+        dimension = shared_tris.perceptrons_network.network_dimension
+        client = tris.myTrisClient()
+        await client.connect(port=listener.sockets[0].getsockname()[1])
+        for i in range(10):
+            assert await client.play_random_match("user" if i % 2 == 0 else "computer", learn=True) is not None
+        await client.close()
+        await server.close()
+        return (server, shared_tris, dimension)
+
+    (server, shared_tris, dimension) = asyncio.run(main())
+    assert server.counters["learnt_matches"] == 10
+    assert reload_threads != [] and threading.main_thread() not in reload_threads
+    assert server.tris is not shared_tris
+    assert shared_tris.perceptrons_network.network_dimension == dimension   # the old game is not changed
+    assert server.tris.perceptrons_network.network_dimension >= dimension
+    assert server.tris.compute_move([1, 0, 0, 0, -1, 0, 0, 0, 0])["status"] == "in_progress"
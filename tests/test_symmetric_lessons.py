@@ -0,0 +1,28 @@
+import mytris_neural_learning as tris
+from conftest import literal_lessons
+
+
+def snapshot_lessons():
+    return {name: literal_lessons(name) for name in tris.LESSONS_LEARNT_FILES}
+
+
+def assert_still_literal(before):
+    for (name, lessons) in before.items():
+        assert lessons <= literal_lessons(name), name
+
+
+def test_self_play_keeps_literal_lessons(kb_dir):
+    before = snapshot_lessons()
+    player = tris.myNetworkPlayer(tris.myTrainedTris(verbose=False, symmetric_lessons=False), "trained")
+    self_play = tris.myTrisSelfPlay(player, tris.myRandomPlayer())
+    assert self_play.game_learning.symmetric_lessons is False
+    self_play.run(60, seed=1, learn=True, learn_every=30, processes=1, verbose=False)
+    assert_still_literal(before)
+
+
+def test_tournament_keeps_literal_lessons(kb_dir):
+    before = snapshot_lessons()
+    tournament = tris.myTrisTournament("trained", "random", processes=1, symmetric_lessons=False)
+    tournament.run(60, seed=1, games_per_shard=30, learn=True, verbose=False)
+    assert_still_literal(before)
+